@@ -0,0 +1,116 @@
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from shutil import copyfile
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from validol.model.store.resource import Platforms, ResourceCatalog, create_catalog
+from validol.model.store.miners.weekly_reports.active import Active, WeeklyActives
+from validol.model.store.miners.weekly_reports.flavors import CFTC_DISAGGREGATED_FUTURES_ONLY
+from validol.migration.scripts.columnar_storage import main as migrate_to_columnar
+
+
+class Timer:
+    def __init__(self, title):
+        self.title = title
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        print('{:<40}{:>10.3f}s'.format(self.title, time.perf_counter() - self.start))
+
+
+def synthetic_db(path, flavor, actives, weeks):
+    launcher = SimpleNamespace(main_dbh=sqlite3.connect(path))
+    create_catalog(launcher.main_dbh)
+
+    Platforms(launcher, flavor['name']).write_single('CFTC', 'BENCHMARK')
+    WeeklyActives(launcher, flavor['name']).write_df(pd.DataFrame(
+        [('CFTC', 'ACTIVE {}'.format(i)) for i in range(actives)],
+        columns=('PlatformCode', 'ActiveName')))
+
+    dates = pd.date_range('1986-01-07', periods=weeks, freq='7D').date
+
+    legacy = dict(flavor, columnar=False)
+    for i in range(actives):
+        df = pd.DataFrame(np.random.randint(0, 10 ** 6, (weeks, len(flavor['schema']))),
+                          columns=[name for name, _ in flavor['schema']])
+        df['Date'] = dates
+
+        Active(launcher, legacy, 'CFTC', 'ACTIVE {}'.format(i)).write_df(df)
+
+    launcher.main_dbh.commit()
+    launcher.main_dbh.close()
+
+
+def run(path, flavor, title):
+    print(title)
+
+    launcher = SimpleNamespace(main_dbh=sqlite3.connect(path))
+    create_catalog(launcher.main_dbh)
+
+    names = WeeklyActives(launcher, flavor['name']).read_df()[['PlatformCode', 'ActiveName']].values
+
+    with Timer('catalog (open all actives)'):
+        actives = [Active(launcher, flavor, platform, name) for platform, name in names]
+
+    with Timer('read_dates_ts (all actives)'):
+        for active in actives:
+            active.read_dates_ts()
+
+    with Timer('range (all actives)'):
+        for active in actives:
+            active.range()
+
+    with Timer('flavor latest date'):
+        ResourceCatalog(launcher.main_dbh).flavor_range(flavor['name'])
+
+    with Timer('update (one week per active)'):
+        for active in actives:
+            last = active.range()[1]
+            df = active.read_dates_ts().tail(1).reset_index()
+            df['Date'] = last + pd.Timedelta(days=7)
+            active.write_df(df)
+
+        launcher.main_dbh.commit()
+
+    launcher.main_dbh.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Compare per-active tables with the columnar per-flavor storage')
+    parser.add_argument('--main-db', help='copy of a real main.db to benchmark against')
+    parser.add_argument('--actives', type=int, default=1000)
+    parser.add_argument('--weeks', type=int, default=52 * 30)
+    args = parser.parse_args(argv)
+
+    flavor = CFTC_DISAGGREGATED_FUTURES_ONLY
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+
+        if args.main_db is None:
+            synthetic_db('main.db', flavor, args.actives, args.weeks)
+        else:
+            copyfile(args.main_db, 'main.db')
+
+        run('main.db', dict(flavor, columnar=False), 'Per-active tables')
+
+        launcher = SimpleNamespace(main_dbh=sqlite3.connect('main.db'))
+        create_catalog(launcher.main_dbh)
+        with Timer('migration'):
+            migrate_to_columnar(launcher)
+        launcher.main_dbh.close()
+
+        run('main.db', flavor, 'Columnar storage')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+import argparse
+import glob
+import os
+import re
+import tempfile
+import time
+from zipfile import ZipFile
+
+from PyPDF2 import PdfFileReader
+from tabula import read_pdf
+
+from validol.model.store.blob_store import BlobStore, BlobIndex
+from validol.model.store.connection import ConnectionManager
+from validol.model.store.miners.daily_reports.cme import Active
+from validol.model.store.miners.daily_reports.pdf_helpers.cme import CmeFuturesParser
+from validol.model.store.miners.daily_reports.pdf_helpers.ice import IceParser
+from validol.model.utils import tabula_worker
+from validol.model.utils.utils import pdf
+
+
+class Timer:
+    def __init__(self, title):
+        self.title = title
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        print('{:<40}{:>10.3f}s'.format(self.title, time.perf_counter() - self.start))
+
+
+def legacy_pdf(fname, config):
+    for page, area in config['pages']:
+        if isinstance(page, int) or page == 'all':
+            pgs = [page]
+        else:
+            begin, end = [int({'start': 1, 'end': PdfFileReader(fname).getNumPages()}.get(x, x))
+                          for x in page.split('-')]
+            pgs = range(begin, end + 1)
+
+        for i in pgs:
+            for processor in config['processors']:
+                try:
+                    read_pdf(fname, pages=i, area=area, **processor['kwargs'])
+                    break
+                except:
+                    pass
+
+
+def cme_config(fname, pages):
+    parser_config = CmeFuturesParser.get_config(None)
+    num_pages = PdfFileReader(fname).getNumPages()
+
+    return {
+        'pages': [(page, parser_config['page_area']) for page in range(1, min(num_pages, pages) + 1)],
+        'processors': [
+            {
+                'kwargs': {
+                    'guess': False,
+                    'pandas_options': {'header': None},
+                    'columns': parser_config['columns']
+                }
+            }
+        ]
+    }
+
+
+def cme_corpus(data_dir, directory, section, bulletins, pages):
+    db = ConnectionManager(os.path.join(data_dir, 'cache.sqlite'))
+    store = BlobStore(db, os.path.join(data_dir, BlobStore.DIRECTORY))
+
+    corpus = []
+
+    for date, name in sorted(BlobIndex(db.connection).dates(Active.FTP_DIR), reverse=True)[:bulletins]:
+        blob = store.open(name)
+
+        with ZipFile(blob) as zip_file:
+            for archive_file in zip_file.namelist():
+                if re.match(section, archive_file):
+                    fname = os.path.join(directory, '{}_{}'.format(date, archive_file))
+
+                    with open(fname, 'wb') as file:
+                        file.write(zip_file.read(archive_file))
+
+                    corpus.append((fname, cme_config(fname, pages)))
+
+    db.close()
+
+    return corpus
+
+
+def ice_corpus(pdf_dir):
+    return [(fname, config) for fname in sorted(glob.glob(os.path.join(pdf_dir, '*.pdf')))
+            for config in IceParser.config(None, None)]
+
+
+def run(title, corpus, extract):
+    with Timer(title):
+        for fname, config in corpus:
+            try:
+                extract(fname, config)
+            except ValueError:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare per-page tabula calls with batched extraction and a persistent JVM')
+    parser.add_argument('--data', help='validol data directory with stored CME bulletins')
+    parser.add_argument('--ice-pdfs', help='directory with ICE daily report PDFs')
+    parser.add_argument('--section', default='^Section0?[1-9]_', help='regex of CME bulletin sections to extract')
+    parser.add_argument('--bulletins', type=int, default=5)
+    parser.add_argument('--pages', type=int, default=10, help='pages per CME section')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = []
+
+        if args.data is not None:
+            corpus += cme_corpus(args.data, directory, args.section, args.bulletins, args.pages)
+
+        if args.ice_pdfs is not None:
+            corpus += ice_corpus(args.ice_pdfs)
+
+        print('{} documents, {} page requests'.format(
+            len(corpus), sum(len(config['pages']) for _, config in corpus)))
+
+        run('per-page subprocess (legacy)', corpus, legacy_pdf)
+
+        tabula_worker.worker = tabula_worker.TabulaWorker(tabula_worker.SubprocessWorker())
+        run('batched subprocess', corpus, pdf)
+
+        try:
+            tabula_worker.worker = tabula_worker.TabulaWorker(tabula_worker.JvmWorker())
+        except Exception as e:
+            print('persistent JVM unavailable: {}'.format(e))
+        else:
+            run('persistent JVM', corpus, pdf)
+
+
+if __name__ == '__main__':
+    main()
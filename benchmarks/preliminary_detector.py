@@ -0,0 +1,88 @@
+import argparse
+import os
+import random
+import time
+from io import BytesIO
+from zipfile import ZipFile
+
+import PyPDF2 as ppdf
+
+from validol.model.store.miners.daily_reports.pdf_helpers.cme import CmeParser
+
+
+def legacy_if_preliminary_pdf(content):
+    pdf = ppdf.PdfFileReader(content)
+
+    num_pages = pdf.getNumPages()
+
+    for i in range(15):
+        page_num = random.randint(0, num_pages - 1)
+
+        page = pdf.getPage(page_num)
+        page.cropBox.lowerLeft = (page.cropBox.lowerLeft[0], 800)
+        page.cropBox.lowerRight = (page.cropBox.lowerRight[0], 800)
+
+        writer = ppdf.PdfFileWriter()
+        writer.addPage(page)
+        file = BytesIO()
+        writer.write(file)
+
+        reader = ppdf.PdfFileReader(file)
+
+        if 'PRELIMINARY' in reader.getPage(0).extractText():
+            return True
+
+    return False
+
+
+def corpus(directories):
+    result = []
+
+    for directory, label in directories:
+        for file in sorted(os.listdir(directory)):
+            if file.endswith('.zip'):
+                with ZipFile(os.path.join(directory, file)) as zip_file:
+                    result.append((file, label if label is not None else file.startswith('PRELIMINARY_'),
+                                   zip_file.read(CmeParser.main_file(zip_file))))
+
+    return result
+
+
+def run(title, documents, detector):
+    start = time.perf_counter()
+    errors = []
+
+    for file, preliminary, content in documents:
+        if detector(BytesIO(content)) != preliminary:
+            errors.append(file)
+
+    elapsed = time.perf_counter() - start
+
+    print('{:<30}{:>10.3f}s{:>10.1f} ms/bulletin{:>6} wrong'.format(
+        title, elapsed, elapsed / max(len(documents), 1) * 1000, len(errors)))
+
+    for file in errors:
+        print('    {}'.format(file))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Check the preliminary bulletin detector against a labelled corpus of CME bulletins')
+    parser.add_argument('--bulletins', help='directory of bulletin zips, preliminary ones prefixed with PRELIMINARY_')
+    parser.add_argument('--preliminary', help='directory of preliminary bulletin zips')
+    parser.add_argument('--final', help='directory of final bulletin zips')
+    args = parser.parse_args()
+
+    documents = corpus([(directory, label) for directory, label in ((args.bulletins, None),
+                                                                     (args.preliminary, True),
+                                                                     (args.final, False))
+                        if directory is not None])
+
+    print('{} bulletins, {} preliminary'.format(len(documents), sum(label for _, label, _ in documents)))
+
+    run('legacy (15 random pages)', documents, legacy_if_preliminary_pdf)
+    run('fixed header pages', documents, CmeParser.if_preliminary_pdf)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,19 @@
+import os
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_columnar_storage_benchmark(tmp_path):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, 'benchmarks', 'columnar_storage.py'), '--actives', '2', '--weeks', '4'],
+        cwd=str(tmp_path), env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=300)
+
+    output = result.stdout.decode()
+
+    assert result.returncode == 0, output
+    assert 'Columnar storage' in output
@@ -0,0 +1,70 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from validol.model.store.bulk_writer import BulkWriter
+from validol.model.store.connection import ConnectionManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = ConnectionManager(str(tmp_path / 'main.db'))
+    db.connection.execute('CREATE TABLE "Unique" (x INTEGER PRIMARY KEY)')
+    db.connection.execute('CREATE TABLE "Plain" (x INTEGER)')
+
+    yield db
+
+    db.close()
+
+
+def count(db, table):
+    return db.connection.execute('SELECT COUNT(*) FROM "{}"'.format(table)).fetchone()[0]
+
+
+def frame(*values):
+    return pd.DataFrame({'x': list(values)})
+
+
+def test_failed_table_is_rolled_back_alone(db):
+    calls = []
+
+    with BulkWriter(db) as writer:
+        writer.stage('Unique', frame(1, 2))
+        writer.stage('Plain', frame(1, 2, 3))
+        writer.stage('Unique', frame(2))
+        writer.after(lambda dbh: calls.append(count(db, 'Plain')))
+
+    assert count(db, 'Unique') == 0
+    assert count(db, 'Plain') == 3
+    assert [table for table, _ in writer.failed] == ['Unique']
+    assert isinstance(writer.failed[0][1], sqlite3.IntegrityError)
+    assert calls == [3]
+    assert writer.rows == 3
+
+
+def test_flushes_at_max_rows(db):
+    with BulkWriter(db, max_rows=3) as writer:
+        writer.stage('Plain', frame(1, 2))
+        assert count(db, 'Plain') == 0
+
+        writer.stage('Plain', frame(3))
+        assert count(db, 'Plain') == 3
+
+        writer.stage('Plain', frame(4))
+
+    assert count(db, 'Plain') == 4
+
+
+def test_exception_discards_staged_rows(db):
+    calls = []
+
+    with pytest.raises(RuntimeError):
+        with BulkWriter(db) as writer:
+            writer.stage('Plain', frame(1))
+            writer.after(calls.append)
+
+            raise RuntimeError
+
+    assert count(db, 'Plain') == 0
+    assert calls == []
@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from validol.model.store.connection import ConnectionManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = ConnectionManager(str(tmp_path / 'main.db'))
+
+    yield db
+
+    db.close()
+
+
+def query(db):
+    return db.connection.execute('SELECT 1').fetchone()
+
+
+def test_connections_of_finished_threads_are_closed(db):
+    query(db)
+
+    for _ in range(5):
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lambda _: query(db), range(32)))
+
+    query(db)
+
+    assert len(db.connections) <= 1 + 8
+
+
+def test_release(db):
+    query(db)
+    db.release()
+
+    assert db.connections == {}
+    assert query(db) == (1,)
+
+
+def test_nested_transaction_uses_savepoint(db):
+    db.connection.execute('CREATE TABLE t (x INTEGER)')
+
+    with db.transaction() as dbh:
+        dbh.execute('INSERT INTO t VALUES (1)')
+
+        with pytest.raises(ValueError):
+            with db.transaction() as nested:
+                nested.execute('INSERT INTO t VALUES (2)')
+                raise ValueError
+
+        assert dbh.in_transaction
+
+        with db.transaction() as nested:
+            nested.execute('INSERT INTO t VALUES (3)')
+
+        assert dbh.in_transaction
+
+    assert [x for x, in db.connection.execute('SELECT x FROM t ORDER BY x')] == [1, 3]
@@ -0,0 +1,188 @@
+import socket
+import socketserver
+import threading
+
+import pytest
+
+from validol.model.mine.ftp_client import FtpClient
+
+
+DIRECTORY = 'pub/bulletin'
+
+
+class FtpStub(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, files, commands=('MLSD', 'LIST', 'NLST')):
+        self.files = files
+        self.supported = set(commands)
+        self.logins = 0
+        self.commands = []
+        self.drop_next = False
+        self.lock = threading.Lock()
+
+        socketserver.ThreadingTCPServer.__init__(self, ('127.0.0.1', 0), FtpHandler)
+
+    def listing(self, directory):
+        return [(path.rsplit('/', 1)[1], content) for path, content in sorted(self.files.items())
+                if path.rsplit('/', 1)[0] == directory.rstrip('/')]
+
+
+class FtpHandler(socketserver.StreamRequestHandler):
+    def send(self, line):
+        self.wfile.write((line + '\r\n').encode())
+        self.wfile.flush()
+
+    def transfer(self, passive, data):
+        self.send('150 Opening data connection')
+
+        connection, _ = passive.accept()
+        connection.sendall(data)
+        connection.close()
+        passive.close()
+
+        self.send('226 Transfer complete')
+
+    def handle(self):
+        server = self.server
+        passive = None
+
+        self.send('220 Stub')
+
+        while True:
+            line = self.rfile.readline().decode().strip()
+
+            if not line:
+                return
+
+            command, _, argument = line.partition(' ')
+            command = command.upper()
+
+            with server.lock:
+                server.commands.append(command)
+
+                if server.drop_next and command not in ('USER', 'PASS'):
+                    server.drop_next = False
+                    return
+
+            if command == 'USER':
+                self.send('331 Password required')
+            elif command == 'PASS':
+                with server.lock:
+                    server.logins += 1
+
+                self.send('230 Logged in')
+            elif command == 'TYPE':
+                self.send('200 Type set')
+            elif command == 'PASV':
+                passive = socket.socket()
+                passive.bind(('127.0.0.1', 0))
+                passive.listen(1)
+                port = passive.getsockname()[1]
+
+                self.send('227 Entering Passive Mode (127,0,0,1,{},{})'.format(port >> 8, port & 255))
+            elif command == 'RETR':
+                if argument not in server.files:
+                    self.send('550 No such file')
+                else:
+                    self.transfer(passive, server.files[argument])
+            elif command in ('MLSD', 'LIST', 'NLST'):
+                if command not in server.supported:
+                    self.send('500 Unknown command')
+                    continue
+
+                entries = server.listing(argument)
+
+                if command == 'MLSD':
+                    lines = ['type=file;size={};modify=20180101000000; {}'.format(len(content), name)
+                             for name, content in entries]
+                elif command == 'LIST':
+                    lines = ['-rw-r--r--   1 ftp ftp {} Jan 01  2018 {}'.format(len(content), name)
+                             for name, content in entries]
+                else:
+                    lines = ['{}/{}'.format(argument, name) for name, _ in entries]
+
+                self.transfer(passive, ''.join(line + '\r\n' for line in lines).encode())
+            elif command == 'QUIT':
+                self.send('221 Bye')
+                return
+            else:
+                self.send('502 Not implemented')
+
+
+FILES = {'{}/DailyBulletin_pdf_201801{:02d}1.zip'.format(DIRECTORY, day): bytes([day]) * (1000 + day)
+         for day in range(1, 11)}
+
+
+@pytest.fixture
+def stub(request):
+    server = FtpStub(FILES, getattr(request, 'param', ('MLSD', 'LIST', 'NLST')))
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(stub):
+    client = FtpClient('127.0.0.1', stub.server_address[1], pool_size=3)
+
+    yield client
+
+    client.close()
+
+
+def retrieve(client, path):
+    chunks = []
+
+    client.retrieve(path, chunks.append)
+
+    return b''.join(chunks)
+
+
+def test_session_pool_reuses_logins(client, stub):
+    contents = client.download_all([(path,) for path in sorted(FILES)], lambda path: retrieve(client, path))
+
+    assert contents == [FILES[path] for path in sorted(FILES)]
+    assert 1 <= stub.logins <= 3
+
+
+def test_mlsd_listing_is_cached(client, stub):
+    first = client.listing(DIRECTORY)
+    second = client.listing(DIRECTORY)
+
+    assert first == second
+    assert first['DailyBulletin_pdf_201801011.zip']['size'] == 1001
+    assert stub.commands.count('MLSD') == 1
+
+
+@pytest.mark.parametrize('stub', [('LIST', 'NLST')], indirect=True)
+def test_list_fallback(client, stub):
+    entries = client.listing(DIRECTORY)
+
+    assert sorted(entries) == sorted(path.rsplit('/', 1)[1] for path in FILES)
+    assert entries['DailyBulletin_pdf_201801021.zip']['size'] == 1002
+
+
+@pytest.mark.parametrize('stub', [('NLST',)], indirect=True)
+def test_nlst_fallback(client, stub):
+    entries = client.listing(DIRECTORY)
+
+    assert sorted(entries) == sorted(path.rsplit('/', 1)[1] for path in FILES)
+    assert entries['DailyBulletin_pdf_201801021.zip']['size'] is None
+
+
+def test_reconnects_after_dropped_session(client, stub):
+    path = sorted(FILES)[0]
+
+    assert retrieve(client, path) == FILES[path]
+
+    stub.drop_next = True
+
+    assert retrieve(client, path) == FILES[path]
+    assert stub.logins == 2
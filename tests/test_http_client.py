@@ -0,0 +1,161 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from validol.model.mine import downloader
+from validol.model.mine.http_client import HttpClient, DEFAULT_POLICY
+from validol.model.store.connection import ConnectionManager
+
+
+HOST = '127.0.0.1'
+
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, body=b'', headers=()):
+        self.send_response(status)
+
+        for key, value in headers:
+            self.send_header(key, value)
+
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        state = self.server.state
+        path = self.path.split('?')[0]
+
+        with state['lock']:
+            state['hits'][path] = state['hits'].get(path, 0) + 1
+            hits = state['hits'][path]
+
+        if path == '/flaky':
+            self.reply(503 if hits <= 2 else 200, b'recovered')
+        elif path == '/down':
+            self.reply(500)
+        elif path == '/etag':
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.reply(304, headers=[('ETag', '"v1"')])
+            else:
+                self.reply(200, b'report', [('ETag', '"v1"')])
+        elif path == '/plain':
+            self.reply(200, 'body {}'.format(hits).encode())
+        elif path == '/slow':
+            with state['lock']:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+
+            time.sleep(0.1)
+
+            with state['lock']:
+                state['active'] -= 1
+
+            self.reply(200, b'slow')
+        else:
+            self.reply(404)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer((HOST, 0), Handler)
+    server.state = {'lock': threading.Lock(), 'hits': {}, 'active': 0, 'peak': 0}
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def url(server, path):
+    return 'http://{}:{}{}'.format(HOST, server.server_address[1], path)
+
+
+def make_client(tmp_path=None, **policy):
+    client = HttpClient({HOST: policy}, dict(DEFAULT_POLICY, backoff=0, timeout=(5, 5)))
+
+    if tmp_path is not None:
+        client.attach_cache(ConnectionManager(str(tmp_path / 'cache.sqlite')))
+
+    return client
+
+
+def test_retries_on_server_errors(server):
+    response = make_client(retries=3).get(url(server, '/flaky'))
+
+    assert response.status_code == 200
+    assert response.content == b'recovered'
+    assert server.state['hits']['/flaky'] == 3
+
+
+def test_gives_up_after_retries(server):
+    response = make_client(retries=2).get(url(server, '/down'))
+
+    assert response.status_code == 500
+    assert server.state['hits']['/down'] == 3
+
+
+def test_host_concurrency_limit(server):
+    client = make_client(concurrency=2, rate=0)
+
+    threads = [threading.Thread(target=client.get, args=(url(server, '/slow'),)) for _ in range(6)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert server.state['hits']['/slow'] == 6
+    assert server.state['peak'] <= 2
+
+
+def test_host_rate_limit(server):
+    client = make_client(rate=20)
+
+    start = time.monotonic()
+
+    for _ in range(5):
+        client.get(url(server, '/plain'))
+
+    assert time.monotonic() - start >= 0.2
+
+
+def test_etag_revalidation_reuses_cached_body(server, tmp_path):
+    client = make_client(tmp_path)
+
+    first = client.get(url(server, '/etag'), ttl=0)
+    second = client.get(url(server, '/etag'), ttl=0)
+
+    assert first.content == second.content == b'report'
+    assert getattr(second, 'from_cache', False)
+    assert server.state['hits']['/etag'] == 2
+
+
+def test_ttl_expiry(server, tmp_path):
+    client = make_client(tmp_path)
+
+    assert client.get(url(server, '/plain'), ttl=0.3).content == b'body 1'
+    assert client.get(url(server, '/plain'), ttl=0.3).content == b'body 1'
+    assert server.state['hits']['/plain'] == 1
+
+    time.sleep(0.4)
+
+    assert client.get(url(server, '/plain'), ttl=0.3).content == b'body 2'
+    assert server.state['hits']['/plain'] == 2
+
+
+def test_download_all(server, monkeypatch):
+    monkeypatch.setattr(downloader, 'client', make_client())
+
+    contents = downloader.download_all([(url(server, '/plain'),), (url(server, '/missing'),)])
+
+    assert contents[0].startswith(b'body')
+    assert contents[1] is None
@@ -0,0 +1,107 @@
+import datetime as dt
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import validol.model.store.structures.pdf_helper as pdf_helper_module
+from validol.model.store.connection import ConnectionManager
+from validol.model.store.miners.daily_reports.daily import DailyResource, BatchedUpdate
+from validol.model.store.parsed_cache import ParsedCache
+from validol.model.store.structures.pdf_helper import PdfHelper
+
+
+DATE = dt.date(2018, 3, 1)
+CONTENT = b'%PDF-1.4 bulletin'
+
+
+class Processor:
+    NAME = 'test'
+    parser_config = None
+
+    def map_content(self, content):
+        return content
+
+    def config(self, document):
+        return [{'pages': [1]}]
+
+    def process_df(self, df):
+        return df
+
+
+class Cache:
+    def __init__(self):
+        self.deleted = []
+
+    def get(self, date):
+        return CONTENT
+
+    def delete(self, date):
+        self.deleted.append(date)
+
+
+@pytest.fixture
+def resource(tmp_path):
+    pdf_helper = PdfHelper(other_info={})
+    pdf_helper.processor = Processor()
+    pdf_helper.name = SimpleNamespace(active_only=lambda: 'ACTIVE')
+
+    resource = DailyResource.__new__(DailyResource)
+    resource.table = 'Active'
+    resource.pdf_helper = pdf_helper
+    resource.cache = Cache()
+    resource.model_launcher = SimpleNamespace(cache_db=ConnectionManager(str(tmp_path / 'cache.sqlite')))
+
+    return resource
+
+
+def cached(resource):
+    return resource.model_launcher.cache_db.connection.execute(
+        'SELECT COUNT(*) FROM "{}"'.format(ParsedCache(resource.model_launcher.cache_db.connection).table)
+    ).fetchone()[0]
+
+
+def test_failed_parse_is_not_cached(resource, monkeypatch):
+    def failing_pdf(path, config):
+        raise RuntimeError('tabula died')
+
+    monkeypatch.setattr(pdf_helper_module, 'pdf', failing_pdf)
+
+    dfs = list(resource.parse_dates([DATE]))
+
+    assert len(dfs) == 1 and dfs[0].empty
+    assert cached(resource) == 0
+    assert resource.cache.deleted == []
+
+    monkeypatch.setattr(pdf_helper_module, 'pdf', lambda path, config: pd.DataFrame({'SETT': [1.0]}))
+
+    dfs = list(resource.parse_dates([DATE]))
+
+    assert len(dfs[0]) == 1
+    assert cached(resource) == 1
+
+
+def test_document_without_pages_is_cached_as_empty(resource, monkeypatch):
+    monkeypatch.setattr(Processor, 'config', lambda self, document: [{'pages': []}])
+
+    dfs = list(resource.parse_dates([DATE]))
+
+    assert dfs[0].empty
+    assert cached(resource) == 1
+
+
+def test_batched_update_writes_bounded_batches():
+    written = []
+    resource = SimpleNamespace(write_update=written.append,
+                               get_range=lambda df: [min(df.Date), max(df.Date)])
+
+    batches = BatchedUpdate(resource, rows=2)
+
+    for day in range(1, 6):
+        batches.add(pd.DataFrame({'Date': [dt.date(2018, 3, day)]}))
+
+    batches.add(pd.DataFrame())
+
+    assert [len(df) for df in written] == [2, 2]
+    assert batches.flush() == [dt.date(2018, 3, 1), dt.date(2018, 3, 5)]
+    assert [len(df) for df in written] == [2, 2, 1]
@@ -0,0 +1,45 @@
+import os
+from io import BytesIO
+from zipfile import ZipFile
+
+import pytest
+
+from validol.model.store.miners.daily_reports.pdf_helpers.cme import CmeParser, CmeBulletin
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'bulletins')
+
+LABELS = {
+    'preliminary.pdf': True,
+    'preliminary_compressed.pdf': True,
+    'final.pdf': False,
+    'final_preliminary_in_body.pdf': False,
+    'preliminary_legal.pdf': True,
+    'final_legal.pdf': False,
+    'empty.pdf': False
+}
+
+
+def read(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as file:
+        return file.read()
+
+
+def bulletin_zip(name):
+    content = BytesIO()
+
+    with ZipFile(content, 'w') as zip_file:
+        zip_file.writestr('DailyBulletin_20180301.pdf', read(name))
+
+    return content.getvalue()
+
+
+@pytest.mark.parametrize('name', sorted(LABELS))
+def test_if_preliminary_pdf(name):
+    assert CmeParser.if_preliminary_pdf(BytesIO(read(name))) == LABELS[name]
+
+
+@pytest.mark.parametrize('name', ['preliminary.pdf', 'final_preliminary_in_body.pdf'])
+def test_bulletin_is_preliminary(name):
+    with CmeBulletin(bulletin_zip(name)) as bulletin:
+        assert bulletin.is_preliminary() == LABELS[name]
@@ -0,0 +1,97 @@
+import datetime as dt
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from validol.model.store.bulk_writer import BulkWriter
+from validol.model.store.connection import ConnectionManager
+from validol.model.store.resource import Platforms, ResourceCatalog, FlavorStorage, create_catalog
+from validol.model.store.miners.weekly_reports.active import Active, WeeklyActives
+
+
+FLAVOR = {
+    "name": "test_weekly",
+    "schema": [("OI", "INTEGER"), ("Share", "REAL")],
+    "columnar": True
+}
+
+LEGACY = dict(FLAVOR, columnar=False)
+
+DATES = [dt.date(2018, 1, 2), dt.date(2018, 1, 9), dt.date(2018, 1, 16)]
+
+
+@pytest.fixture
+def launcher(tmp_path):
+    db = ConnectionManager(str(tmp_path / 'main.db'))
+    create_catalog(db.connection)
+
+    launcher = SimpleNamespace(main_db=db, main_dbh=db.connection)
+
+    Platforms(launcher, FLAVOR['name']).write_single('CFTC', 'TEST')
+    WeeklyActives(launcher, FLAVOR['name']).write_df(pd.DataFrame(
+        [('CFTC', 'GOLD'), ('CFTC', 'SILVER')], columns=('PlatformCode', 'ActiveName')))
+
+    yield launcher
+
+    db.close()
+
+
+def frame(dates, oi):
+    return pd.DataFrame({'Date': dates, 'OI': oi, 'Share': [value / 4 for value in oi]})
+
+
+@pytest.mark.parametrize('flavor', [FLAVOR, LEGACY], ids=['columnar', 'legacy'])
+def test_round_trip(launcher, flavor):
+    gold = Active(launcher, flavor, 'CFTC', 'GOLD')
+    silver = Active(launcher, flavor, 'CFTC', 'SILVER')
+
+    gold.write_df(frame(DATES, [1, 2, 3]))
+    silver.write_df(frame(DATES[:1], [10]))
+
+    df = gold.read_df()
+
+    assert df.OI.tolist() == [1, 2, 3]
+    assert df.Share.tolist() == [0.25, 0.5, 0.75]
+    assert gold.read_dates_dt(DATES[1], DATES[2]).OI.tolist() == [2, 3]
+    assert silver.read_df().OI.tolist() == [10]
+
+    gold.write_df(frame(DATES[2:], [30]))
+
+    assert gold.read_df().OI.tolist() == [1, 2, 30]
+
+
+def test_columnar_storage_has_no_active_tables(launcher):
+    Active(launcher, FLAVOR, 'CFTC', 'GOLD').write_df(frame(DATES, [1, 2, 3]))
+
+    tables = {name for name, in launcher.main_dbh.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+
+    assert FlavorStorage.storage_name(FLAVOR['name']) in tables
+    assert not any(name.startswith('Active_platform_') for name in tables)
+
+
+def test_catalog_range_and_row_count(launcher):
+    gold = Active(launcher, FLAVOR, 'CFTC', 'GOLD')
+
+    assert gold.range() == [None, None]
+    assert gold.row_count() == 0
+
+    gold.write_df(frame(DATES[1:], [2, 3]))
+
+    assert gold.range() == DATES[1:]
+    assert gold.row_count() == 2
+
+    with BulkWriter(launcher.main_db) as writer:
+        gold.with_writer(writer).write_df(frame(DATES[:1], [1]))
+
+        assert gold.row_count() == 2
+
+    assert gold.range() == [DATES[0], DATES[2]]
+    assert gold.row_count() == 3
+
+    Active(launcher, FLAVOR, 'CFTC', 'SILVER').write_df(frame([dt.date(2018, 1, 23)], [4]))
+
+    entries = ResourceCatalog(launcher.main_dbh).get_entries(FLAVOR['name'])
+
+    assert sorted(entries.ActiveName) == ['GOLD', 'SILVER']
+    assert ResourceCatalog(launcher.main_dbh).flavor_range(FLAVOR['name']) == [DATES[0], dt.date(2018, 1, 23)]
@@ -0,0 +1,48 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from validol.model.store.typed_reader import read_typed
+
+
+TYPES = {'Date': 'INTEGER', 'OI': 'INTEGER', 'Price': 'REAL', 'Missing': 'INTEGER', 'CONTRACT': 'TEXT'}
+
+
+def database(rows):
+    dbh = sqlite3.connect(':memory:')
+    dbh.execute('CREATE TABLE t (Date INTEGER, OI INTEGER, Price REAL, Missing INTEGER, CONTRACT TEXT)')
+    dbh.executemany('INSERT INTO t VALUES (?, ?, ?, ?, ?)', rows)
+
+    return dbh
+
+
+def test_dtypes():
+    dbh = database([(3, 10, 1.5, None, 'MAR18'), (1, 20, 2.5, 7, 'JUN18')])
+
+    df = read_typed(dbh, 'SELECT * FROM t', types=TYPES, index_col='Date')
+
+    assert df.index.tolist() == [1, 3]
+    assert df.index.dtype == np.int64
+    assert df.OI.dtype == np.int64
+    assert df.Price.dtype == np.float64
+    assert df.Missing.dtype == np.float64 and np.isnan(df.Missing.loc[3])
+    assert isinstance(df.CONTRACT.dtype, pd.CategoricalDtype)
+
+
+def test_grows_past_capacity():
+    dbh = database([(day, day, day / 2, day, 'MAR18') for day in range(5000)])
+
+    df = read_typed(dbh, 'SELECT * FROM t', types=TYPES, capacity=1)
+
+    assert len(df) == 5000
+    assert df.OI.tolist() == list(range(5000))
+
+
+def test_untyped_columns():
+    dbh = database([(1, 10, 1.5, 7, 'MAR18')])
+
+    df = read_typed(dbh, 'SELECT Date, OI * 2 AS Doubled, CONTRACT AS Name FROM t')
+
+    assert df.Doubled.tolist() == [20]
+    assert df.Name.tolist() == ['MAR18']
@@ -0,0 +1,137 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from validol.model.store.connection import ConnectionManager
+from validol.model.store.resource import Updater, CompositeUpdater, UpdateExecutor, UpdateTelemetry
+from validol.model.utils.progress import Progress
+
+
+class Log:
+    def __init__(self):
+        self.events = []
+        self.lock = threading.Lock()
+
+    def add(self, *event):
+        with self.lock:
+            self.events.append(event)
+
+    def index(self, *event):
+        return self.events.index(event)
+
+
+class Source(Updater):
+    NAMES = []
+    FAILING = {}
+    DEPENDENCIES = {}
+
+    def get_sources(self):
+        return [{'name': name} for name in self.NAMES]
+
+    def update_source_impl(self, source):
+        log = self.model_launcher.log
+        log.add('start', source)
+
+        time.sleep(0.01)
+
+        if source in self.FAILING:
+            raise self.FAILING[source]
+
+        log.add('finish', source)
+
+        return [source, source]
+
+    def dependencies(self, source):
+        return self.DEPENDENCIES.get(source, [])
+
+
+class Prices(Source):
+    NAMES = ['gold', 'silver']
+
+
+class Reports(Source):
+    NAMES = ['weekly']
+    DEPENDENCIES = {'weekly': [(Prices, None)]}
+
+
+class Broken(Source):
+    NAMES = ['broken']
+    FAILING = {'broken': requests.exceptions.ConnectionError('offline')}
+
+
+class Crashing(Source):
+    NAMES = ['crashing']
+    FAILING = {'crashing': ValueError('bad data')}
+
+
+class Everything(CompositeUpdater):
+    def __init__(self, model_launcher):
+        CompositeUpdater.__init__(self, model_launcher, 'everything', [Broken, Reports])
+
+
+@pytest.fixture
+def launcher(tmp_path):
+    db = ConnectionManager(str(tmp_path / 'main.db'))
+    pool = ThreadPoolExecutor(UpdateExecutor.WORKERS)
+    registered = []
+
+    yield SimpleNamespace(main_db=db, main_dbh=db.connection, progress=Progress(), update_pool=pool,
+                          log=Log(), registered=registered, register_update=registered.append)
+
+    pool.shutdown()
+    db.close()
+
+
+def test_dependencies_run_after_parent(launcher):
+    results = Reports(launcher).update_entire()
+
+    assert [source for source, _ in results] == ['weekly', 'gold', 'silver']
+
+    for source in ('gold', 'silver'):
+        assert launcher.log.index('finish', 'weekly') < launcher.log.index('start', source)
+
+    assert sorted(launcher.registered) == ['gold', 'silver', 'weekly']
+
+
+def test_composite_tolerates_network_errors(launcher):
+    results = Everything(launcher).update_source('everything')
+
+    assert sorted(source for source, _ in results) == ['gold', 'silver', 'weekly']
+    assert 'broken' not in launcher.registered
+
+
+def test_network_error_of_direct_source_is_raised(launcher):
+    with pytest.raises(requests.exceptions.ConnectionError):
+        Broken(launcher).update_source('broken')
+
+
+def test_other_errors_are_raised(launcher):
+    with pytest.raises(ValueError):
+        Crashing(launcher).update_source('crashing')
+
+
+def test_telemetry_is_recorded(launcher):
+    Reports(launcher).update_entire()
+
+    with pytest.raises(ValueError):
+        Crashing(launcher).update_source('crashing')
+
+    rows = launcher.main_dbh.execute(
+        'SELECT source, error FROM "{}"'.format(UpdateTelemetry(launcher.main_dbh).table)).fetchall()
+
+    assert sorted(source for source, _ in rows) == ['crashing', 'gold', 'silver', 'weekly']
+    assert dict(rows)['crashing'] == 'ValueError: bad data'
+    assert dict(rows)['weekly'] is None
+
+
+def test_pool_is_reused(launcher):
+    Reports(launcher).update_entire()
+    threads = set(launcher.update_pool._threads)
+
+    Reports(launcher).update_entire()
+
+    assert set(launcher.update_pool._threads) == threads
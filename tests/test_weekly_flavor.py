@@ -0,0 +1,118 @@
+import datetime as dt
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+
+from validol.model.store.connection import ConnectionManager
+from validol.model.store.resource import ResourceCatalog, create_catalog
+from validol.model.store.miners.weekly_reports.active import Active
+from validol.model.store.miners.weekly_reports.flavor import Flavor, Checkpoints
+
+
+FLAVOR = {
+    "name": "test_weekly",
+    "keys": ["Code", "Market"],
+    "date": "Day",
+    "values": {"Day": "Date", "Open": "OI"},
+    "schema": [("OI", "INTEGER")],
+    "columnar": True
+}
+
+
+class CsvFlavor(Flavor):
+    def __init__(self, model_launcher, rows):
+        Flavor.__init__(self, model_launcher, [FLAVOR])
+
+        self.rows = rows
+
+    def sources(self, flavor, since):
+        return [['test://report.csv', 0, '%Y-%m-%d', None]]
+
+    def download(self, sources):
+        return ['Code,Market,Day,Open\n{}'.format(''.join(
+            '{},{} - EXCHANGE,{},{}\n'.format(code, market, day, value)
+            for code, market, day, value in self.rows)).encode() for _ in sources]
+
+    def open_source(self, content, names):
+        return BytesIO(content)
+
+
+@pytest.fixture
+def launcher(tmp_path):
+    db = ConnectionManager(str(tmp_path / 'main.db'))
+    create_catalog(db.connection)
+
+    yield SimpleNamespace(main_db=db, main_dbh=db.connection)
+
+    db.close()
+
+
+def rows(code, market, days):
+    return [(code, market, '2018-01-{:02d}'.format(day), day) for day in days]
+
+
+def test_new_active_gets_full_history(launcher):
+    CsvFlavor(launcher, rows('GC', 'GOLD', [2, 9])).update_flavor(FLAVOR)
+
+    CsvFlavor(launcher, rows('GC', 'GOLD', [2, 9, 16]) + rows('SI', 'SILVER', [2, 9, 16])).update_flavor(FLAVOR)
+
+    for market in ('GOLD', 'SILVER'):
+        active = Active(launcher, FLAVOR, 'GC' if market == 'GOLD' else 'SI', market)
+
+        assert active.read_df().OI.tolist() == [2, 9, 16]
+        assert active.range() == [dt.date(2018, 1, 2), dt.date(2018, 1, 16)]
+        assert active.row_count() == 3
+
+    entries = ResourceCatalog(launcher.main_dbh).get_entries(FLAVOR['name'])
+
+    assert sorted(entries.ActiveName) == ['GOLD', 'SILVER']
+
+
+class FailingFlavor(CsvFlavor):
+    def __init__(self, model_launcher, rows, fail_at=None):
+        CsvFlavor.__init__(self, model_launcher, rows)
+
+        self.fail_at = fail_at
+        self.chunks = []
+
+    def process_flavor(self, df, flavor, last_dates=None):
+        if len(self.chunks) == self.fail_at:
+            raise RuntimeError('interrupted')
+
+        self.chunks.append(df.Date.tolist())
+
+        return CsvFlavor.process_flavor(self, df, flavor, last_dates)
+
+
+def test_resumes_from_checkpoint(launcher, monkeypatch):
+    monkeypatch.setattr(Flavor, 'CHUNK_SIZE', 2)
+
+    data = rows('GC', 'GOLD', [2, 9, 16, 23, 30])
+
+    with pytest.raises(RuntimeError):
+        FailingFlavor(launcher, data, fail_at=1).update_flavor(FLAVOR)
+
+    state = Checkpoints(launcher).get(FLAVOR['name'])
+
+    assert (state['source'], state['chunk']) == (0, 1)
+
+    flavor = FailingFlavor(launcher, data)
+
+    assert flavor.update_flavor(FLAVOR) == [dt.date(2018, 1, 16), dt.date(2018, 1, 30)]
+    assert [len(chunk) for chunk in flavor.chunks] == [2, 1]
+    assert Checkpoints(launcher).get(FLAVOR['name']) is None
+    assert Active(launcher, FLAVOR, 'GC', 'GOLD').read_df().OI.tolist() == [2, 9, 16, 23, 30]
+
+
+def test_restarts_source_that_changed(launcher, monkeypatch):
+    monkeypatch.setattr(Flavor, 'CHUNK_SIZE', 2)
+
+    with pytest.raises(RuntimeError):
+        FailingFlavor(launcher, rows('GC', 'GOLD', [2, 9, 16]), fail_at=1).update_flavor(FLAVOR)
+
+    flavor = FailingFlavor(launcher, rows('GC', 'GOLD', [2, 9, 16, 23]))
+    flavor.update_flavor(FLAVOR)
+
+    assert len(flavor.chunks) == 2
+    assert Active(launcher, FLAVOR, 'GC', 'GOLD').read_df().OI.tolist() == [2, 9, 16, 23]
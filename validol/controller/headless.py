@@ -0,0 +1,137 @@
+import datetime as dt
+import os
+import socket
+import time
+import traceback
+
+import requests
+from croniter import croniter
+
+from validol.setup_cfg import SETUP_CONFIG
+from validol.model.launcher import ModelLauncher
+from validol.model.utils.progress import Progress
+
+
+class HeadlessLauncher:
+    def __init__(self, root=None, verbose=False):
+        if root is not None:
+            os.chdir(root)
+
+        self.model_launcher = ModelLauncher(self)
+
+        if verbose:
+            self.model_launcher.progress = Progress(HeadlessLauncher.show_progress)
+
+        self.model_launcher.init_data()
+
+    @staticmethod
+    def show_progress(source, step, rows, size):
+        print('{}: {}{}{}'.format(source, step,
+                                  ', {} rows'.format(rows) if rows else '',
+                                  ', {:.1f} MB'.format(size / 2 ** 20) if size else ''))
+
+    def get_package_config(self):
+        return SETUP_CONFIG
+
+    def current_pip_version(self):
+        return self.get_package_config()['version']
+
+    def mark_update_required(self):
+        print('A newer version of {} is available'.format(SETUP_CONFIG['name']))
+
+    def register_update(self, source):
+        pass
+
+    def notify(self, message):
+        print(message)
+
+    def notify_update(self, results):
+        for source, (begin, end) in results:
+            print('{}: {} - {}'.format(source, begin, end))
+
+    def display_error(self, title, message):
+        print('{}: {}'.format(title, message))
+
+    def update_source(self, source):
+        try:
+            self.notify_update(self.model_launcher.get_update_manager().update_source(source))
+        except (requests.exceptions.ConnectionError, socket.gaierror):
+            self.notify('Update of {} failed due to network error'.format(source))
+        except Exception:
+            self.notify('Update of {} failed:\n{}'.format(source, traceback.format_exc()))
+
+    def close(self):
+        self.model_launcher.close()
+
+
+class SchedulerDaemon:
+    POLL_INTERVAL = 60
+
+    def __init__(self, launcher, poll_interval=POLL_INTERVAL):
+        self.launcher = launcher
+        self.model_launcher = launcher.model_launcher
+        self.poll_interval = poll_interval
+
+        self.jobs = {}
+
+    @staticmethod
+    def next_event(scheduler, now):
+        return croniter(scheduler.cron, now).get_next(dt.datetime)
+
+    def refresh(self, now):
+        update_manager = self.model_launcher.get_update_manager()
+
+        jobs = {}
+
+        for scheduler in self.model_launcher.read_schedulers():
+            key = scheduler.name, scheduler.cron
+
+            if not scheduler.working or scheduler.name not in update_manager.source_map:
+                continue
+
+            if key in self.jobs:
+                jobs[key] = self.jobs[key]
+            else:
+                if scheduler.next_time is not None and scheduler.next_time < now \
+                        and update_manager.config(scheduler.name)['important']:
+                    next_time = now
+                else:
+                    next_time = SchedulerDaemon.next_event(scheduler, now)
+                    self.model_launcher.set_scheduler_next_time(scheduler, next_time)
+
+                jobs[key] = scheduler, next_time
+
+        self.jobs = jobs
+
+    def run_pending(self):
+        now = dt.datetime.now()
+
+        self.refresh(now)
+
+        due = [key for key, (_, next_time) in self.jobs.items() if next_time <= now]
+
+        for source in sorted({name for name, _ in due}):
+            self.launcher.notify('Update of {} started'.format(source))
+            self.launcher.update_source(source)
+
+        now = dt.datetime.now()
+
+        for key in due:
+            scheduler = self.jobs[key][0]
+            next_time = SchedulerDaemon.next_event(scheduler, now)
+
+            self.jobs[key] = scheduler, next_time
+            self.model_launcher.set_scheduler_next_time(scheduler, next_time)
+
+        return min([next_time for _, next_time in self.jobs.values()], default=None)
+
+    def run(self):
+        while True:
+            next_time = self.run_pending()
+
+            timeout = self.poll_interval
+
+            if next_time is not None:
+                timeout = min(timeout, max((next_time - dt.datetime.now()).total_seconds(), 0))
+
+            time.sleep(timeout)
@@ -91,6 +91,9 @@ class ControllerLauncher:
     def show_scheduler_dialog(self):
         self.view_launcher.show_scheduler_dialog()
 
+    def show_telemetry_dialog(self):
+        self.view_launcher.show_telemetry_dialog()
+
     def mark_update_required(self):
         self.view_launcher.mark_update_required()
 
@@ -108,6 +111,12 @@ class ControllerLauncher:
         if hasattr(self, 'view_launcher'):
             self.view_launcher.register_update(source)
 
+    def submit_update(self, job):
+        self.view_launcher.submit_update(job)
+
+    def cancel_update(self):
+        self.view_launcher.cancel_update()
+
     def update_missed_schedulers(self):
         self.view_launcher.update_missed_schedulers()
 
@@ -4,6 +4,7 @@ import datetime as dt
 import socket
 
 from validol.view.utils.qcron import QCron
+from validol.controller.update_worker import UpdateJob
 
 
 class SchedulerQCron(QCron):
@@ -79,19 +80,28 @@ class QCronManager:
         self.view_launcher.set_update_missed(bool(self.update_needed))
 
     def update_wrapper(self, update_manager, source):
-        def shot():
-            if update_manager.config(source)['verbose']:
-                self.view_launcher.notify('Update of {} started'.format(source))
+        verbose = update_manager.config(source)['verbose']
+
+        def finished(results):
+            if verbose:
+                self.view_launcher.notify_update(results)
 
-            try:
-                results = update_manager.update_source(source)
-            except (requests.exceptions.ConnectionError, socket.gaierror):
-                if update_manager.config(source)['verbose']:
+        def failed(error):
+            if isinstance(error, (requests.exceptions.ConnectionError, socket.gaierror)):
+                if verbose:
                     self.view_launcher.notify('Update of {} failed due to network error'.format(source))
-                return
+            else:
+                print('Update of {} failed: {}'.format(source, error))
 
-            if update_manager.config(source)['verbose']:
-                self.view_launcher.notify_update(results)
+        def shot():
+            if verbose:
+                self.view_launcher.notify('Update of {} started'.format(source))
+
+            self.view_launcher.submit_update(UpdateJob(
+                source,
+                lambda: self.model_launcher.get_update_manager().update_source(source),
+                finished,
+                failed))
 
         return shot
 
@@ -0,0 +1,92 @@
+from PyQt5 import QtCore
+
+from validol.model.utils.progress import Progress, UpdateCancelled
+
+
+class UpdateJob:
+    def __init__(self, name, action, on_finished=None, on_failed=None):
+        self.name = name
+        self.action = action
+        self.on_finished = on_finished or (lambda results: None)
+        self.on_failed = on_failed or (lambda error: None)
+
+
+class UpdateRunner(QtCore.QObject):
+    progress = QtCore.pyqtSignal(str, str, object, object)
+    finished = QtCore.pyqtSignal(object, object)
+    failed = QtCore.pyqtSignal(object, object)
+
+    def __init__(self, model_launcher):
+        QtCore.QObject.__init__(self)
+
+        self.model_launcher = model_launcher
+        self.current = None
+
+    @QtCore.pyqtSlot(object)
+    def run(self, job):
+        self.current = self.model_launcher.progress = Progress(self.progress.emit)
+
+        try:
+            results = job.action()
+        except UpdateCancelled as e:
+            print('Update of {} cancelled at {}'.format(job.name, e))
+            self.failed.emit(job, e)
+        except Exception as e:
+            self.failed.emit(job, e)
+        else:
+            self.finished.emit(job, results)
+        finally:
+            self.current = None
+            self.model_launcher.progress = Progress()
+
+    def cancel(self):
+        current = self.current
+
+        if current is not None:
+            current.cancel()
+
+
+class UpdateWorker(QtCore.QObject):
+    submitted = QtCore.pyqtSignal(object)
+    progress = QtCore.pyqtSignal(str, str, object, object)
+    registered = QtCore.pyqtSignal(str)
+    update_required = QtCore.pyqtSignal()
+
+    def __init__(self, model_launcher):
+        QtCore.QObject.__init__(self)
+
+        self.runner = UpdateRunner(model_launcher)
+
+        self.worker_thread = QtCore.QThread()
+        self.runner.moveToThread(self.worker_thread)
+
+        self.submitted.connect(self.runner.run)
+        self.runner.progress.connect(self.on_progress)
+        self.runner.finished.connect(self.on_finished)
+        self.runner.failed.connect(self.on_failed)
+
+        self.worker_thread.start()
+
+    def submit(self, job):
+        self.submitted.emit(job)
+
+    def cancel(self):
+        self.runner.cancel()
+
+    def stop(self):
+        self.cancel()
+
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+
+    @QtCore.pyqtSlot(str, str, object, object)
+    def on_progress(self, source, step, rows, size):
+        self.progress.emit(source, step, rows, size)
+
+    @QtCore.pyqtSlot(object, object)
+    def on_finished(self, job, results):
+        job.on_finished(results)
+
+    @QtCore.pyqtSlot(object, object)
+    def on_failed(self, job, error):
+        job.on_failed(error)
@@ -5,6 +5,10 @@ from validol.migration.scripts.preliminary_filter import main as zzt_main
 from validol.migration.scripts.expirations_source_fix import main as zztf_main
 from validol.migration.scripts.show import main as fty_main
 from validol.migration.scripts.monetary_fix import main as fn_main
+from validol.migration.scripts.columnar_storage import main as fs_main
+from validol.migration.scripts.resource_catalog import main as fe_main
+from validol.migration.scripts.response_cache import main as fnn_main
+from validol.migration.scripts.blob_store import main as sty_main
 
 from validol.model.utils.utils import map_version
 
@@ -20,7 +24,11 @@ MIGRATION_MAP = [
     ('0.0.30', zzt_main),
     ('0.0.34', zztf_main),
     ('0.0.40', fty_main),
-    ('0.0.50', fn_main)
+    ('0.0.50', fn_main),
+    ('0.0.57', fs_main),
+    ('0.0.58', fe_main),
+    ('0.0.59', fnn_main),
+    ('0.0.60', sty_main)
 ]
 
 
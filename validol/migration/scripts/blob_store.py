@@ -0,0 +1,24 @@
+import os
+
+from validol.model.store.miners.daily_reports.cme import Active
+
+
+def main(model_launcher):
+    dbh = model_launcher.cache_db.connection
+
+    tables = {name for name, in dbh.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+    if 'ftp' not in tables:
+        return
+
+    names = [name for name, in dbh.execute('SELECT name FROM ftp WHERE value IS NOT NULL')]
+
+    for name in names:
+        value, = dbh.execute('SELECT value FROM ftp WHERE name = ?', (name,)).fetchone()
+
+        model_launcher.blob_store.put(name, value, Active.Cache.handle_helper(os.path.basename(name)))
+
+    dbh.execute('DROP TABLE ftp')
+    dbh.commit()
+
+    dbh.execute('VACUUM')
@@ -0,0 +1,45 @@
+import re
+from shutil import copyfile
+
+from validol.model.store.resource import FlavorStorage
+from validol.model.store.miners.weekly_reports.flavors import WEEKLY_REPORT_FLAVORS
+
+
+def active_tables(dbh, flavor):
+    pattern = re.compile(r'^Active_platform_\d+_active_(\d+)_{}$'.format(re.escape(flavor['name'])))
+
+    for name, in dbh.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall():
+        match = pattern.match(name)
+
+        if match is not None:
+            yield name, int(match.group(1))
+
+
+def main(model_launcher):
+    copyfile('main.db', 'main.db.old')
+
+    dbh = model_launcher.main_dbh
+
+    for flavor in WEEKLY_REPORT_FLAVORS:
+        if not flavor.get('columnar', False):
+            continue
+
+        storage = FlavorStorage(dbh, flavor['name'], flavor['schema'])
+
+        columns = ", ".join('"{}"'.format(name) for name, _ in storage.schema[1:])
+
+        for table, active_id in list(active_tables(dbh, flavor)):
+            dbh.execute('''
+                INSERT INTO
+                    "{storage}" ("active_id", {columns})
+                SELECT
+                    ?, {columns}
+                FROM
+                    "{table}"'''.format(storage=storage.table, columns=columns, table=table),
+                        (active_id,))
+
+            dbh.execute('DROP TABLE "{table}"'.format(table=table))
+
+        dbh.commit()
+
+    dbh.execute('VACUUM')
@@ -0,0 +1,46 @@
+import re
+import sqlite3
+
+from validol.model.store.resource import ResourceCatalog
+from validol.model.store.miners.weekly_reports.flavors import WEEKLY_REPORT_FLAVORS
+from validol.model.store.miners.weekly_reports.utils import active_iterator
+
+
+ACTIVE_TABLE = re.compile(r'^Active_platform_\d+_active_(\d+)_(.+)$')
+
+
+def active_names(dbh, flavor, active_id):
+    try:
+        names = dbh.execute('''
+            SELECT
+                PlatformCode, ActiveName
+            FROM
+                "Actives_{flavor}"
+            WHERE
+                id = ?'''.format(flavor=flavor), (active_id,)).fetchone()
+    except sqlite3.OperationalError:
+        names = None
+
+    return names or (None, None)
+
+
+def main(model_launcher):
+    dbh = model_launcher.main_dbh
+
+    catalog = ResourceCatalog(dbh)
+
+    for name, in dbh.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall():
+        match = ACTIVE_TABLE.match(name)
+
+        if match is not None:
+            active_id, flavor = int(match.group(1)), match.group(2)
+
+            catalog.refresh(name, '"{}"'.format(name),
+                            (flavor,) + tuple(active_names(dbh, flavor, active_id)))
+
+    for flavor in WEEKLY_REPORT_FLAVORS:
+        if flavor.get('columnar', False):
+            for active in active_iterator(flavor, model_launcher):
+                active.refresh_catalog()
+
+    dbh.commit()
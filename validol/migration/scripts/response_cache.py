@@ -0,0 +1,38 @@
+import json
+import time
+
+from validol.model.mine.response_cache import ResponseCache
+
+
+def main(model_launcher):
+    dbh = model_launcher.cache_db.connection
+
+    tables = {name for name, in dbh.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+    cache = ResponseCache(dbh)
+
+    if 'http' in tables:
+        now = time.time()
+
+        dbh.executemany('''
+            INSERT OR REPLACE INTO
+                "{table}"
+            VALUES
+                (?, ?, 200, ?, ?, ?, ?, ?, ?, ?, ?)'''.format(table=cache.table), [
+            (ResponseCache.key('GET', url), url, json.dumps({}), value, etag, last_modified, len(value), now, 0, now)
+            for url, etag, last_modified, value in dbh.execute('''
+                SELECT
+                    name, etag, last_modified, value
+                FROM
+                    http
+                WHERE
+                    value IS NOT NULL''')])
+
+    for table in ('http', 'responses', 'urls'):
+        if table in tables:
+            dbh.execute('DROP TABLE "{}"'.format(table))
+
+    dbh.commit()
+
+    dbh.execute('PRAGMA auto_vacuum=INCREMENTAL')
+    dbh.execute('VACUUM')
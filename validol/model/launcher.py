@@ -1,13 +1,10 @@
 import os
-import sqlite3
-from sqlalchemy import create_engine
-import socket
-import socks
-import json
+from concurrent.futures import ThreadPoolExecutor
 
 from validol.model.store.view.composite_updater import DailyUpdater, EntireUpdater, UpdateManager
 from validol.model.store.view.view_flavors import ALL_VIEW_FLAVORS
 from validol.model.resource_manager.resource_manager import ResourceManager
+from validol.model.resource_manager.frame_cache import FrameCache
 from validol.model.store.miners.prices import InvestingPrices
 from validol.model.store.structures.atom import Atoms
 from validol.model.store.structures.pattern import Patterns, StrPattern
@@ -17,6 +14,12 @@ from validol.model.store.structures.scheduler import Schedulers
 from validol.model.store.miners.daily_reports.expirations import Expirations
 from validol.model.store.collectors.ml import MlCurve
 from validol.model.store.structures.db_version import DbVersionManager
+from validol.model.store.blob_store import BlobStore
+from validol.model.store.page_index import page_index
+from validol.model.store.connection import ConnectionManager, PRAGMAS
+from validol.model.store.resource import ResourceCatalog, UpdateTelemetry, UpdateExecutor, create_catalog
+from validol.model.utils.progress import Progress
+from validol.model.mine.http_client import client, configure_proxy
 from validol.migration.migrate import migrate, init_version
 
 
@@ -24,9 +27,13 @@ class ModelLauncher:
     def __init__(self, controller_launcher):
         self.controller_launcher = controller_launcher
 
+        self.frame_cache = FrameCache()
+        self.progress = Progress()
+        self.update_pool = ThreadPoolExecutor(UpdateExecutor.WORKERS)
+
     def init_user(self, user_db):
-        self.user_engine = create_engine('sqlite:///{}'.format(user_db))
-        self.user_dbh = sqlite3.connect(user_db)
+        self.user_db = ConnectionManager(user_db)
+        self.user_engine = self.user_db.engine()
 
         self.resource_manager = ResourceManager(self)
 
@@ -46,9 +53,17 @@ class ModelLauncher:
 
         self.init_user(user_db)
 
-        self.main_dbh = sqlite3.connect(main_dbh)
+        self.main_db = ConnectionManager(main_dbh)
+
+        create_catalog(self.main_dbh)
+
+        self.cache_db = ConnectionManager('cache.sqlite', PRAGMAS + [('auto_vacuum', 'INCREMENTAL')])
+        self.cache_engine = self.cache_db.engine()
+
+        client.attach_cache(self.cache_db)
 
-        self.cache_engine = create_engine('sqlite:///cache.sqlite')
+        self.blob_store = BlobStore(self.cache_db)
+        page_index.attach(self.cache_db)
 
         if data_exists:
             migrate(self)
@@ -56,31 +71,26 @@ class ModelLauncher:
             self.write_db_version(init_version(self))
 
         if not main_dbh_exists:
-            self.init_main_dbh()
+            self.update_weekly()
 
         return self
 
-    def configure_proxy(self, proxy_cfg):
-        if os.path.exists(proxy_cfg):
-            with open(proxy_cfg, 'r') as infile:
-                config = json.load(infile)
-
-            socks.setdefaultproxy(socks.PROXY_TYPE_SOCKS5, addr=config['ip'], port=config['port'],
-                                  username=config['username'], password=config['password'])
-            socket.socket = socks.socksocket
-
-            print('Proxy configured: ip={}, port={}'.format(config['ip'], config['port']))
+    @property
+    def main_dbh(self):
+        return self.main_db.connection
 
-    def init_main_dbh(self):
-        real_conn = self.main_dbh
+    @property
+    def user_dbh(self):
+        return self.user_db.connection
 
-        self.main_dbh = sqlite3.connect(":memory:")
+    def close(self):
+        self.update_pool.shutdown()
 
-        self.update_weekly()
+        for db in (self.main_db, self.user_db, self.cache_db):
+            db.close()
 
-        real_conn.executescript("".join(self.main_dbh.iterdump()))
-
-        self.main_dbh = real_conn
+    def configure_proxy(self, proxy_cfg):
+        configure_proxy(proxy_cfg)
 
     def update(self, cls):
         return cls(self).update_entire()
@@ -124,6 +134,15 @@ class ModelLauncher:
     def get_flavors(self):
         return ALL_VIEW_FLAVORS
 
+    def get_catalog(self, flavor):
+        return ResourceCatalog(self.main_dbh).get_entries(flavor)
+
+    def get_telemetry_report(self, runs):
+        return UpdateTelemetry(self.main_dbh).report(runs)
+
+    def get_telemetry_trend(self, runs, metric):
+        return UpdateTelemetry(self.main_dbh).trend(runs, metric)
+
     def write_pattern(self, pattern):
         Patterns(self).write_pattern(pattern)
 
@@ -188,8 +207,13 @@ class ModelLauncher:
         Schedulers(self).set_next_time(scheduler, next_time)
 
     def register_update(self, source):
+        self.frame_cache.invalidate_source(source)
+
         self.controller_launcher.register_update(source)
 
+    def invalidate_active(self, ai):
+        self.frame_cache.invalidate_active(ai)
+
     def get_expiration_names(self):
         return Expirations(self).get_expirations()
 
@@ -1,29 +1,32 @@
 import html
 import io
 from zipfile import ZipFile, BadZipFile
-import requests
-from requests_cache import enabled
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
 
+from validol.model.utils.progress import current, tracking
+from validol.model.mine.http_client import client
 
-def read_url_(url):
-    response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
+
+WORKERS = 4
+
+
+def read_url(url, ttl=None):
+    response = client.get(url, ttl=ttl)
 
     return response if response.ok else None
 
 
-def read_url(url, cache_enabled=False):
-    if cache_enabled:
-        with enabled():
-            return read_url_(url)
-    else:
-        return read_url_(url)
+def read_content(url, ttl=None):
+    response = read_url(url, ttl)
+
+    return None if response is None else response.content
 
 
 def url_reader(f):
     @wraps(f)
-    def wrapped(url, cache_enabled=False):
-        response = read_url(url, cache_enabled)
+    def wrapped(url, ttl=None):
+        response = read_url(url, ttl)
 
         if response is None:
             return None
@@ -36,7 +39,16 @@ def url_reader(f):
 @url_reader
 def read_url_text(response):
     response.encoding = 'utf-8'
-    temp = response.text
+
+    return unescape(response.text)
+
+
+@url_reader
+def read_url_one_filed_zip(response):
+    return one_filed_zip(response.content)
+
+
+def unescape(temp):
     content = html.unescape(temp)
     while temp != content:
         temp = content
@@ -45,14 +57,31 @@ def read_url_text(response):
     return content
 
 
-@url_reader
-def read_url_one_filed_zip(response):
-    archive = response.content
-    file_like_archive = io.BytesIO(archive)
+def one_filed_zip(archive):
+    stream = one_filed_zip_stream(archive)
+
+    if stream is None:
+        return None
+
+    with stream:
+        return stream.read().decode('utf-8')
+
 
+def one_filed_zip_stream(archive):
     try:
-        with ZipFile(file_like_archive, "r") as zip_file:
-            path = zip_file.namelist()[0]
-            return zip_file.read(path).decode('utf-8')
+        zip_file = ZipFile(io.BytesIO(archive), "r")
     except BadZipFile:
-        return None
\ No newline at end of file
+        return None
+
+    return zip_file.open(zip_file.namelist()[0])
+
+
+def download_all(sources, workers=WORKERS):
+    context = current()
+
+    def get(source):
+        with tracking(*context):
+            return read_content(*source)
+
+    with ThreadPoolExecutor(workers) as executor:
+        return list(executor.map(get, sources))
\ No newline at end of file
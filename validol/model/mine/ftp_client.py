@@ -0,0 +1,170 @@
+import ftplib
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from validol.model.utils.progress import current, tracking
+
+
+class FtpClient:
+    POOL_SIZE = 3
+    LISTING_TTL = 10 * 60
+    TIMEOUT = 60
+    MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+    def __init__(self, server, port=21, pool_size=POOL_SIZE, listing_ttl=LISTING_TTL):
+        self.server = server
+        self.port = port
+        self.pool_size = pool_size
+        self.listing_ttl = listing_ttl
+
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(pool_size)
+
+        self.listings = {}
+        self.lock = threading.Lock()
+
+    def connect(self):
+        ftp = ftplib.FTP(timeout=FtpClient.TIMEOUT)
+        ftp.connect(self.server, self.port)
+        ftp.login()
+
+        return ftp
+
+    @contextmanager
+    def session(self):
+        with self.slots:
+            try:
+                ftp = self.idle.get_nowait()
+            except queue.Empty:
+                ftp = self.connect()
+
+            try:
+                yield ftp
+            except:
+                FtpClient.drop(ftp)
+                raise
+            else:
+                self.idle.put(ftp)
+
+    def call(self, action, retriable=lambda: True):
+        try:
+            with self.session() as ftp:
+                return action(ftp)
+        except (EOFError, ConnectionError, ftplib.error_temp):
+            if not retriable():
+                raise
+
+            with self.session() as ftp:
+                return action(ftp)
+
+    @staticmethod
+    def drop(ftp):
+        try:
+            ftp.close()
+        except ftplib.all_errors:
+            pass
+
+    def listing(self, directory):
+        now = time.monotonic()
+
+        with self.lock:
+            if directory in self.listings:
+                listed_at, entries = self.listings[directory]
+
+                if now - listed_at < self.listing_ttl:
+                    return entries
+
+        entries = self.call(lambda ftp: FtpClient.list_directory(ftp, directory))
+
+        with self.lock:
+            self.listings[directory] = now, entries
+
+        return entries
+
+    def invalidate(self, directory=None):
+        with self.lock:
+            if directory is None:
+                self.listings.clear()
+            else:
+                self.listings.pop(directory, None)
+
+    @staticmethod
+    def list_directory(ftp, directory):
+        try:
+            return {name: {'size': int(facts['size']), 'modify': facts.get('modify')}
+                    for name, facts in ftp.mlsd(directory)
+                    if facts.get('type') == 'file'}
+        except ftplib.error_perm:
+            pass
+
+        lines = []
+
+        try:
+            ftp.retrlines('LIST {}'.format(directory), lines.append)
+        except ftplib.error_perm:
+            lines = None
+
+        if lines is not None:
+            entries = dict(filter(None, map(FtpClient.parse_list_line, lines)))
+
+            if entries or not lines:
+                return entries
+
+        return {name.rsplit('/', 1)[-1]: {'size': None, 'modify': None} for name in ftp.nlst(directory)}
+
+    @staticmethod
+    def parse_list_line(line):
+        fields = line.split(None, 8)
+
+        if len(fields) != 9 or not fields[0].startswith('-') or fields[5] not in FtpClient.MONTHS:
+            return None
+
+        return fields[8], {'size': int(fields[4]), 'modify': None}
+
+    def retrieve(self, path, callback):
+        received = []
+
+        def receive(chunk):
+            received.append(len(chunk))
+            callback(chunk)
+
+        self.call(lambda ftp: ftp.retrbinary('RETR {}'.format(path), receive), lambda: not received)
+
+        return sum(received)
+
+    def download_all(self, items, download):
+        context = current()
+
+        def get(item):
+            with tracking(*context):
+                return download(*item)
+
+        with ThreadPoolExecutor(self.pool_size) as executor:
+            return list(executor.map(get, items))
+
+    def close(self):
+        while True:
+            try:
+                ftp = self.idle.get_nowait()
+            except queue.Empty:
+                break
+
+            try:
+                ftp.quit()
+            except ftplib.all_errors:
+                FtpClient.drop(ftp)
+
+
+clients = {}
+clients_lock = threading.Lock()
+
+
+def ftp_client(server):
+    with clients_lock:
+        if server not in clients:
+            clients[server] = FtpClient(server)
+
+        return clients[server]
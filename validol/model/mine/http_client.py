@@ -0,0 +1,228 @@
+import json
+import os
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+import socks
+from requests.adapters import HTTPAdapter
+
+from validol.model.mine.response_cache import ResponseCache
+from validol.model.utils.progress import report
+
+
+DEFAULT_POLICY = {
+    'concurrency': 4,
+    'rate': 10,
+    'retries': 3,
+    'backoff': 1,
+    'timeout': (10, 60)
+}
+
+HOST_POLICIES = {
+    'www.cftc.gov': {'concurrency': 4, 'rate': 4},
+    'www.theice.com': {'concurrency': 2, 'rate': 1},
+    'fred.stlouisfed.org': {'concurrency': 2, 'rate': 2},
+    'www.moex.com': {'concurrency': 2, 'rate': 2},
+    'ru.investing.com': {'concurrency': 1, 'rate': 1},
+    'www.investing.com': {'concurrency': 1, 'rate': 1},
+    'pypi.python.org': {'retries': 1}
+}
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+class HostLimiter:
+    def __init__(self, concurrency, rate):
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+        self.interval = 1 / rate if rate else 0
+        self.next_slot = 0
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        self.semaphore.acquire()
+
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+
+        if slot > now:
+            time.sleep(slot - now)
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.semaphore.release()
+
+
+class HttpClient:
+    USER_AGENT = 'Mozilla/5.0'
+
+    def __init__(self, policies=HOST_POLICIES, default=DEFAULT_POLICY):
+        self.policies = policies
+        self.default = default
+
+        self.limiters = {}
+        self.lock = threading.Lock()
+
+        self.session = self.mount(requests.Session())
+
+        self.cache_db = None
+        self.max_cache_size = ResponseCache.MAX_SIZE
+
+    def policy(self, host):
+        return dict(self.default, **self.policies.get(host, {}))
+
+    def limiter(self, host):
+        with self.lock:
+            if host not in self.limiters:
+                policy = self.policy(host)
+                self.limiters[host] = HostLimiter(policy['concurrency'], policy['rate'])
+
+            return self.limiters[host]
+
+    def mount(self, session):
+        session.headers['User-Agent'] = HttpClient.USER_AGENT
+
+        default = HTTPAdapter(pool_maxsize=self.default['concurrency'])
+        session.mount('http://', default)
+        session.mount('https://', default)
+
+        for host in self.policies:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.policy(host)['concurrency'])
+
+            for scheme in ('http', 'https'):
+                session.mount('{}://{}/'.format(scheme, host), adapter)
+
+        return session
+
+    def attach_cache(self, db, max_size=ResponseCache.MAX_SIZE):
+        self.cache_db = db
+        self.max_cache_size = max_size
+
+    def request(self, method, url, session=None, ttl=None, ignored=(), **kwargs):
+        session = session or self.session
+
+        if ttl is None or self.cache_db is None:
+            return self.fetch(method, url, session, **kwargs)
+
+        key = ResponseCache.key(method, url, kwargs.get('params'), kwargs.get('data'), ignored)
+        now = time.time()
+        entry = ResponseCache(self.cache_db.connection).lookup(key)
+
+        if entry is not None and entry.fresh(now):
+            with self.cache_db.transaction() as dbh:
+                ResponseCache(dbh).touch(key, now)
+
+            report('cached')
+
+            return entry.response()
+
+        if entry is not None:
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, **entry.validators())
+
+        response = self.fetch(method, url, session, entry is not None, **kwargs)
+
+        now = time.time()
+
+        if response.status_code == 304 and entry is not None:
+            with self.cache_db.transaction() as dbh:
+                ResponseCache(dbh).refresh(key, ttl, now)
+
+            return entry.response()
+
+        if response.ok:
+            with self.cache_db.transaction() as dbh:
+                cache = ResponseCache(dbh)
+                cache.store(key, response, ttl, now)
+
+                evicted = cache.compact(self.max_cache_size, now) \
+                    if cache.total_size() > self.max_cache_size else 0
+
+            if evicted:
+                with self.cache_db.write_lock:
+                    self.cache_db.connection.execute('PRAGMA incremental_vacuum').fetchall()
+
+                print('Response cache: evicted {} entries'.format(evicted))
+
+        return response
+
+    def fetch(self, method, url, session, not_modified=False, **kwargs):
+        start = time.perf_counter()
+
+        response = self.retrying(url, lambda timeout: session.request(method, url, timeout=timeout, **kwargs))
+
+        elapsed = time.perf_counter() - start
+
+        if not_modified and response.status_code == 304:
+            report('not modified', elapsed=elapsed)
+        else:
+            report('downloaded', size=len(response.content), elapsed=elapsed)
+
+        return response
+
+    def peek(self, method, url, params=None, data=None, ignored=()):
+        if self.cache_db is None:
+            return None
+
+        return ResponseCache(self.cache_db.connection).lookup(
+            ResponseCache.key(method, url, params, data, ignored))
+
+    def forget(self, method, url, params=None, data=None, ignored=()):
+        if self.cache_db is not None:
+            with self.cache_db.transaction() as dbh:
+                ResponseCache(dbh).delete(ResponseCache.key(method, url, params, data, ignored))
+
+    def get(self, url, session=None, **kwargs):
+        return self.request('GET', url, session, **kwargs)
+
+    def post(self, url, session=None, **kwargs):
+        return self.request('POST', url, session, **kwargs)
+
+    def retrying(self, url, call):
+        host = urlparse(url).hostname
+        policy = self.policy(host)
+        limiter = self.limiter(host)
+
+        for attempt in range(policy['retries'] + 1):
+            last = attempt == policy['retries']
+            delay = policy['backoff'] * 2 ** attempt
+
+            try:
+                with limiter:
+                    response = call(policy['timeout'])
+            except RETRY_ERRORS as e:
+                if last:
+                    raise
+
+                print('{}: {}, retrying in {}s'.format(host, type(e).__name__, delay))
+            else:
+                if response.status_code not in RETRY_STATUSES or last:
+                    return response
+
+                retry_after = response.headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    delay = int(retry_after)
+
+                print('{}: HTTP {}, retrying in {}s'.format(host, response.status_code, delay))
+
+            time.sleep(delay)
+
+
+client = HttpClient()
+
+
+def configure_proxy(proxy_cfg):
+    if os.path.exists(proxy_cfg):
+        with open(proxy_cfg, 'r') as infile:
+            config = json.load(infile)
+
+        socks.setdefaultproxy(socks.PROXY_TYPE_SOCKS5, addr=config['ip'], port=config['port'],
+                              username=config['username'], password=config['password'])
+        socket.socket = socks.socksocket
+
+        print('Proxy configured: ip={}, port={}'.format(config['ip'], config['port']))
@@ -0,0 +1,198 @@
+import hashlib
+import json
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from validol.model.store.resource import Table
+
+
+FOREVER = float('inf')
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+
+class CacheEntry:
+    def __init__(self, url, status, headers, content, etag, last_modified, expires_at):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    def fresh(self, now):
+        return self.expires_at is None or now < self.expires_at
+
+    def validators(self):
+        headers = {}
+
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+
+        return headers
+
+    def response(self):
+        response = requests.Response()
+        response.url = self.url
+        response.status_code = self.status
+        response.headers = CaseInsensitiveDict(json.loads(self.headers))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = self.content
+        response.from_cache = True
+
+        return response
+
+
+class ResponseCache(Table):
+    MAX_SIZE = 1024 ** 3
+    COMPACT_RATIO = 0.9
+
+    def __init__(self, dbh):
+        Table.__init__(self, dbh, "ResponseCache", [
+            ("key", "TEXT PRIMARY KEY"),
+            ("url", "TEXT"),
+            ("status", "INTEGER"),
+            ("headers", "TEXT"),
+            ("content", "BLOB"),
+            ("etag", "TEXT"),
+            ("last_modified", "TEXT"),
+            ("size", "INTEGER"),
+            ("stored_at", "REAL"),
+            ("expires_at", "REAL"),
+            ("accessed_at", "REAL")])
+
+        self.dbh.cursor().execute('''
+            CREATE INDEX IF NOT EXISTS
+                "{table}_accessed_at"
+            ON
+                "{table}" (accessed_at)'''.format(table=self.table))
+
+    @staticmethod
+    def key(method, url, params=None, data=None, ignored=()):
+        def canonical(values):
+            if values is None:
+                return None
+
+            items = values.items() if isinstance(values, dict) else values
+
+            return sorted([key, value] for key, value in items if key not in ignored)
+
+        return hashlib.sha1(json.dumps([method.upper(), url, canonical(params), canonical(data)],
+                                       default=str).encode('utf-8')).hexdigest()
+
+    def lookup(self, key):
+        row = self.dbh.cursor().execute('''
+            SELECT
+                url,
+                status,
+                headers,
+                content,
+                etag,
+                last_modified,
+                expires_at
+            FROM
+                "{table}"
+            WHERE
+                key = ?'''.format(table=self.table), (key,)).fetchone()
+
+        return None if row is None else CacheEntry(*row)
+
+    @staticmethod
+    def expires_at(ttl, now):
+        return None if ttl == FOREVER else now + ttl
+
+    def store(self, key, response, ttl, now):
+        self.dbh.cursor().execute('''
+            INSERT OR REPLACE INTO
+                "{table}"
+            VALUES
+                (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'''.format(table=self.table), (
+            key,
+            response.url,
+            response.status_code,
+            json.dumps(dict(response.headers)),
+            response.content,
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified'),
+            len(response.content),
+            now,
+            ResponseCache.expires_at(ttl, now),
+            now))
+
+    def refresh(self, key, ttl, now):
+        self.dbh.cursor().execute('''
+            UPDATE
+                "{table}"
+            SET
+                expires_at = ?,
+                accessed_at = ?
+            WHERE
+                key = ?'''.format(table=self.table), (ResponseCache.expires_at(ttl, now), now, key))
+
+    def touch(self, key, now):
+        self.dbh.cursor().execute('''
+            UPDATE
+                "{table}"
+            SET
+                accessed_at = ?
+            WHERE
+                key = ?'''.format(table=self.table), (now, key))
+
+    def delete(self, key):
+        self.dbh.cursor().execute('''
+            DELETE
+            FROM
+                "{table}"
+            WHERE
+                key = ?'''.format(table=self.table), (key,))
+
+    def total_size(self):
+        return self.dbh.cursor().execute('''
+            SELECT
+                COALESCE(SUM(size), 0)
+            FROM
+                "{table}"'''.format(table=self.table)).fetchone()[0]
+
+    def compact(self, max_size, now):
+        self.dbh.cursor().execute('''
+            DELETE
+            FROM
+                "{table}"
+            WHERE
+                expires_at < ? AND etag IS NULL AND last_modified IS NULL'''.format(table=self.table), (now,))
+
+        excess = self.total_size() - max_size * ResponseCache.COMPACT_RATIO
+
+        if excess <= 0:
+            return 0
+
+        evicted = []
+
+        for key, size in self.dbh.cursor().execute('''
+            SELECT
+                key,
+                size
+            FROM
+                "{table}"
+            ORDER BY
+                accessed_at'''.format(table=self.table)).fetchall():
+            if excess <= 0:
+                break
+
+            evicted.append((key,))
+            excess -= size
+
+        self.dbh.cursor().executemany('''
+            DELETE
+            FROM
+                "{table}"
+            WHERE
+                key = ?'''.format(table=self.table), evicted)
+
+        return len(evicted)
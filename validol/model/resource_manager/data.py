@@ -1,4 +1,4 @@
-from validol.view.utils.utils import showable_df
+from validol.model.utils.utils import showable_df
 
 
 class Data:
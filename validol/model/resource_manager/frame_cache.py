@@ -0,0 +1,70 @@
+import threading
+from collections import OrderedDict
+
+
+class FrameCache:
+    MAX_SIZE = 256 * 1024 * 1024
+
+    def __init__(self, max_size=MAX_SIZE):
+        self.max_size = max_size
+        self.frames = OrderedDict()
+        self.size = 0
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def key(ai):
+        return ai.flavor.name(), ai.platform, ai.active, ai.active_flavor
+
+    def get(self, ai, loader):
+        key = FrameCache.key(ai)
+
+        with self.lock:
+            if key in self.frames:
+                self.frames.move_to_end(key)
+
+                return self.frames[key][0]
+
+        df = loader()
+
+        self.put(key, df, ai.flavor.COMPOSITE)
+
+        return df
+
+    def put(self, key, df, composite):
+        size = int(df.memory_usage(deep=True).sum())
+
+        if size > self.max_size:
+            return
+
+        with self.lock:
+            self.pop(key)
+
+            self.frames[key] = df, size, composite
+            self.size += size
+
+            while self.size > self.max_size:
+                self.pop(next(iter(self.frames)))
+
+    def pop(self, key):
+        with self.lock:
+            item = self.frames.pop(key, None)
+
+            if item is not None:
+                self.size -= item[1]
+
+    def invalidate(self, pred):
+        with self.lock:
+            for key in [key for key, (_, _, composite) in self.frames.items() if pred(key, composite)]:
+                self.pop(key)
+
+    def invalidate_source(self, source):
+        self.invalidate(lambda key, composite: composite or key[0] == source)
+
+    def invalidate_active(self, ai):
+        self.invalidate(lambda key, composite: composite or
+                        key[:3] == (ai.flavor.name(), ai.platform, ai.active))
+
+    def clear(self):
+        with self.lock:
+            self.frames.clear()
+            self.size = 0
@@ -25,7 +25,8 @@ class ResourceManager:
         df = pd.DataFrame()
 
         for letter, ai in zip(alphas, actives_info):
-            active_df = ai.flavor.get_df(ai, self.model_launcher)
+            active_df = self.model_launcher.frame_cache.get(
+                ai, lambda: ai.flavor.get_df(ai, self.model_launcher))
 
             if not pure_actives:
                 active_df = ResourceManager.add_letter(active_df, letter)
@@ -0,0 +1,302 @@
+import datetime as dt
+import gzip
+import hashlib
+import mmap
+import os
+import tempfile
+import time
+
+from validol.model.store.resource import Table
+from validol.model.utils.progress import report
+
+
+class BlobIndex(Table):
+    DATE_FORMAT = '%Y-%m-%d'
+
+    def __init__(self, dbh):
+        Table.__init__(self, dbh, "Blobs", [
+            ("name", "TEXT PRIMARY KEY"),
+            ("digest", "TEXT"),
+            ("compressed", "INTEGER"),
+            ("date", "TEXT"),
+            ("size", "INTEGER"),
+            ("stored_size", "INTEGER"),
+            ("accessed_at", "REAL")])
+
+        for column in ('digest', 'date', 'accessed_at'):
+            self.dbh.cursor().execute('''
+                CREATE INDEX IF NOT EXISTS
+                    "{table}_{column}"
+                ON
+                    "{table}" ({column})'''.format(table=self.table, column=column))
+
+    def lookup(self, name):
+        row = self.dbh.cursor().execute('''
+            SELECT
+                digest,
+                compressed
+            FROM
+                "{table}"
+            WHERE
+                name = ?'''.format(table=self.table), (name,)).fetchone()
+
+        return None if row is None else (row[0], bool(row[1]))
+
+    def store(self, name, digest, compressed, date, size, stored_size, now):
+        self.dbh.cursor().execute('''
+            INSERT OR REPLACE INTO
+                "{table}"
+            VALUES
+                (?, ?, ?, ?, ?, ?, ?)'''.format(table=self.table), (
+            name,
+            digest,
+            int(compressed),
+            None if date is None else date.strftime(BlobIndex.DATE_FORMAT),
+            size,
+            stored_size,
+            now))
+
+    def touch(self, name, now):
+        self.dbh.cursor().execute('''
+            UPDATE
+                "{table}"
+            SET
+                accessed_at = ?
+            WHERE
+                name = ?'''.format(table=self.table), (now, name))
+
+    def delete(self, name):
+        self.dbh.cursor().execute('''
+            DELETE
+            FROM
+                "{table}"
+            WHERE
+                name = ?'''.format(table=self.table), (name,))
+
+    def references(self, digest, compressed):
+        return self.dbh.cursor().execute('''
+            SELECT
+                COUNT(*)
+            FROM
+                "{table}"
+            WHERE
+                digest = ? AND compressed = ?'''.format(table=self.table), (digest, int(compressed))).fetchone()[0]
+
+    def dates(self, prefix):
+        return [(dt.datetime.strptime(date, BlobIndex.DATE_FORMAT).date(), name)
+                for date, name in self.dbh.cursor().execute('''
+                    SELECT
+                        date,
+                        name
+                    FROM
+                        "{table}"
+                    WHERE
+                        date IS NOT NULL AND substr(name, 1, ?) = ?'''.format(table=self.table),
+                    (len(prefix), prefix))]
+
+    def any(self):
+        row = self.dbh.cursor().execute('''
+            SELECT
+                name
+            FROM
+                "{table}"
+            ORDER BY
+                accessed_at DESC
+            LIMIT 1'''.format(table=self.table)).fetchone()
+
+        return None if row is None else row[0]
+
+    def total_size(self):
+        return self.dbh.cursor().execute('''
+            SELECT
+                COALESCE(SUM(stored_size), 0)
+            FROM (
+                SELECT
+                    MAX(stored_size) AS stored_size
+                FROM
+                    "{table}"
+                GROUP BY
+                    digest, compressed)'''.format(table=self.table)).fetchone()[0]
+
+    def least_recent(self):
+        return [(digest, bool(compressed), stored_size) for digest, compressed, stored_size in
+                self.dbh.cursor().execute('''
+                    SELECT
+                        digest,
+                        compressed,
+                        MAX(stored_size)
+                    FROM
+                        "{table}"
+                    GROUP BY
+                        digest, compressed
+                    ORDER BY
+                        MAX(accessed_at)'''.format(table=self.table)).fetchall()]
+
+    def delete_blob(self, digest, compressed):
+        self.dbh.cursor().execute('''
+            DELETE
+            FROM
+                "{table}"
+            WHERE
+                digest = ? AND compressed = ?'''.format(table=self.table), (digest, int(compressed)))
+
+
+class BlobStore:
+    DIRECTORY = 'blobs'
+    EVICT_RATIO = 0.9
+    COMPRESS_LEVEL = 6
+
+    def __init__(self, db, directory=DIRECTORY, compress=False, max_size=None):
+        self.db = db
+        self.directory = directory
+        self.compress = compress
+        self.max_size = max_size
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, digest, compressed):
+        return os.path.join(self.directory, digest[:2], digest + ('.gz' if compressed else ''))
+
+    def write(self, name, fill, date=None):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        sha = hashlib.sha256()
+        size = 0
+
+        try:
+            with open(fd, 'wb') as raw:
+                out = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=BlobStore.COMPRESS_LEVEL) \
+                    if self.compress else raw
+
+                def callback(chunk):
+                    nonlocal size
+
+                    sha.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+
+                fill(callback)
+
+                if self.compress:
+                    out.close()
+
+            stored_size = os.path.getsize(temp_path)
+            digest = sha.hexdigest()
+            path = self.path(digest, self.compress)
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            if os.path.exists(path):
+                os.remove(temp_path)
+            else:
+                os.replace(temp_path, path)
+        except:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self.db.transaction() as dbh:
+            index = BlobIndex(dbh)
+
+            previous = index.lookup(name)
+
+            index.store(name, digest, self.compress, date, size, stored_size, time.time())
+
+            if previous is not None and previous != (digest, self.compress):
+                self.release(index, *previous)
+
+            if self.max_size is not None and index.total_size() > self.max_size:
+                self.evict(index, (digest, self.compress))
+
+        return size
+
+    def put(self, name, content, date=None):
+        return self.write(name, lambda callback: callback(content), date)
+
+    def open(self, name):
+        entry = BlobIndex(self.db.connection).lookup(name)
+
+        if entry is None:
+            return None
+
+        digest, compressed = entry
+        path = self.path(digest, compressed)
+
+        try:
+            if compressed:
+                blob = gzip.open(path, 'rb')
+            else:
+                with open(path, 'rb') as file:
+                    blob = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self.remove(name)
+
+            return None
+
+        with self.db.transaction() as dbh:
+            BlobIndex(dbh).touch(name, time.time())
+
+        return blob
+
+    def read(self, name):
+        blob = self.open(name)
+
+        if blob is None:
+            return None
+
+        try:
+            return blob.read()
+        finally:
+            blob.close()
+
+    def contains(self, name):
+        entry = BlobIndex(self.db.connection).lookup(name)
+
+        return entry is not None and os.path.exists(self.path(*entry))
+
+    def any(self):
+        name = BlobIndex(self.db.connection).any()
+
+        return None if name is None else self.open(name)
+
+    def dates(self, prefix=''):
+        return BlobIndex(self.db.connection).dates(prefix)
+
+    def remove(self, name):
+        with self.db.transaction() as dbh:
+            index = BlobIndex(dbh)
+            entry = index.lookup(name)
+
+            if entry is not None:
+                index.delete(name)
+                self.release(index, *entry)
+
+    def release(self, index, digest, compressed):
+        if not index.references(digest, compressed):
+            self.unlink(digest, compressed)
+
+    def unlink(self, digest, compressed):
+        try:
+            os.remove(self.path(digest, compressed))
+        except FileNotFoundError:
+            pass
+
+    def evict(self, index, keep):
+        excess = index.total_size() - self.max_size * BlobStore.EVICT_RATIO
+        evicted = 0
+        freed = 0
+
+        for digest, compressed, stored_size in index.least_recent():
+            if excess <= 0:
+                break
+
+            if (digest, compressed) == keep:
+                continue
+
+            index.delete_blob(digest, compressed)
+            self.unlink(digest, compressed)
+
+            excess -= stored_size
+            evicted += 1
+            freed += stored_size
+
+        report('evicted', rows=evicted, size=freed)
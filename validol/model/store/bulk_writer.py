@@ -0,0 +1,107 @@
+import sqlite3
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from validol.model.utils.progress import report
+
+
+def df_rows(df):
+    return df.astype(object).where(pd.notnull(df), None).values.tolist()
+
+
+class BulkWriter:
+    MAX_ROWS = 200000
+
+    def __init__(self, db, title='Bulk write', max_rows=MAX_ROWS):
+        self.db = db
+        self.title = title
+        self.max_rows = max_rows
+
+        self.staged = OrderedDict()
+        self.staged_rows = 0
+        self.callbacks = []
+        self.failed = []
+        self.rows = 0
+        self.elapsed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.flush()
+        else:
+            self.staged.clear()
+            self.staged_rows = 0
+            self.callbacks.clear()
+
+        if self.rows:
+            print('{}: {} rows in {:.2f}s ({:.0f} rows/s)'.format(
+                self.title, self.rows, self.elapsed, self.rows_per_second()))
+
+    def stage(self, table, df):
+        if not df.empty:
+            self.staged.setdefault((table, tuple(df.columns)), []).append(df)
+            self.staged_rows += len(df)
+
+            if self.staged_rows >= self.max_rows:
+                self.flush()
+
+    def after(self, callback):
+        self.callbacks.append(callback)
+
+    def flush(self):
+        if not self.staged and not self.callbacks:
+            return
+
+        start = time.perf_counter()
+        rows = 0
+
+        with self.db.transaction() as dbh:
+            for i, ((table, columns), dfs) in enumerate(self.staged.items()):
+                savepoint = 'bulk_writer_{}'.format(i)
+
+                dbh.execute('SAVEPOINT {}'.format(savepoint))
+
+                try:
+                    table_rows = 0
+
+                    for df in dfs:
+                        dbh.executemany('''
+                            INSERT INTO
+                                "{table}" ({columns})
+                            VALUES
+                                ({values_num})'''.format(
+                            table=table,
+                            columns=", ".join('"{}"'.format(column) for column in columns),
+                            values_num=",".join('?' * len(columns))), df_rows(df))
+
+                        table_rows += len(df)
+
+                    rows += table_rows
+                except sqlite3.Error as e:
+                    dbh.execute('ROLLBACK TO {}'.format(savepoint))
+
+                    self.failed.append((table, e))
+                    print('{}: writing to {} failed: {}'.format(self.title, table, e))
+
+                dbh.execute('RELEASE {}'.format(savepoint))
+
+            for callback in self.callbacks:
+                callback(dbh)
+
+        self.staged.clear()
+        self.staged_rows = 0
+        self.callbacks.clear()
+
+        elapsed = time.perf_counter() - start
+
+        self.rows += rows
+        self.elapsed += elapsed
+
+        report('written', rows=rows, elapsed=elapsed)
+
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0
@@ -84,7 +84,10 @@ class MlCurve(ActiveResource):
         df = self.ai.flavor.get_full_df(self.ai, self.model_launcher)
 
         if not df.empty:
-            info = group_by(mapping(df).reset_index(), ['Date', 'CONTRACT'])
+            df = mapping(df).reset_index()
+            df['CONTRACT'] = df.CONTRACT.astype(object)
+
+            info = group_by(df, ['Date', 'CONTRACT'])
 
             result = pd.DataFrame()
 
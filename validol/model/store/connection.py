@@ -0,0 +1,134 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import SingletonThreadPool
+
+
+PRAGMAS = [
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('cache_size', -64 * 1024),
+    ('mmap_size', 256 * 1024 * 1024),
+    ('temp_store', 'MEMORY')
+]
+
+
+class ConnectionManager:
+    TIMEOUT = 30
+    POOL_SIZE = 32
+
+    def __init__(self, database, pragmas=PRAGMAS):
+        self.database = database
+        self.pragmas = pragmas
+
+        self.local = threading.local()
+        self.write_lock = threading.RLock()
+
+        self.connections = {}
+        self.connections_lock = threading.Lock()
+        self.engines = []
+
+    def configure(self, dbh):
+        for pragma, value in self.pragmas:
+            dbh.execute('PRAGMA {}={}'.format(pragma, value))
+
+        return dbh
+
+    def connect(self):
+        dbh = self.configure(sqlite3.connect(self.database,
+                                             timeout=ConnectionManager.TIMEOUT,
+                                             isolation_level='IMMEDIATE',
+                                             check_same_thread=False))
+
+        with self.connections_lock:
+            for thread in [thread for thread in self.connections if not thread.is_alive()]:
+                self.connections.pop(thread).close()
+
+            self.connections[threading.current_thread()] = dbh
+
+        return dbh
+
+    def release(self):
+        dbh = getattr(self.local, 'dbh', None)
+
+        if dbh is not None:
+            with self.connections_lock:
+                self.connections.pop(threading.current_thread(), None)
+
+            dbh.close()
+            self.local.dbh = None
+
+    @property
+    def connection(self):
+        dbh = getattr(self.local, 'dbh', None)
+
+        if dbh is None:
+            dbh = self.local.dbh = self.connect()
+
+        return dbh
+
+    def engine(self):
+        engine = create_engine('sqlite:///{}'.format(self.database),
+                               poolclass=SingletonThreadPool,
+                               pool_size=ConnectionManager.POOL_SIZE,
+                               connect_args={'timeout': ConnectionManager.TIMEOUT,
+                                             'check_same_thread': False})
+
+        event.listen(engine, 'connect', lambda dbh, connection_record: self.configure(dbh))
+
+        self.engines.append(engine)
+
+        return engine
+
+    @contextmanager
+    def transaction(self):
+        with self.write_lock:
+            dbh = self.connection
+
+            if dbh.in_transaction:
+                with self.savepoint(dbh):
+                    yield dbh
+
+                return
+
+            dbh.execute('BEGIN IMMEDIATE')
+
+            try:
+                yield dbh
+            except:
+                dbh.rollback()
+                raise
+            else:
+                dbh.commit()
+
+    @contextmanager
+    def savepoint(self, dbh):
+        self.local.savepoints = getattr(self.local, 'savepoints', 0) + 1
+        savepoint = 'nested_{}'.format(self.local.savepoints)
+
+        dbh.execute('SAVEPOINT {}'.format(savepoint))
+
+        try:
+            yield dbh
+        except:
+            dbh.execute('ROLLBACK TO {}'.format(savepoint))
+            dbh.execute('RELEASE {}'.format(savepoint))
+            raise
+        else:
+            dbh.execute('RELEASE {}'.format(savepoint))
+        finally:
+            self.local.savepoints -= 1
+
+    def close(self):
+        for engine in self.engines:
+            engine.dispose()
+
+        with self.connections_lock:
+            for dbh in self.connections.values():
+                dbh.close()
+
+            self.connections = {}
+
+        self.local = threading.local()
@@ -1,17 +1,29 @@
 import datetime as dt
-from ftplib import FTP
 import os
-from zipfile import ZipFile
-from io import BytesIO
 from functools import lru_cache
 import re
 
-from validol.model.store.resource import Actives, Platforms
+from validol.model.store.resource import Actives, Platforms, Table
 from validol.model.store.view.active_info import ActiveInfo
-from validol.model.store.miners.daily_reports.daily import DailyResource, NetCache
-from validol.model.utils.utils import isfile
+from validol.model.store.miners.daily_reports.daily import DailyResource, NetCache, BatchedUpdate
+from validol.model.utils.fs_cache import FsCache
+from validol.model.mine.ftp_client import ftp_client
 from validol.model.store.structures.ftp_cache import FtpCache
+from validol.model.store.miners.daily_reports.pdf_helpers.cme import CmeParser, CmeBulletin
+from validol.model.utils.parallel import stream, workers_for, portable, release
+from validol.model.store.parsed_cache import ParsedCache, content_digest
+from validol.model.store.page_index import attach_page_index
+from validol.model.utils.progress import report
 from validol.model.store.utils import reduce_ranges
+from validol.model.store.bulk_writer import BulkWriter
+
+
+def parse_bulletin(pdf_helpers, content, date, preliminary=None):
+    with CmeBulletin(content, preliminary) as bulletin:
+        if bulletin.is_preliminary():
+            return date, True, None
+
+        return date, False, [pdf_helper.parse_bulletin(bulletin, date) for pdf_helper in pdf_helpers]
 
 
 class CmeDaily:
@@ -26,14 +38,26 @@ class CmeDaily:
         from validol.model.store.miners.daily_reports.cme_view import CmeView
 
         ranges = []
-        adc = Active.Cache.make_available_dates_cache()
+        adc = Active.Cache.make_available_dates_cache(self.model_launcher)
+
+        try:
+            with BulkWriter(self.model_launcher.main_db, self.flavor['name']) as writer:
+                actives = []
+
+                for index, active in CmeActives(self.model_launcher, self.flavor['name']).read_df().iterrows():
+                    pdf_helper = self.model_launcher.read_pdf_helper(
+                        ActiveInfo(CmeView(self.flavor), active.PlatformCode, active.ActiveName))
 
-        for index, active in CmeActives(self.model_launcher, self.flavor['name']).read_df().iterrows():
-            pdf_helper = self.model_launcher.read_pdf_helper(
-                ActiveInfo(CmeView(self.flavor), active.PlatformCode, active.ActiveName))
+                    actives.append(Active(self.model_launcher, active.PlatformCode, active.ActiveName,
+                                          self.flavor, pdf_helper, adc).with_writer(writer))
 
-            ranges.append(Active(self.model_launcher, active.PlatformCode, active.ActiveName,
-                                 self.flavor, pdf_helper, adc).update())
+                Active.prefetch(self.model_launcher, adc, actives)
+
+                ranges.extend(active.update() for active in actives if not active.from_bulletins())
+                ranges.extend(Active.update_from_bulletins(
+                    [active for active in actives if active.from_bulletins()]))
+        finally:
+            ftp_client(Active.FTP_SERVER).close()
 
         return reduce_ranges(ranges)
 
@@ -58,14 +82,18 @@ class Active(DailyResource):
         @property
         @lru_cache()
         def available_dates_cache(self):
-            return Active.Cache.make_available_dates_cache() if self.adc is None else self.adc
+            return Active.Cache.make_available_dates_cache(self.cme_active.model_launcher) \
+                if self.adc is None else self.adc
 
         @staticmethod
-        def make_available_dates_cache():
+        def make_available_dates_cache(model_launcher):
             files = Active.Cache.get_files()
 
-            return {handle: file for handle, file in
-                    zip(map(Active.Cache.handle_helper, files), files) if handle is not None}
+            adc = FtpCache(model_launcher).dates(Active.FTP_DIR)
+            adc.update({handle: file for handle, file in
+                        zip(map(Active.Cache.handle_helper, files), files) if handle is not None})
+
+            return adc
 
         @staticmethod
         def handle_helper(file):
@@ -84,12 +112,7 @@ class Active(DailyResource):
         @staticmethod
         def get_files():
             try:
-                with FTP(Active.FTP_SERVER) as ftp:
-                    ftp.login()
-                    ftp.cwd(Active.FTP_DIR)
-                    files = [file for file in ftp.nlst() if isfile(ftp, file)]
-
-                return files
+                return list(ftp_client(Active.FTP_SERVER).listing(Active.FTP_DIR))
             except Exception as e:
                 print(e)
 
@@ -97,8 +120,8 @@ class Active(DailyResource):
 
         @staticmethod
         def read_file(model_launcher, filename, with_cache=True):
-            return FtpCache(model_launcher) \
-                .get(Active.FTP_SERVER, os.path.join(Active.FTP_DIR, filename), with_cache)
+            return FtpCache(model_launcher).get(Active.FTP_SERVER, os.path.join(Active.FTP_DIR, filename),
+                                                with_cache, Active.Cache.handle_helper(filename))
 
         def file(self, handle):
             return self.available_dates_cache.get(handle, None)
@@ -121,21 +144,141 @@ class Active(DailyResource):
         def delete(self, date):
             file = self.available_dates_cache.get(date, None)
             if file is not None:
-                FtpCache(self.cme_active.model_launcher).remove_by_name(file)
+                FtpCache(self.cme_active.model_launcher).remove(os.path.join(Active.FTP_DIR, file))
+
+    def from_bulletins(self):
+        return self.pdf_helper is not None and not FsCache(self.pdf_helper.active_folder).available()
+
+    @staticmethod
+    def update_from_bulletins(actives):
+        plans = [active.pending() for active in actives]
+        batches = [None if initial is None else BatchedUpdate(active)
+                   for active, (initial, _) in zip(actives, plans)]
+
+        for batch, (initial, _) in zip(batches, plans):
+            if batch is not None:
+                batch.add(initial)
+
+        targets = {}
+        for i, (_, dates) in enumerate(plans):
+            for date in dates:
+                targets.setdefault(date, []).append(i)
+
+        cache_db = actives[0].model_launcher.cache_db if actives else None
+        misses = {}
+        digests = {}
+
+        for date in sorted(targets):
+            filename, content = actives[targets[date][0]].active_cache.get(date, True)
+
+            if content is None:
+                continue
+
+            digest = digests[date] = content_digest(content)
+            release(content)
+
+            for i in targets[date]:
+                key = ParsedCache.key(actives[i].pdf_helper, digest)
+                df = ParsedCache(cache_db.connection).lookup(key, date)
+
+                if df is None:
+                    misses.setdefault(date, []).append((i, key))
+                else:
+                    batches[i].add(df)
+
+                    report('parsed', rows=len(df))
+
+        workers = workers_for(len(misses))
+
+        def contents():
+            for date in sorted(misses):
+                filename, content = actives[targets[date][0]].active_cache.get(date, True)
+
+                if content is None:
+                    continue
+
+                try:
+                    yield [actives[i].pdf_helper for i, _ in misses[date]], \
+                        content if workers < 2 else portable(content), date, \
+                        BulletinVerdicts(cache_db.connection).lookup(digests[date])
+                finally:
+                    release(content)
+
+        for (date, preliminary, dfs), elapsed in stream(parse_bulletin, contents(), workers,
+                                                        initializer=attach_page_index,
+                                                        initargs=(cache_db.database,)):
+            with cache_db.transaction() as dbh:
+                BulletinVerdicts(dbh).store(digests[date], preliminary)
+
+            if preliminary:
+                actives[targets[date][0]].active_cache.delete(date)
+                continue
+
+            with cache_db.transaction() as dbh:
+                for (i, key), df in zip(misses[date], dfs):
+                    if df is None:
+                        print('{}: parsing {} failed, will retry on the next update'.format(
+                            actives[i].table, date))
+                        continue
+
+                    ParsedCache(dbh).store(key, actives[i].pdf_helper, df)
+                    batches[i].add(df)
+
+            report('parsed', rows=sum(len(df) for df in dfs if df is not None), elapsed=elapsed)
+
+        return [[None, None] if batch is None else batch.flush() for batch in batches]
+
+    @staticmethod
+    def prefetch(model_launcher, adc, actives):
+        lasts = [active.range()[1] for active in actives if active.from_bulletins()]
+
+        if not lasts:
+            return
+
+        since = min(last or dt.date.min for last in lasts)
+
+        try:
+            FtpCache(model_launcher).prefetch(Active.FTP_SERVER, [
+                (os.path.join(Active.FTP_DIR, file), date) for date, file in adc.items() if date > since])
+        except Exception as e:
+            print(e)
 
     @staticmethod
     def get_archive_files(model_launcher):
-        item = FtpCache(model_launcher).one_or_none()
+        item = FtpCache(model_launcher).one()
         if item is None:
             file = Active.Cache.get_files()[0]
             item = Active.Cache.read_file(model_launcher, file)
-        else:
-            item = item.value
 
-        with ZipFile(BytesIO(item), 'r') as zip_file:
+        with CmeParser.zip_file(item) as zip_file:
             return zip_file.namelist()
 
 
+class BulletinVerdicts(Table):
+    def __init__(self, dbh):
+        Table.__init__(self, dbh, "BulletinVerdicts", [
+            ("digest", "TEXT PRIMARY KEY"),
+            ("preliminary", "INTEGER")])
+
+    def lookup(self, digest):
+        row = self.dbh.cursor().execute('''
+            SELECT
+                preliminary
+            FROM
+                "{table}"
+            WHERE
+                digest = ?'''.format(table=self.table), (digest,)).fetchone()
+
+        return None if row is None else bool(row[0])
+
+    def store(self, digest, preliminary):
+        self.dbh.cursor().execute('''
+            INSERT OR REPLACE INTO
+                "{table}"
+            VALUES
+                (?, ?)'''.format(table=self.table), (digest, int(preliminary)))
+
+
 class CmeActives(Actives):
     def __init__(self, model_launcher, flavor):
         Actives.__init__(self, model_launcher.user_dbh, flavor)
\ No newline at end of file
@@ -1,4 +1,3 @@
-from PyQt5.QtWidgets import QLineEdit
 import pandas as pd
 
 from validol.model.store.miners.daily_reports.cme import CmeActives, Active
@@ -12,6 +11,8 @@ class CmeView(DailyView):
         DailyView.__init__(self, Active, CmeActives, flavor)
 
     def new_active(self, platform, model_launcher):
+        from PyQt5.QtWidgets import QLineEdit
+
         active_name = QLineEdit()
         active_name.setPlaceholderText("Active Name")
 
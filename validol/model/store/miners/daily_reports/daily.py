@@ -1,10 +1,26 @@
+import datetime as dt
 import pandas as pd
+from functools import partial
 
 from validol.model.utils.utils import concat
-from validol.model.store.resource import ActiveResource
+from validol.model.store.resource import ActiveResource, Resource, ResourceDates
 from validol.model.utils.fs_cache import FsCache
-from validol.model.utils.utils import date_from_timestamp
 from validol.model.store.miners.daily_reports.expirations import Expirations
+from validol.model.utils.parallel import stream, workers_for, portable, release
+from validol.model.store.utils import reduce_ranges
+from validol.model.store.parsed_cache import ParsedCache, content_digest
+from validol.model.store.page_index import attach_page_index
+from validol.model.utils.progress import report
+
+
+BATCH_ROWS = 50000
+
+
+def parse_date(pdf_helper, content, date, digest=None):
+    try:
+        return date, pdf_helper.parse_content(content, date, digest), False
+    except ValueError:
+        return date, None, True
 
 
 class NetCache:
@@ -87,6 +103,39 @@ class Cache:
         return set(self.fs_handle_map.keys()) | set(self.net_cache.available_handles())
 
 
+class BatchedUpdate:
+    def __init__(self, resource, rows=BATCH_ROWS):
+        self.resource = resource
+        self.rows = rows
+        self.frames = []
+        self.staged = 0
+        self.range = [None, None]
+
+    def add(self, df):
+        if df is None or df.empty:
+            return
+
+        self.frames.append(df)
+        self.staged += len(df)
+
+        if self.staged >= self.rows:
+            self.write()
+
+    def write(self):
+        if self.frames:
+            info = concat(self.frames)
+            self.frames = []
+            self.staged = 0
+
+            self.resource.write_update(info)
+            self.range = reduce_ranges([self.range, self.resource.get_range(info)])
+
+    def flush(self):
+        self.write()
+
+        return self.range
+
+
 class DailyResource(ActiveResource):
     def __init__(self, model_launcher, platform_code, active_name, actives_cls, flavor,
                  pdf_helper, active_cache):
@@ -102,6 +151,34 @@ class DailyResource(ActiveResource):
         self.model_launcher = model_launcher
         self.pdf_helper = pdf_helper
         self.active_cache = active_cache
+        self.dates_index = ResourceDates(model_launcher.main_dbh, create=False)
+
+    def refresh_dates(self, dates=None, dbh=None):
+        if dates is None or not self.dates_index.indexed(self.table, dbh):
+            self.dates_index.rebuild(self.table, self.catalog_source(), dbh)
+        else:
+            self.dates_index.add(self.table, dates, dbh)
+
+    def index_dates(self, dates, dbh=None):
+        self.refresh_dates(None if self.write_failed() else dates, dbh)
+
+    def register_write(self, df):
+        super().register_write(df)
+
+        if not df.empty:
+            self.after_write(partial(self.index_dates, Resource.with_timestamps(df).Date.unique().tolist()))
+
+    def stored_dates(self):
+        if not self.dates_index.indexed(self.table) and self.row_count():
+            self.refresh_dates()
+            self.dbh.commit()
+
+        return [dt.date.fromtimestamp(ts) for ts in self.dates_index.dates(self.table)]
+
+    def drop(self):
+        super().drop()
+
+        self.dates_index.remove(self.table)
 
     def get_flavors(self):
         df = self.read_df('SELECT DISTINCT CONTRACT AS active_flavor FROM "{table}"', index_on=False)
@@ -116,34 +193,104 @@ class DailyResource(ActiveResource):
         return self.read_df('SELECT * FROM "{table}" WHERE CONTRACT = ?', params=(contract,))
 
     def download_dates(self, dates):
-        return concat([self.download_date(date) for date in dates])
+        return concat(list(self.parse_dates(sorted(dates))))
+
+    def contents(self, misses, workers):
+        for date in sorted(misses):
+            content = self.cache.get(date)
+
+            if content is None:
+                continue
+
+            try:
+                yield self.pdf_helper, content if workers < 2 else portable(content), date, misses[date]
+            finally:
+                release(content)
+
+    def parse_dates(self, dates):
+        cache_db = self.model_launcher.cache_db
+        misses = {}
+        keys = {}
+
+        for date in dates:
+            content = self.cache.get(date)
+
+            if content is not None:
+                digest = content_digest(content)
+                release(content)
+
+                key = ParsedCache.key(self.pdf_helper, digest)
+                df = ParsedCache(cache_db.connection).lookup(key, date)
+
+                if df is None:
+                    misses[date] = digest
+                    keys[date] = key
+                else:
+                    report('parsed', rows=len(df))
+
+                    yield df
+
+        workers = workers_for(len(keys))
+
+        for (date, df, broken), elapsed in stream(parse_date, self.contents(misses, workers), workers,
+                                          initializer=attach_page_index, initargs=(cache_db.database,)):
+            if broken:
+                self.cache.delete(date)
+            elif df is None:
+                print('{}: parsing {} failed, will retry on the next update'.format(self.table, date))
+            else:
+                with cache_db.transaction() as dbh:
+                    ParsedCache(dbh).store(keys[date], self.pdf_helper, df)
+
+            if df is None:
+                df = pd.DataFrame()
+
+            report('parsed', rows=len(df), elapsed=elapsed)
+
+            yield df
+
+    def update(self):
+        initial, dates = self.pending()
+
+        if initial is None:
+            return [None, None]
+
+        batches = BatchedUpdate(self)
+        batches.add(initial)
+
+        for df in self.parse_dates(sorted(dates)):
+            batches.add(df)
+
+        return batches.flush()
 
     def initial_fill(self):
         df = self.pdf_helper.initial(self.model_launcher)
 
-        if not df.empty:
-            net_df = self.download_dates(set(self.available_dates()) - set(df.Date))
-        else:
-            net_df = self.download_dates(self.available_dates())
-
-        return df.append(net_df)
+        return df.append(self.download_dates(self.missing_dates(df.Date if not df.empty else [])))
 
     def fill(self, first, last):
-        return self.download_dates(set(self.available_dates()) - set(date_from_timestamp(self.read_df()).index))
+        return self.download_dates(self.missing_dates(self.present_dates()))
+
+    def present_dates(self):
+        return self.stored_dates()
+
+    def missing_dates(self, present):
+        return set(self.available_dates()) - set(present)
+
+    def pending(self):
+        first, last = self.range()
+
+        if first is None:
+            initial = self.pdf_helper.initial(self.model_launcher)
+
+            return initial, self.missing_dates(initial.Date if not initial.empty else [])
+        elif last != dt.date.today():
+            return pd.DataFrame(), self.missing_dates(self.present_dates())
+        else:
+            return None, set()
 
     def available_dates(self):
         fs_cache = FsCache(self.pdf_helper.active_folder)
         self.cache = Cache(self.active_cache, fs_cache)
 
         return self.cache.available_handles()
-
-    def download_date(self, date):
-        content = self.cache.get(date)
-
-        if content is not None:
-            try:
-                return self.pdf_helper.parse_content(content, date)
-            except ValueError:
-                self.cache.delete(date)
-
-        return pd.DataFrame()
\ No newline at end of file
@@ -1,12 +1,10 @@
 from itertools import groupby
 from operator import itemgetter
-from PyPDF2 import PdfFileReader
 import pandas as pd
 
 from validol.model.store.view.view_flavor import ViewFlavor
 from validol.model.store.miners.weekly_reports.flavor import Platforms
-from validol.view.utils.searchable_combo import SearchableComboBox
-from validol.view.utils.utils import mark
+from validol.model.store.structures.pdf_helper import PdfDocument
 
 
 class DailyView(ViewFlavor):
@@ -48,6 +46,7 @@ class DailyView(ViewFlavor):
     def remove_active_data(self, active_info, model_launcher):
         self.active_cls(model_launcher, active_info.platform, active_info.active,
                         self.flavor).drop()
+        model_launcher.invalidate_active(active_info)
         model_launcher.remove_expirations(active_info)
         model_launcher.remove_ml(active_info)
 
@@ -68,8 +67,8 @@ def active_df_tolist(df):
 
 
 def get_pages(fname, phrase):
-    pfr = PdfFileReader(fname)
-    return [page + 1 for page in range(pfr.getNumPages()) if phrase in pfr.getPage(page).extractText()]
+    with open(fname, 'rb') as file, PdfDocument(file.read()) as document:
+        return document.pages(phrase)
 
 
 def first_run(items):
@@ -78,6 +77,9 @@ def first_run(items):
 
 
 def searchable_with_mark(text, content):
+    from validol.view.utils.searchable_combo import SearchableComboBox
+    from validol.view.utils.utils import mark
+
     scb = SearchableComboBox()
     scb.setItems(content)
 
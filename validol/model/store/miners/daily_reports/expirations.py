@@ -1,16 +1,16 @@
 import datetime as dt
 import locale
 
-from requests_cache import enabled
 import pandas as pd
 import re
 from io import StringIO
-import requests
 from dateutil.relativedelta import relativedelta
 
 from validol.model.store.resource import ResourceUpdater
 from validol.model.utils.utils import concat, date_from_timestamp, to_timestamp, merge_dfs
 from validol.model.utils.utils import setlocale
+from validol.model.mine.http_client import client
+from validol.model.mine.response_cache import DAY
 
 
 class Expirations(ResourceUpdater):
@@ -54,7 +54,7 @@ class Expirations(ResourceUpdater):
         return df.set_index('Date').sort_index().Contract
 
     def current(self, ai, delta, df):
-        df['CONTRACT'] = df['CONTRACT'].apply(Expirations.from_contract)
+        df['CONTRACT'] = df['CONTRACT'].astype(object).apply(Expirations.from_contract)
 
         exp_info = date_from_timestamp(self.exp_info(ai)).apply(Expirations.from_contract)
 
@@ -110,9 +110,10 @@ class Expirations(ResourceUpdater):
 
         dfs = []
 
-        with enabled(), setlocale(locale.LC_TIME, 'C'):
+        with setlocale(locale.LC_TIME, 'C'):
             while first <= last:
-                response = requests.get(
+                response = client.get(
+                    ttl=DAY,
                     url='https://www.theice.com/marketdata/ExpiryCalendar.shtml',
                     params={
                         'excel': '',
@@ -137,9 +138,6 @@ class Expirations(ResourceUpdater):
                             "FSD"
                         ),
                         'dateFrom': first.strftime('%d-%b-%Y')
-                    },
-                    headers={
-                        'User-Agent': 'Mozilla/5.0',
                     }
                 )
 
@@ -160,6 +158,7 @@ class Expirations(ResourceUpdater):
             WHERE
                 Source = ?'''.format(table=self.table), (ai.active_only(),))
 
+        self.refresh_catalog()
         self.dbh.commit()
 
     def get_expirations(self):
@@ -1,7 +1,6 @@
 import datetime as dt
 from bs4 import BeautifulSoup
-from requests_cache import CachedSession
-from requests import Request
+import requests
 import pandas as pd
 import re
 from functools import lru_cache
@@ -10,13 +9,17 @@ import os
 from validol.model.store.resource import Actives, Platforms
 from validol.model.store.view.active_info import ActiveInfo
 from validol.model.store.miners.daily_reports.daily import DailyResource, NetCache
-from validol.model.utils.utils import get_filename, dummy_ctx_mgr
+from validol.model.utils.utils import get_filename
 from validol.model.store.utils import reduce_ranges
-from validol.model.mine.utils import remove_from_cache
+from validol.model.store.bulk_writer import BulkWriter
+from validol.model.mine.http_client import client
+from validol.model.mine.response_cache import FOREVER
 
 
 class IceDaily:
     RECAPTCHA = True
+    REPORT_URL = 'https://www.theice.com/marketdata/reports/datawarehouse/ConsolidatedEndOfDayReportPDF.shtml'
+    IGNORED_PARAMETERS = ('smpbss',)
 
     def __init__(self, model_launcher, flavor):
         self.model_launcher = model_launcher
@@ -30,23 +33,21 @@ class IceDaily:
     @property
     @lru_cache()
     def session_obj(self):
-        session = CachedSession(allowable_methods=('GET', 'POST'),
-                                ignored_parameters=['smpbss'])
+        session = client.mount(requests.Session())
 
         if not IceDaily.RECAPTCHA:
-            with session.cache_disabled():
-                response = session.get(
-                    url='https://www.theice.com/marketdata/reports/datawarehouse/ConsolidatedEndOfDayReportPDF.shtml',
-                    headers={
-                        'User-Agent': 'Mozilla/5.0',
-                        'X-Requested-With': 'XMLHttpRequest'
-                    },
-                    params={
-                        'selectionForm': '',
-                        'exchangeCode': 'IFEU',
-                        'optionRequest': self.flavor['optionRequest']
-                    }
-                )
+            response = client.get(
+                session=session,
+                url=IceDaily.REPORT_URL,
+                headers={
+                    'X-Requested-With': 'XMLHttpRequest'
+                },
+                params={
+                    'selectionForm': '',
+                    'exchangeCode': 'IFEU',
+                    'optionRequest': self.flavor['optionRequest']
+                }
+            )
 
             bs = BeautifulSoup(response.text)
 
@@ -68,12 +69,13 @@ class IceDaily:
 
         ranges = []
 
-        for index, active in IceActives(self.model_launcher, self.flavor['name']).read_df().iterrows():
-            pdf_helper = self.model_launcher.read_pdf_helper(
-                ActiveInfo(IceView(self.flavor), active.PlatformCode, active.ActiveName))
+        with BulkWriter(self.model_launcher.main_db, self.flavor['name']) as writer:
+            for index, active in IceActives(self.model_launcher, self.flavor['name']).read_df().iterrows():
+                pdf_helper = self.model_launcher.read_pdf_helper(
+                    ActiveInfo(IceView(self.flavor), active.PlatformCode, active.ActiveName))
 
-            ranges.append(Active(self.model_launcher, active.PlatformCode, active.ActiveName,
-                                 self.flavor, self, pdf_helper).update())
+                ranges.append(Active(self.model_launcher, active.PlatformCode, active.ActiveName,
+                                     self.flavor, self, pdf_helper).with_writer(writer).update())
 
         return reduce_ranges(ranges)
 
@@ -95,31 +97,25 @@ class Active(DailyResource):
         def __init__(self, ice_active):
             self.ice_active = ice_active
 
-        def make_request(self, date):
-            request = Request(
-                method='POST',
-                url='https://www.theice.com/marketdata/reports/datawarehouse/ConsolidatedEndOfDayReportPDF.shtml',
-                params={
-                    'generateReport': '',
-                    'exchangeCode': self.ice_active.platform_code,
-                    'exchangeCodeAndContract': self.ice_active.web_active_code,
-                    'optionRequest': self.ice_active.flavor['optionRequest'],
-                    'selectedDate': date.strftime("%m/%d/%Y"),
-                    'submit': 'Download',
-                    'smpbss': self.ice_active.updater.session.cookies['smpbss']
-                }
-            )
-
-            request = self.ice_active.updater.session.prepare_request(request)
-
-            return request
+        def params(self, date):
+            return {
+                'generateReport': '',
+                'exchangeCode': self.ice_active.platform_code,
+                'exchangeCodeAndContract': self.ice_active.web_active_code,
+                'optionRequest': self.ice_active.flavor['optionRequest'],
+                'selectedDate': date.strftime("%m/%d/%Y"),
+                'submit': 'Download',
+                'smpbss': self.ice_active.updater.session.cookies['smpbss']
+            }
 
         def get(self, date, with_cache=True):
             if not IceDaily.RECAPTCHA:
-                request = self.make_request(date)
-
-                with dummy_ctx_mgr() if with_cache else self.ice_active.updater.session.cache_disabled():
-                    response = self.ice_active.updater.session.send(request)
+                response = client.post(
+                    session=self.ice_active.updater.session,
+                    url=IceDaily.REPORT_URL,
+                    params=self.params(date),
+                    ttl=FOREVER if with_cache else None,
+                    ignored=IceDaily.IGNORED_PARAMETERS)
 
                 if response.content[1:4] != b'PDF':
                     self.delete(date)
@@ -131,7 +127,8 @@ class Active(DailyResource):
                 return None, None
 
         def delete(self, date):
-            remove_from_cache(self.ice_active.updater.session, self.make_request(date))
+            client.forget('POST', IceDaily.REPORT_URL, self.params(date),
+                          ignored=IceDaily.IGNORED_PARAMETERS)
 
         def file(self, date):
             return '{}_{}.pdf'.format(self.ice_active.active_code, date.strftime('%Y_%m_%d'))
@@ -146,21 +143,20 @@ class Active(DailyResource):
 
         def available_handles(self):
             if not IceDaily.RECAPTCHA:
-                with self.ice_active.updater.session.cache_disabled():
-                    response = self.ice_active.updater.session.post(
-                        url='https://www.theice.com/marketdata/reports/datawarehouse/ConsolidatedEndOfDayReportPDF.shtml',
-                        headers={
-                            'User-Agent': 'Mozilla/5.0',
-                            'X-Requested-With': 'XMLHttpRequest'
-                        },
-                        params={
-                            'selectionForm': '',
-                            'exchangeCode': self.ice_active.platform_code,
-                            'optionRequest': self.ice_active.flavor['optionRequest'],
-                            'exchangeCodeAndContract': self.ice_active.web_active_code,
-                            'smpbss': self.ice_active.updater.session.cookies['smpbss'],
-                        }
-                    )
+                response = client.post(
+                    session=self.ice_active.updater.session,
+                    url=IceDaily.REPORT_URL,
+                    headers={
+                        'X-Requested-With': 'XMLHttpRequest'
+                    },
+                    params={
+                        'selectionForm': '',
+                        'exchangeCode': self.ice_active.platform_code,
+                        'optionRequest': self.ice_active.flavor['optionRequest'],
+                        'exchangeCodeAndContract': self.ice_active.web_active_code,
+                        'smpbss': self.ice_active.updater.session.cookies['smpbss'],
+                    }
+                )
 
                 bs = BeautifulSoup(response.text)
 
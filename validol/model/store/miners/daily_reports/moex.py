@@ -1,39 +1,31 @@
 import datetime as dt
 import pandas as pd
-from requests import Request
 from io import StringIO
-from requests_cache import CachedSession
 
-from validol.model.store.resource import Updatable, Platforms
+from validol.model.store.resource import Updatable, Platforms, ResourceCatalog
 from validol.model.utils.utils import concat
-from validol.model.store.miners.weekly_reports.utils import active_iterator
-from validol.model.store.utils import reduce_ranges
-from validol.model.mine.utils import remove_from_cache
 from validol.model.store.miners.weekly_reports.active import WeeklyActives, Active
+from validol.model.store.bulk_writer import BulkWriter
+from validol.model.mine.http_client import client
+from validol.model.mine.response_cache import FOREVER
 
 
 class MoexUpdatable(Updatable):
     def __init__(self, model_launcher, flavor):
         self.model_launcher = model_launcher
-        self.session = CachedSession()
 
     def download_date(self, date):
-        request = Request(
-            method='GET',
-            url='https://www.moex.com/ru/derivatives/open-positions-csv.aspx',
-            params={
-                'd': dt.datetime(date.year, date.month, date.day).strftime("%Y%m%d")
-            },
-            headers={'User-Agent': 'Mozilla/5.0'}
-        )
-
-        request = self.session.prepare_request(request)
-        response = self.session.send(request)
+        url = 'https://www.moex.com/ru/derivatives/open-positions-csv.aspx'
+        params = {
+            'd': dt.datetime(date.year, date.month, date.day).strftime("%Y%m%d")
+        }
+
+        response = client.get(url, params=params, ttl=FOREVER)
 
         df = pd.read_csv(StringIO(response.text), parse_dates=['moment'])
 
         if df.empty:
-            remove_from_cache(self.session, request)
+            client.forget('GET', url, params)
 
             return pd.DataFrame()
 
@@ -62,8 +54,7 @@ class MoexUpdatable(Updatable):
         return concat([self.download_date(date) for date in pd.date_range(first, last)])
 
     def range(self):
-        return reduce_ranges([active.range() for active in
-                              active_iterator(MOEX, self.model_launcher)])
+        return ResourceCatalog(self.model_launcher.main_dbh).flavor_range(MOEX['name'])
 
     def write_update(self, data):
         if not data.empty:
@@ -78,9 +69,10 @@ class MoexUpdatable(Updatable):
                                                  for active in groups.groups.keys()],
                                                 columns=("PlatformCode", "ActiveName")))
 
-            for group, content in groups:
-                Active(self.model_launcher, MOEX, MOEX['platform_code'],
-                       group, content.drop('name', axis=1)).update()
+            with BulkWriter(self.model_launcher.main_db, MOEX['name']) as writer:
+                for group, content in groups:
+                    Active(self.model_launcher, MOEX, MOEX['platform_code'],
+                           group, content.drop('name', axis=1)).with_writer(writer).update()
 
 
 MOEX = {
@@ -4,67 +4,149 @@ import numpy as np
 import pandas as pd
 from itertools import repeat
 import re
-import random
 import PyPDF2 as ppdf
+from PyPDF2.pdf import ContentStream
 
 from validol.model.store.miners.daily_reports.pdf_helpers.utils import filter_rows, DailyPdfParser, is_contract
-from validol.model.utils.utils import get_pages_run
+from validol.model.store.structures.pdf_helper import PdfDocument
+
+
+class CmeBulletin:
+    def __init__(self, content, preliminary=None):
+        self.zip_file = CmeParser.zip_file(content)
+        self.sections = {}
+        self.preliminary = preliminary
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def is_preliminary(self):
+        if self.preliminary is None:
+            self.preliminary = CmeParser.if_preliminary_zip(self.zip_file)
+
+        return self.preliminary
+
+    def section(self, archive_file):
+        if archive_file not in self.sections:
+            self.sections[archive_file] = PdfDocument(self.zip_file.read(archive_file))
+
+        return self.sections[archive_file]
+
+    def close(self):
+        for document in self.sections.values():
+            document.close()
+
+        self.zip_file.close()
 
 
 class CmeParser(DailyPdfParser):
+    PRELIMINARY_MARK = 'PRELIMINARY'
+    PRELIMINARY_PAGES = (0, 1, -1)
+    HEADER_SHARE = 0.15
+    HEADER_EDGE = 800
+
     @staticmethod
     def split_info(df):
         return df.iloc[0, :], df.iloc[1:, :].reset_index(drop=True)
 
+    @staticmethod
+    def header_text(page):
+        contents = page.getContents()
+
+        if contents is None:
+            return ''
+
+        bottom, top = float(page.mediaBox.getLowerLeft_y()), float(page.mediaBox.getUpperRight_y())
+        edge = min(CmeParser.HEADER_EDGE, top - (top - bottom) * CmeParser.HEADER_SHARE)
+
+        ctm, stack = (1, 0), []
+        line = leading = 0
+        texts = []
+
+        for operands, operator in ContentStream(contents, page.pdf).operations:
+            if operator == b'q':
+                stack.append(ctm)
+            elif operator == b'Q':
+                ctm = stack.pop() if stack else (1, 0)
+            elif operator == b'cm':
+                ctm = ctm[0] * float(operands[3]), ctm[0] * float(operands[5]) + ctm[1]
+            elif operator == b'BT':
+                line = 0
+            elif operator == b'Tm':
+                line = float(operands[5])
+            elif operator in (b'Td', b'TD'):
+                line += float(operands[1])
+            elif operator == b'TL':
+                leading = float(operands[0])
+            elif operator == b'T*':
+                line -= leading
+
+            if operator in (b"'", b'"'):
+                line -= leading
+
+            if operator in (b'Tj', b'TJ', b"'", b'"') and ctm[0] * line + ctm[1] >= edge:
+                strings = operands[0] if operator == b'TJ' else [operands[-1]]
+
+                texts.extend(string if isinstance(string, str) else string.decode('latin-1')
+                             for string in strings if isinstance(string, (str, bytes)))
+
+        return ''.join(texts)
+
     @staticmethod
     def if_preliminary_pdf(content):
         pdf = ppdf.PdfFileReader(content)
 
-        num_pages = pdf.getNumPages()
-
-        for i in range(15):
-            page_num = random.randint(0, num_pages - 1)
-
-            page = pdf.getPage(page_num)
-            page.cropBox.lowerLeft = (page.cropBox.lowerLeft[0], 800)
-            page.cropBox.lowerRight = (page.cropBox.lowerRight[0], 800)
+        info = pdf.getDocumentInfo() or {}
+        if any(CmeParser.PRELIMINARY_MARK in str(info[key]).upper() for key in info):
+            return True
 
-            writer = ppdf.PdfFileWriter()
-            writer.addPage(page)
-            file = BytesIO()
-            writer.write(file)
+        num_pages = pdf.getNumPages()
 
-            reader = ppdf.PdfFileReader(file)
+        if num_pages == 0:
+            return False
 
-            if 'PRELIMINARY' in reader.getPage(0).extractText():
+        for page_num in sorted({page % num_pages for page in CmeParser.PRELIMINARY_PAGES}):
+            if re.search(r'\b{}\b'.format(CmeParser.PRELIMINARY_MARK),
+                         CmeParser.header_text(pdf.getPage(page_num)).upper()):
                 return True
 
         return False
 
     @staticmethod
-    def if_preliminary_zip(zip_file):
-        main_file = zip_file.namelist()[0]
-
+    def main_file(zip_file):
         for regex in ['^DailyBulletin_\d+\.pdf$', '^Section63.*?\.pdf$']:
             files = [filename for filename in zip_file.namelist() if re.match(regex, filename)]
 
             if files:
-                main_file = files[0]
-                break
+                return files[0]
 
-        return CmeParser.if_preliminary_pdf(BytesIO(zip_file.read(main_file)))
+        return zip_file.namelist()[0]
+
+    @staticmethod
+    def if_preliminary_zip(zip_file):
+        return CmeParser.if_preliminary_pdf(BytesIO(zip_file.read(CmeParser.main_file(zip_file))))
+
+    @staticmethod
+    def zip_file(content):
+        return ZipFile(BytesIO(content) if isinstance(content, bytes) else content, 'r')
 
     def map_content(self, content):
-        with ZipFile(BytesIO(content), 'r') as zip_file:
+        with CmeParser.zip_file(content) as zip_file:
             if CmeParser.if_preliminary_zip(zip_file):
                 raise ValueError
 
             return zip_file.read(self.pdf_helper.other_info['archive_file'])
 
-    def config(self, content):
+    def map_bulletin(self, bulletin):
+        return bulletin.section(self.pdf_helper.other_info['archive_file'])
+
+    def config(self, document):
         return [
             {
-                'pages': list(zip(get_pages_run(BytesIO(content), self.pdf_helper.name.active),
+                'pages': list(zip(document.pages_run(self.pdf_helper.name.active),
                                   repeat(self.parser_config['page_area']))),
                 'processors': [
                     {
@@ -2,13 +2,13 @@ from io import StringIO
 
 import pandas as pd
 import numpy as np
-import requests
 
 from functools import partial
 
 from validol.model.store.resource import ResourceUpdater
 from validol.model.utils.utils import parse_isoformat_date
 from validol.model.store.resource import CompositeUpdater
+from validol.model.mine.http_client import client
 
 
 class MonetaryType(ResourceUpdater):
@@ -23,16 +23,10 @@ class MonetaryType(ResourceUpdater):
                                  self._config['schema'])
 
     def initial_fill(self):
-        session = requests.Session()
-
-        response = session.get(
+        response = client.get(
             url='https://fred.stlouisfed.org/graph/fredgraph.csv',
             params={
                 'id': self._config['id'],
-            },
-            headers={
-                'Host': "fred.stlouisfed.org",
-                'User-Agent': 'Mozilla/5.0'
             }
         )
 
@@ -4,6 +4,7 @@ import re
 import pandas as pd
 import requests
 from validol.model.mine.downloader import read_url_text
+from validol.model.mine.http_client import client
 from validol.model.store.resource import Resource
 from validol.model.store.structures.structure import NamedStructure, Base, with_session
 from sqlalchemy import Column, String
@@ -84,9 +85,7 @@ class InvestingPrice(Resource):
         start_date = first.strftime("%d/%m/%Y")
         end_date = last.strftime("%d/%m/%Y")
 
-        session = requests.Session()
-
-        response = session.post(
+        response = client.post(
             url='https://ru.investing.com/instruments/HistoricalDataAjax',
             data={
                 'action': 'historical_data',
@@ -96,8 +95,7 @@ class InvestingPrice(Resource):
                 'interval_sec': 'Daily'
             },
             headers={
-                'X-Requested-With': 'XMLHttpRequest',
-                'User-Agent': 'Mozilla/5.0'
+                'X-Requested-With': 'XMLHttpRequest'
             }
         )
 
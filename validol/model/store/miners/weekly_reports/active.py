@@ -16,7 +16,8 @@ class Active(ActiveResource):
                                 platform_code,
                                 active_name,
                                 flavor["name"],
-                                actives_cls=WeeklyActives)
+                                actives_cls=WeeklyActives,
+                                columnar=flavor.get("columnar", False))
 
         self.update_info = pd.DataFrame() if update_info is None else update_info
 
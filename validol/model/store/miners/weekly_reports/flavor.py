@@ -1,84 +1,239 @@
 import datetime as dt
-from io import StringIO
+import json
+import time
+import numpy as np
 import pandas as pd
 
-from validol.model.store.resource import Platforms, FlavorUpdater
-from validol.model.utils.utils import group_by
+from validol.model.store.resource import Table, Platforms, FlavorUpdater, ResourceCatalog, FlavorStorage
+from validol.model.mine.downloader import download_all
+from validol.model.utils.utils import group_by, concat, to_timestamp
 from validol.model.store.miners.weekly_reports.active import WeeklyActives, Active
-from validol.model.store.miners.weekly_reports.utils import active_iterator
 from validol.model.store.utils import reduce_ranges
+from validol.model.store.bulk_writer import BulkWriter
+from validol.model.utils.progress import report
 
 
 class Flavor(FlavorUpdater):
+    CHUNK_SIZE = 50000
+
     @staticmethod
     def get_active_platform_name(market_and_exchange_names):
         return [name.strip() for name in market_and_exchange_names.rsplit("-", 1)]
 
-    def flavor_latest_year(self, flavor):
-        curr_year = dt.date.today().year
-        fly = -1
+    def flavor_latest_date(self, flavor):
+        return ResourceCatalog(self.model_launcher.main_dbh).flavor_range(flavor["name"])[1]
 
-        for active in active_iterator(flavor, self.model_launcher):
-            last_date = active.range()[1]
+    def if_initial(self, flavor):
+        return Platforms(self.model_launcher, flavor['name']).is_initial()
 
-            if last_date is not None:
-                fly = max(fly, last_date.year)
+    def get_df(self, flavor):
+        return concat(list(self.read_chunks(flavor)))
 
-                if fly == curr_year:
-                    return fly
+    def read_chunks(self, flavor):
+        sources = self.sources(flavor, self.flavor_latest_date(flavor))
 
-        return fly
+        for source, content in zip(sources, self.download(sources)):
+            yield from self.read_source(flavor, source, content)
 
-    def if_initial(self, flavor):
-        return Platforms(self.model_launcher, flavor['name']).is_initial()
+    def download(self, sources):
+        return download_all([(url, ttl) for url, ttl, _, _ in sources])
 
-    def get_df(self, flavor):
-        cols = flavor["keys"] + \
-               list(flavor["values"].keys()) + \
-               flavor.get("add_cols", [])
+    def read_source(self, flavor, source, content):
+        _, _, date_fmt, names = source
+
+        stream = None if content is None else self.open_source(content, names)
+
+        if stream is None:
+            return
+
+        texts = flavor["keys"] + [flavor["date"]] + flavor.get("add_cols", [])
+
+        dtype = {col: np.float64 for col in flavor["values"].keys()}
+        dtype.update({col: str for col in texts})
+
+        with stream:
+            start = time.perf_counter()
+
+            for df in pd.read_csv(stream, header=None if names else 'infer', names=names,
+                                  usecols=list(dtype.keys()), dtype=dtype,
+                                  chunksize=Flavor.CHUNK_SIZE):
+                df = self.prepare_chunk(df, flavor, date_fmt)
+
+                report('parsed', rows=len(df), elapsed=time.perf_counter() - start)
 
-        df = pd.DataFrame()
+                yield df
 
-        for csv, date_fmt in self.load_csvs(flavor):
-            df = df.append(pd.read_csv(
-                StringIO(csv),
-                usecols=cols,
-                parse_dates=[flavor["date"]],
-                date_parser=lambda date: dt.datetime.strptime(date, date_fmt).date()))
+                start = time.perf_counter()
 
-        df = df.rename(str, flavor["values"])
+    def prepare_chunk(self, df, flavor, date_fmt):
+        df[flavor["date"]] = pd.to_datetime(df[flavor["date"]], format=date_fmt).dt.date
 
-        df[flavor["keys"]] = df[flavor["keys"]].applymap(lambda x: x.strip())
+        df = df.rename(columns=flavor["values"])
+
+        for key in flavor["keys"]:
+            df[key] = df[key].str.strip()
 
         return df
 
-    def process_flavor(self, df, flavor):
-        info = group_by(df, flavor["keys"])
+    def last_dates(self, flavor):
+        return ResourceCatalog(self.model_launcher.main_dbh).get_entries(flavor['name'])[
+            ["PlatformCode", "ActiveName", "last_date"]]
+
+    def update_flavor(self, flavor):
+        if not flavor.get("columnar", False):
+            return self.process_flavor(self.get_df(flavor), flavor)
+
+        checkpoints = Checkpoints(self.model_launcher)
+        checkpoint = checkpoints.get(flavor['name'])
+
+        if checkpoint is None:
+            since = self.flavor_latest_date(flavor)
+
+            checkpoint = checkpoints.write(flavor['name'], {
+                'since': None if since is None else since.isoformat(),
+                'sources': self.sources(flavor, since),
+                'source': 0,
+                'chunk': 0,
+                'size': None})
+
+        since = checkpoint['since'] and dt.datetime.strptime(checkpoint['since'], '%Y-%m-%d').date()
+
+        last_dates = self.last_dates(flavor)
+        if since is None:
+            last_dates = last_dates.assign(last_date=np.nan)
+        else:
+            last_dates = last_dates.assign(last_date=last_dates.last_date.clip(upper=to_timestamp(since)))
+
+        sources = checkpoint['sources'][checkpoint['source']:]
+        ranges = []
+
+        for i, (source, content) in enumerate(zip(sources, self.download(sources)), checkpoint['source']):
+            skip = checkpoint['chunk'] if i == checkpoint['source'] and \
+                                          content is not None and len(content) == checkpoint['size'] else 0
+
+            for j, df in enumerate(self.read_source(flavor, source, content)):
+                if j < skip:
+                    continue
+
+                ranges.append(self.process_flavor(df, flavor, last_dates))
+
+                checkpoint = checkpoints.write(flavor['name'], dict(
+                    checkpoint, source=i, chunk=j + 1, size=len(content)))
 
+            checkpoint = checkpoints.write(flavor['name'], dict(
+                checkpoint, source=i + 1, chunk=0, size=None))
+
+        checkpoints.remove(flavor['name'])
+
+        return reduce_ranges(ranges)
+
+    def process_flavor(self, df, flavor, last_dates=None):
         actives_table = WeeklyActives(self.model_launcher, flavor['name'])
         platforms_table = Platforms(self.model_launcher, flavor['name'])
 
-        platforms = set()
-        actives = set()
+        code, name = flavor["keys"]
+
+        names = pd.DataFrame([[value] + Flavor.get_active_platform_name(value)
+                              for value in df[name].unique()],
+                             columns=[name, "ActiveName", "PlatformName"])
+        keys = df[[code, name]].drop_duplicates().merge(names, on=name)
+        keys = keys.rename(columns={code: "PlatformCode"})
+
+        for table, columns in (
+                (platforms_table, ["PlatformCode", "PlatformName"]),
+                (actives_table, ["PlatformCode", "ActiveName"])):
+            table.write_df(keys[columns].drop_duplicates())
+
+        if flavor.get("columnar", False):
+            if last_dates is None:
+                last_dates = self.last_dates(flavor)
+
+            return self.upsert_flavor(df, keys, flavor, actives_table.get_ids(platforms_table),
+                                      last_dates)
+        else:
+            return self.update_actives(group_by(df, flavor["keys"]), flavor)
+
+    def upsert_flavor(self, df, keys, flavor, ids, last_dates):
+        code, name = flavor["keys"]
+
+        storage = FlavorStorage(self.model_launcher.main_dbh, flavor['name'], flavor['schema'])
+
+        actives = keys.merge(ids, on=["PlatformCode", "ActiveName"]).merge(
+            last_dates, how='left', on=["PlatformCode", "ActiveName"])
+
+        df = df.merge(actives[["PlatformCode", name, "active_id", "platform_id", "last_date"]],
+                      left_on=[code, name], right_on=["PlatformCode", name])
+        df = df.assign(Timestamp=df.Date.map({date: to_timestamp(date) for date in df.Date.unique()}))
+
+        df = df[df.last_date.isnull() |
+                ((df.last_date < df.Timestamp) & (df.Timestamp <= to_timestamp(dt.date.today())))]
 
-        for code, name in info.groups.keys():
-            active_name, platform_name = Flavor.get_active_platform_name(name)
-            platforms.add((code, platform_name))
-            actives.add((code, active_name))
+        if df.empty:
+            return [None, None]
 
-        for table, columns, values in (
-                (platforms_table, ("PlatformCode", "PlatformName"), platforms),
-                (actives_table, ("PlatformCode", "ActiveName"), actives)):
-            table.write_df(pd.DataFrame(list(values), columns=columns))
+        with BulkWriter(self.model_launcher.main_db, flavor['name']) as writer:
+            storage.with_writer(writer).write_df(
+                df.assign(Date=df.Timestamp)[[column for column, _ in storage.schema]])
 
+            for (platform_code, market), active_df in df.groupby(["PlatformCode", name]):
+                active_name, _ = Flavor.get_active_platform_name(market)
+                Active(self.model_launcher, flavor, platform_code, active_name).with_writer(writer) \
+                    .register_write(active_df)
+
+        return [min(df.Date), max(df.Date)]
+
+    def update_actives(self, info, flavor):
         ranges = []
 
-        for code, name in info.groups.keys():
-            active_name, _ = Flavor.get_active_platform_name(name)
-            ranges.append(Active(self.model_launcher, flavor, code, active_name,
-                                 info.get_group((code, name))).update())
+        with BulkWriter(self.model_launcher.main_db, flavor['name']) as writer:
+            for code, name in info.groups.keys():
+                active_name, _ = Flavor.get_active_platform_name(name)
+                ranges.append(Active(self.model_launcher, flavor, code, active_name,
+                                     info.get_group((code, name))).with_writer(writer).update())
 
         return reduce_ranges(ranges)
 
-    def load_csvs(self, flavor):
+    def sources(self, flavor, since):
+        raise NotImplementedError
+
+    def open_source(self, content, names):
         raise NotImplementedError
+
+
+class Checkpoints(Table):
+    def __init__(self, model_launcher):
+        Table.__init__(self, model_launcher.main_dbh, "Checkpoints", [
+            ("flavor", "TEXT PRIMARY KEY"),
+            ("state", "TEXT")])
+
+    def get(self, flavor):
+        row = self.dbh.cursor().execute('''
+            SELECT
+                state
+            FROM
+                "{table}"
+            WHERE
+                flavor = ?'''.format(table=self.table), (flavor,)).fetchone()
+
+        return None if row is None else json.loads(row[0])
+
+    def write(self, flavor, state):
+        self.dbh.cursor().execute('''
+            INSERT OR REPLACE INTO
+                "{table}"
+            VALUES
+                (?, ?)'''.format(table=self.table), (flavor, json.dumps(state)))
+
+        self.dbh.commit()
+
+        return state
+
+    def remove(self, flavor):
+        self.dbh.cursor().execute('''
+            DELETE
+            FROM
+                "{table}"
+            WHERE
+                flavor = ?'''.format(table=self.table), (flavor,))
+
+        self.dbh.commit()
@@ -1,8 +1,12 @@
+import csv
 from datetime import date
+from io import BytesIO
 
-from validol.model.mine.downloader import read_url_one_filed_zip, read_url_text
+from validol.model.mine.downloader import one_filed_zip_stream, unescape
+from validol.model.mine.http_client import client
+from validol.model.mine.response_cache import HOUR, FOREVER
 from validol.model.store.miners.weekly_reports.flavor import Flavor
-from validol.model.utils.utils import group_by, flatten
+from validol.model.utils.utils import flatten
 from validol.model.store.miners.daily_reports.moex import MOEX
 
 
@@ -81,12 +85,14 @@ CFTC_FUTURES_ONLY = {
     "name": "cftc_futures_only",
     "initial_prefix": "http://www.cftc.gov/files/dea/history/deacot1986_",
     "year_prefix": "http://www.cftc.gov/files/dea/history/deacot",
+    "latest_url": "http://www.cftc.gov/dea/newcot/deafut.txt",
     "disaggregated": False,
-    "date_fmt": CFTC_DATE_FMT
+    "date_fmt": CFTC_DATE_FMT,
+    "columnar": True
 }
 
 
-def cftc_disaggregated(initial_prefix, year_prefix, name):
+def cftc_disaggregated(initial_prefix, year_prefix, latest_url, name):
     return {
         "keys": ["CFTC_Market_Code", "Market_and_Exchange_Names"],
         "date": "Report_Date_as_YYYY-MM-DD",
@@ -119,24 +125,28 @@ def cftc_disaggregated(initial_prefix, year_prefix, name):
         "name": name,
         "initial_prefix": initial_prefix,
         "year_prefix": year_prefix,
+        "latest_url": latest_url,
         "disaggregated": True,
-        "date_fmt": CFTC_DATE_FMT
+        "date_fmt": CFTC_DATE_FMT,
+        "columnar": True
     }
 
 
 CFTC_DISAGGREGATED_FUTURES_ONLY = cftc_disaggregated(
     initial_prefix="http://www.cftc.gov/files/dea/history/fut_disagg_txt_hist_2006_",
     year_prefix="http://www.cftc.gov/files/dea/history/fut_disagg_txt_",
+    latest_url="http://www.cftc.gov/dea/newcot/f_disagg.txt",
     name="cftc_disaggregated_futures_only")
 
 
 CFTC_DISAGGREGATED_FUTURES_AND_OPTIONS_COMBINED = cftc_disaggregated(
     initial_prefix="http://www.cftc.gov/files/dea/history/com_disagg_txt_hist_2006_",
     year_prefix="http://www.cftc.gov/files/dea/history/com_disagg_txt_",
+    latest_url="http://www.cftc.gov/dea/newcot/c_disagg.txt",
     name="cftc_disaggregated_futures_and_options_combined")
 
 
-def cftc_financial_futures(initial_prefix, year_prefix, name):
+def cftc_financial_futures(initial_prefix, year_prefix, latest_url, name):
     return {
         "keys": ["CFTC_Market_Code", "Market_and_Exchange_Names"],
         "date": "Report_Date_as_YYYY-MM-DD",
@@ -178,15 +188,18 @@ def cftc_financial_futures(initial_prefix, year_prefix, name):
         "name": name,
         "initial_prefix": initial_prefix,
         "year_prefix": year_prefix,
+        "latest_url": latest_url,
         "disaggregated": False,
         "initial_date_fmt": "%m/%d/%Y 12:00:00 AM",
-        "date_fmt": CFTC_DATE_FMT
+        "date_fmt": CFTC_DATE_FMT,
+        "columnar": True
     }
 
 
 CFTC_FINANCIAL_FUTURES_FUTURES_ONLY = cftc_financial_futures(
     initial_prefix="http://www.cftc.gov/files/dea/history/fin_fut_txt_2006_",
     year_prefix="http://www.cftc.gov/files/dea/history/fut_fin_txt_",
+    latest_url="http://www.cftc.gov/dea/newcot/FinFutWk.txt",
     name='cftc_financial_futures_futures_only'
 )
 
@@ -194,6 +207,7 @@ CFTC_FINANCIAL_FUTURES_FUTURES_ONLY = cftc_financial_futures(
 CFTC_FINANCIAL_FUTURES_COMBINED = cftc_financial_futures(
     initial_prefix="http://www.cftc.gov/files/dea/history/fin_com_txt_2006_",
     year_prefix="http://www.cftc.gov/files/dea/history/com_fin_txt_",
+    latest_url="http://www.cftc.gov/dea/newcot/FinComWk.txt",
     name='cftc_financial_futures_combined'
 )
 
@@ -208,49 +222,70 @@ class Cftc(Flavor):
     ]
 
     LAST_YEAR = 2016
+    LATEST_DAYS = 14
 
     def __init__(self, model_launcher):
         Flavor.__init__(self, model_launcher, Cftc.FLAVORS)
 
-    def load_csvs(self, flavor):
+    def sources(self, flavor, since):
         curr_year = date.today().year
 
-        if self.if_initial(flavor):
-            sources = [(
+        if since is not None and (date.today() - since).days <= Cftc.LATEST_DAYS:
+            names = self.latest_names(flavor, (curr_year, since.year))
+
+            if names is not None:
+                return [[flavor["latest_url"], HOUR, flavor['date_fmt'], names]]
+
+        if since is None or self.if_initial(flavor):
+            sources = [[
                 "{initial_prefix}{prev_year}.zip"
                     .format(initial_prefix=flavor["initial_prefix"],
                             prev_year=Cftc.LAST_YEAR),
-                True,
-                flavor.get("initial_date_fmt", flavor['date_fmt']))]
+                FOREVER,
+                flavor.get("initial_date_fmt", flavor['date_fmt']),
+                None]]
 
             begin = Cftc.LAST_YEAR + 1
         else:
             sources = []
-            begin = self.flavor_latest_year(flavor)
+            begin = since.year
 
-        sources += [(
+        return sources + [[
             "{year_prefix}{year}.zip"
                 .format(year_prefix=flavor["year_prefix"],
                         year=year),
-            year != curr_year,
-            flavor['date_fmt']
-        ) for year in range(begin, curr_year + 1)]
+            HOUR if year == curr_year else FOREVER,
+            flavor['date_fmt'],
+            None
+        ] for year in range(begin, curr_year + 1)]
+
+    def latest_names(self, flavor, years):
+        for year in years:
+            entry = client.peek('GET', "{year_prefix}{year}.zip".format(
+                year_prefix=flavor["year_prefix"], year=year))
 
-        result = []
-        for source, cache_enabled, date_fmt in sources:
-            content = read_url_one_filed_zip(source, cache_enabled)
-            if content is not None:
-                result.append((content, date_fmt))
+            stream = None if entry is None else one_filed_zip_stream(entry.content)
 
-        return result
+            if stream is not None:
+                with stream:
+                    return [name.strip() for name in
+                            next(csv.reader([stream.readline().decode('utf-8')]))]
 
-    def update_flavor(self, flavor):
-        df = self.get_df(flavor)
+        return None
+
+    def open_source(self, content, names):
+        if names is None:
+            return one_filed_zip_stream(content)
+        else:
+            return BytesIO(content)
+
+    def prepare_chunk(self, df, flavor, date_fmt):
+        df = Flavor.prepare_chunk(self, df, flavor, date_fmt)
 
         if flavor["disaggregated"]:
             df = fix_atoms(df)
 
-        return self.process_flavor(df, flavor)
+        return df
 
 
 def ice(name, ice_flavor):
@@ -286,7 +321,9 @@ def ice(name, ice_flavor):
         "name": name,
         "ice_flavor": ice_flavor,
         "add_cols": ["FutOnly_or_Combined"],
-        "date_fmt": "%m/%d/%Y"
+        "date_fmt": "%m/%d/%Y",
+        "url_fmt": "https://www.theice.com/publicdocs/futures/COTHist{year}.csv",
+        "columnar": True
     }
 
 
@@ -299,39 +336,33 @@ class Ice(Flavor):
         ICE_FUTURES_ONLY,
         ICE_COMBINED]
 
+    FIRST_YEAR = 2011
+
     def __init__(self, model_launcher):
         Flavor.__init__(self, model_launcher, Ice.FLAVORS)
 
-        self.grouped_df = None
-
-    def load_csvs(self, flavor):
-        if self.if_initial(flavor):
-            begin = 2011
+    def sources(self, flavor, since):
+        if since is None or self.if_initial(flavor):
+            begin = Ice.FIRST_YEAR
         else:
-            begin = self.flavor_latest_year(flavor)
+            begin = since.year
 
-        result = []
         curr_year = date.today().year
-        for year in range(begin, curr_year + 1):
-            content = read_url_text("https://www.theice.com/publicdocs/futures/COTHist{year}.csv"
-                                    .format(year=year), year != curr_year)
-            if content is not None:
-                result.append((content, flavor['date_fmt']))
-
-        return result
 
-    def prepare_update(self):
-        df = self.get_df(Ice.FLAVORS[0])
+        return [[flavor["url_fmt"].format(year=year), HOUR if year == curr_year else FOREVER,
+                 flavor['date_fmt'], None]
+                for year in range(begin, curr_year + 1)]
 
-        df = fix_atoms(df)
+    def open_source(self, content, names):
+        return BytesIO(content)
 
-        self.grouped_df = group_by(df, ["FutOnly_or_Combined"])
+    def prepare_chunk(self, df, flavor, date_fmt):
+        df = df[df["FutOnly_or_Combined"] == flavor["ice_flavor"]].drop("FutOnly_or_Combined", axis=1)
 
-    def update_flavor(self, flavor):
-        if self.grouped_df is None:
-            self.prepare_update()
+        for key in flavor["keys"]:
+            df[key] = df[key].map({value: unescape(value) for value in df[key].dropna().unique()})
 
-        return self.process_flavor(self.grouped_df.get_group(flavor["ice_flavor"]), flavor)
+        return fix_atoms(Flavor.prepare_chunk(self, df, flavor, date_fmt))
 
 
 WEEKLY_REPORT_FLAVORS = flatten([exchange.FLAVORS for exchange in (Cftc, Ice)]) + [MOEX]
\ No newline at end of file
@@ -0,0 +1,67 @@
+import json
+import sqlite3
+import zlib
+
+from validol.model.store.connection import ConnectionManager
+from validol.model.store.resource import Table
+
+
+class PageIndex(Table):
+    def __init__(self, dbh):
+        Table.__init__(self, dbh, "PageIndex", [
+            ("digest", "TEXT PRIMARY KEY"),
+            ("pages", "INTEGER"),
+            ("texts", "BLOB")])
+
+    def lookup(self, digest):
+        row = self.dbh.cursor().execute('''
+            SELECT
+                texts
+            FROM
+                "{table}"
+            WHERE
+                digest = ?'''.format(table=self.table), (digest,)).fetchone()
+
+        return None if row is None else json.loads(zlib.decompress(row[0]).decode('utf-8'))
+
+    def store(self, digest, texts):
+        self.dbh.cursor().execute('''
+            INSERT OR REPLACE INTO
+                "{table}"
+            VALUES
+                (?, ?, ?)'''.format(table=self.table), (
+            digest,
+            len(texts),
+            zlib.compress(json.dumps(texts).encode('utf-8'))))
+
+
+class PageIndexStore:
+    def __init__(self):
+        self.db = None
+
+    def attach(self, db):
+        self.db = db
+
+    def lookup(self, digest):
+        if self.db is None:
+            return None
+
+        try:
+            return PageIndex(self.db.connection).lookup(digest)
+        except sqlite3.Error:
+            return None
+
+    def store(self, digest, texts):
+        if self.db is not None:
+            try:
+                with self.db.transaction() as dbh:
+                    PageIndex(dbh).store(digest, texts)
+            except sqlite3.Error as e:
+                print('Page index: {}'.format(e))
+
+
+page_index = PageIndexStore()
+
+
+def attach_page_index(database):
+    page_index.attach(ConnectionManager(database))
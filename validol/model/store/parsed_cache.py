@@ -0,0 +1,88 @@
+import hashlib
+import json
+import pickle
+import time
+import zlib
+
+import pandas as pd
+
+from validol.model.store.resource import Table
+
+
+PARSER_VERSION = 1
+CHUNK_SIZE = 1024 ** 2
+
+
+def content_digest(content):
+    sha = hashlib.sha256()
+
+    if hasattr(content, 'read'):
+        content.seek(0)
+
+        for chunk in iter(lambda: content.read(CHUNK_SIZE), b''):
+            sha.update(chunk)
+
+        content.seek(0)
+    else:
+        sha.update(content)
+
+    return sha.hexdigest()
+
+
+class ParsedCache(Table):
+    def __init__(self, dbh):
+        Table.__init__(self, dbh, "ParsedCache", [
+            ("key", "TEXT PRIMARY KEY"),
+            ("parser", "TEXT"),
+            ("active", "TEXT"),
+            ("data", "BLOB"),
+            ("rows", "INTEGER"),
+            ("stored_at", "REAL")])
+
+    @staticmethod
+    def key(pdf_helper, digest):
+        processor = pdf_helper.processor
+
+        return hashlib.sha1(json.dumps([
+            PARSER_VERSION,
+            pd.__version__,
+            digest,
+            processor.NAME,
+            getattr(processor, 'parser_config', None),
+            pdf_helper.other_info,
+            pdf_helper.name.active_only()], default=str, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def lookup(self, key, date):
+        row = self.dbh.cursor().execute('''
+            SELECT
+                data
+            FROM
+                "{table}"
+            WHERE
+                key = ?'''.format(table=self.table), (key,)).fetchone()
+
+        if row is None:
+            return None
+
+        try:
+            df = pickle.loads(zlib.decompress(row[0]))
+        except Exception:
+            return None
+
+        if not df.empty:
+            df['Date'] = date
+
+        return df
+
+    def store(self, key, pdf_helper, df):
+        self.dbh.cursor().execute('''
+            INSERT OR REPLACE INTO
+                "{table}"
+            VALUES
+                (?, ?, ?, ?, ?, ?)'''.format(table=self.table), (
+            key,
+            pdf_helper.processor.NAME,
+            pdf_helper.name.active_only(),
+            zlib.compress(pickle.dumps(df.drop('Date', axis=1, errors='ignore'), pickle.HIGHEST_PROTOCOL)),
+            len(df),
+            time.time()))
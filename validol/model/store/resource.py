@@ -4,32 +4,42 @@ import numpy as np
 from functools import wraps
 import requests
 import socket
+import re
+import time
+import sqlite3
+from concurrent.futures import wait, FIRST_COMPLETED
 
 from validol.model.utils.utils import date_field_to_timestamp, to_timestamp
 from validol.model.store.utils import range_from_timestamp
+from validol.model.store.typed_reader import read_typed
+from validol.model.utils.progress import tracking, report, Stats
 
 
 class Table:
-    def __init__(self, dbh, table, schema, modifier="", pre_dump=None, post_load=None):
+    def __init__(self, dbh, table, schema, modifier="", pre_dump=None, post_load=None,
+                 without_rowid=False, create=True):
         self.schema = schema
         self.table = table
         self.dbh = dbh
         self.pre_dump = pre_dump or (lambda x: x)
         self.post_load = post_load or (lambda x: x)
+        self.writer = None
 
-        self.__create_table(modifier)
+        if create:
+            self.create_table(modifier, without_rowid)
 
-    def __create_table(self, modifier):
+    def create_table(self, modifier, without_rowid):
         columns = [" ".join(['"{}"'.format(name), data_type]) for name, data_type in self.schema]
 
         if modifier:
             modifier = ", " + modifier
 
         self.dbh.cursor().execute(
-            'CREATE TABLE IF NOT EXISTS "{table}" ({columns}{modifier})'.format(
+            'CREATE TABLE IF NOT EXISTS "{table}" ({columns}{modifier}){options}'.format(
                 table=self.table,
                 columns=",".join(columns),
-                modifier=modifier))
+                modifier=modifier,
+                options=" WITHOUT ROWID" if without_rowid else ""))
 
     def read_all(self, query):
         return self.dbh.cursor().execute(query).fetch_all()
@@ -43,7 +53,21 @@ class Table:
         '''.format(table=self.table, values_num=",".join('?' * len(self.schema))), values)
 
     def write_df(self, df):
-        self.pre_dump(df).to_sql(self.table, self.dbh, if_exists='append', index=False)
+        df = self.pre_dump(df)
+
+        if self.writer is None:
+            start = time.perf_counter()
+
+            df.to_sql(self.table, self.dbh, if_exists='append', index=False)
+
+            report('written', rows=len(df), elapsed=time.perf_counter() - start)
+        else:
+            self.writer.stage(self.table, df)
+
+    def with_writer(self, writer):
+        self.writer = writer
+
+        return self
 
     def read_df(self, query=None, **kwargs):
         if query is None:
@@ -57,27 +81,244 @@ class Table:
         '''.format(table=self.table))
 
 
-class Updater:
-    def __init__(self, model_launcher):
-        self.model_launcher = model_launcher
+class ResourceCatalog(Table):
+    def __init__(self, dbh, create=True):
+        Table.__init__(self, dbh, "Catalog", [
+            ("resource", "TEXT PRIMARY KEY"),
+            ("flavor", "TEXT"),
+            ("PlatformCode", "TEXT"),
+            ("ActiveName", "TEXT"),
+            ("first_date", "INTEGER"),
+            ("last_date", "INTEGER"),
+            ("row_count", "INTEGER"),
+            ("updated_at", "INTEGER")], create=create)
 
-    def update_source(self, source):
-        result = self.update_source_impl(source)
+    def refresh(self, resource, source, info, dbh=None):
+        dbh = dbh or self.dbh
+
+        dbh.cursor().execute('''
+            INSERT OR REPLACE INTO
+                "{table}"
+            SELECT
+                ?, ?, ?, ?, MIN(Date), MAX(Date), COUNT(*), ?
+            FROM
+                {source}'''.format(table=self.table, source=source),
+                             (resource,) + tuple(info) + (int(time.time()),))
 
-        results = [] if result is None else [(source, result)]
+    def lookup(self, resource):
+        return self.dbh.cursor().execute('''
+            SELECT
+                first_date,
+                last_date,
+                row_count,
+                updated_at
+            FROM
+                "{table}"
+            WHERE
+                resource = ?'''.format(table=self.table), (resource,)).fetchone()
 
-        for dep, sources in self.dependencies(source):
-            updater = dep(self.model_launcher)
+    def flavor_range(self, flavor):
+        return range_from_timestamp(self.dbh.cursor().execute('''
+            SELECT
+                MIN(first_date),
+                MAX(last_date)
+            FROM
+                "{table}"
+            WHERE
+                flavor = ?'''.format(table=self.table), (flavor,)).fetchone())
 
-            if sources is None:
-                results.extend(updater.update_entire())
-            else:
-                for source in sources:
-                    results.extend(updater.update_source(source))
+    def get_entries(self, flavor):
+        return self.read_df('''
+            SELECT
+                *
+            FROM
+                "{table}"
+            WHERE
+                flavor = ?''', params=(flavor,))
+
+    def remove(self, resource):
+        self.dbh.cursor().execute('''
+            DELETE
+            FROM
+                "{table}"
+            WHERE
+                resource = ?'''.format(table=self.table), (resource,))
+
+        self.dbh.commit()
 
-        self.model_launcher.register_update(source)
 
-        return results
+class ResourceDates(Table):
+    def __init__(self, dbh, create=True):
+        Table.__init__(self, dbh, "CatalogDates", [
+            ("resource", "TEXT"),
+            ("Date", "INTEGER")], "PRIMARY KEY (resource, Date)", without_rowid=True, create=create)
+
+    def add(self, resource, dates, dbh=None):
+        dbh = dbh or self.dbh
+
+        dbh.cursor().executemany('''
+            INSERT OR IGNORE INTO
+                "{table}"
+            VALUES
+                (?, ?)'''.format(table=self.table), [(resource, int(date)) for date in dates])
+
+    def rebuild(self, resource, source, dbh=None):
+        dbh = dbh or self.dbh
+
+        self.remove(resource, dbh)
+
+        dbh.cursor().execute('''
+            INSERT OR IGNORE INTO
+                "{table}"
+            SELECT DISTINCT
+                ?, Date
+            FROM
+                {source}'''.format(table=self.table, source=source), (resource,))
+
+    def indexed(self, resource, dbh=None):
+        dbh = dbh or self.dbh
+
+        return dbh.cursor().execute('''
+            SELECT
+                1
+            FROM
+                "{table}"
+            WHERE
+                resource = ?
+            LIMIT 1'''.format(table=self.table), (resource,)).fetchone() is not None
+
+    def dates(self, resource):
+        return [date for date, in self.dbh.cursor().execute('''
+            SELECT
+                Date
+            FROM
+                "{table}"
+            WHERE
+                resource = ?
+            ORDER BY
+                Date'''.format(table=self.table), (resource,))]
+
+    def remove(self, resource, dbh=None):
+        (dbh or self.dbh).cursor().execute('''
+            DELETE
+            FROM
+                "{table}"
+            WHERE
+                resource = ?'''.format(table=self.table), (resource,))
+
+
+def create_catalog(dbh):
+    ResourceCatalog(dbh)
+    ResourceDates(dbh)
+
+
+class UpdateTelemetry(Table):
+    METRICS = ['wall_time', 'download_time', 'parse_time', 'write_time', 'bytes', 'rows', 'cache_hits']
+
+    def __init__(self, dbh):
+        Table.__init__(self, dbh, "Telemetry", [
+            ("run_id", "INTEGER"),
+            ("source", "TEXT"),
+            ("started_at", "REAL"),
+            ("wall_time", "REAL"),
+            ("download_time", "REAL"),
+            ("parse_time", "REAL"),
+            ("write_time", "REAL"),
+            ("bytes", "INTEGER"),
+            ("rows", "INTEGER"),
+            ("downloads", "INTEGER"),
+            ("cache_hits", "INTEGER"),
+            ("error", "TEXT")], "PRIMARY KEY (run_id, source)")
+
+    def record(self, run_id, source, started_at, wall_time, stats, error=None):
+        self.dbh.cursor().execute('''
+            INSERT OR REPLACE INTO
+                "{table}"
+            VALUES
+                (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'''.format(table=self.table), (
+            run_id,
+            source,
+            started_at,
+            wall_time,
+            stats.elapsed('downloaded', 'not modified'),
+            stats.elapsed('parsed'),
+            stats.elapsed('written'),
+            stats.size('downloaded'),
+            stats.rows('written'),
+            stats.count('downloaded'),
+            stats.count('cached', 'not modified'),
+            error))
+
+    def runs(self, limit):
+        return self.read_df('''
+            SELECT
+                *
+            FROM
+                "{table}"
+            WHERE
+                run_id IN (
+                    SELECT DISTINCT
+                        run_id
+                    FROM
+                        "{table}"
+                    ORDER BY
+                        run_id DESC
+                    LIMIT ?)
+            ORDER BY
+                started_at''', params=(limit,))
+
+    def trend(self, limit, metric='wall_time'):
+        df = self.runs(limit)
+
+        if df.empty:
+            return pd.DataFrame()
+
+        df['run'] = pd.to_datetime(df.groupby('run_id').started_at.transform('min'), unit='s').dt.strftime(
+            '%Y-%m-%d %H:%M:%S')
+
+        return df.pivot_table(index='source', columns='run', values=metric, aggfunc='sum')
+
+    def report(self, limit):
+        df = self.runs(limit)
+
+        if df.empty:
+            return df
+
+        df['failed'] = df.error.notnull()
+
+        grouped = df.groupby('source')
+        last = grouped.last()
+
+        report = pd.DataFrame({
+            'runs': grouped.size(),
+            'failed': grouped.failed.sum(),
+            'last_wall_time': last.wall_time,
+            'median_wall_time': grouped.wall_time.median(),
+            'download_time': grouped.download_time.median(),
+            'parse_time': grouped.parse_time.median(),
+            'write_time': grouped.write_time.median(),
+            'bytes': grouped.bytes.median(),
+            'rows': grouped.rows.median(),
+            'cache_hit_ratio': grouped.cache_hits.sum() /
+                               (grouped.cache_hits.sum() + grouped.downloads.sum()).replace(0, np.nan),
+            'last_error': last.error
+        }, columns=['runs', 'failed', 'last_wall_time', 'median_wall_time', 'download_time', 'parse_time',
+                    'write_time', 'bytes', 'rows', 'cache_hit_ratio', 'last_error'])
+
+        report['slowdown'] = report.last_wall_time / report.median_wall_time.replace(0, np.nan)
+
+        return report.sort_values('slowdown', ascending=False).reset_index()
+
+
+class Updater:
+    def __init__(self, model_launcher):
+        self.model_launcher = model_launcher
+
+    def itself(self, model_launcher):
+        return self
+
+    def update_source(self, source):
+        return UpdateExecutor(self.model_launcher).run([(self.itself, source)])
 
     def update_source_impl(self, source):
         raise NotImplementedError
@@ -86,7 +327,8 @@ class Updater:
         raise NotImplementedError
 
     def update_entire(self):
-        return sum([self.update_source(source['name']) for source in self.get_sources()], [])
+        return UpdateExecutor(self.model_launcher).run(
+            [(self.itself, source['name']) for source in self.get_sources()])
 
     def dependencies(self, source):
         return []
@@ -131,16 +373,145 @@ class CompositeUpdater(Updater):
         return [{'name': self.name}]
 
     def update_source(self, source):
-        result = []
+        return UpdateExecutor(self.model_launcher).run([(self.itself, source)])
+
+
+class UpdateExecutor:
+    WORKERS = 8
+    ERRORS = (requests.exceptions.ConnectionError, socket.gaierror)
+
+    def __init__(self, model_launcher):
+        self.model_launcher = model_launcher
+        self.progress = model_launcher.progress
+        self.run_id = int(time.time() * 1000)
+
+        self.templates = {}
+        self.tolerant = set()
+
+    def template(self, factory):
+        if factory not in self.templates:
+            self.templates[factory] = factory(self.model_launcher)
+
+        return self.templates[factory]
+
+    def expand(self, node):
+        factory, source = node
+        updater = self.template(factory)
+
+        if not isinstance(updater, CompositeUpdater):
+            return [node]
+
+        nodes = []
+
+        for cls in updater.clss:
+            for source in self.template(cls).get_sources():
+                nodes.extend(self.expand((cls, source['name'])))
+
+        self.tolerant.update(nodes)
+
+        return nodes
+
+    def children(self, node):
+        factory, source = node
+        nodes = []
+
+        for dep, sources in self.template(factory).dependencies(source):
+            if sources is None:
+                sources = [source['name'] for source in self.template(dep).get_sources()]
 
-        for cls in self.clss:
-            try:
-                result.extend(cls(self.model_launcher).update_entire())
-            except (requests.exceptions.ConnectionError, socket.gaierror) as e:
-                print(e)
+            for dep_source in sources:
+                nodes.extend(self.expand((dep, dep_source)))
+
+        if node in self.tolerant:
+            self.tolerant.update(nodes)
+
+        return nodes
+
+    def run_node(self, node):
+        factory, source = node
+
+        stats = Stats()
+        started_at = time.time()
+        start = time.perf_counter()
+        error = None
+
+        try:
+            with tracking(self.progress, source, stats):
+                self.progress.report(source, 'started')
+
+                result = factory(self.model_launcher).update_source_impl(source)
+
+                self.progress.report(source, 'finished')
+        except Exception as e:
+            error = '{}: {}'.format(type(e).__name__, e)
+            raise
+        finally:
+            self.record(source, started_at, time.perf_counter() - start, stats, error)
 
         return result
 
+    def record(self, source, started_at, wall_time, stats, error):
+        try:
+            with self.model_launcher.main_db.transaction() as dbh:
+                UpdateTelemetry(dbh).record(self.run_id, source, started_at, wall_time, stats, error)
+        except sqlite3.Error as e:
+            print('Telemetry for {} was not recorded: {}'.format(source, e))
+
+    def run(self, roots):
+        roots = sum([self.expand(root) for root in roots], [])
+
+        results = {}
+        children = {}
+
+        pool = self.model_launcher.update_pool
+        pending = {pool.submit(self.run_node, node): node for node in roots}
+        submitted = set(roots)
+
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    node = pending.pop(future)
+
+                    try:
+                        results[node] = future.result()
+                    except self.ERRORS as e:
+                        if node not in self.tolerant:
+                            raise
+
+                        print(e)
+                        continue
+
+                    self.model_launcher.register_update(node[1])
+
+                    children[node] = self.children(node)
+
+                    for child in children[node]:
+                        if child not in submitted:
+                            submitted.add(child)
+                            pending[pool.submit(self.run_node, child)] = child
+        except:
+            for future in pending:
+                future.cancel()
+
+            wait(pending)
+            raise
+
+        return [(node[1], results[node]) for node in UpdateExecutor.preorder(roots, children)
+                if results.get(node) is not None]
+
+    @staticmethod
+    def preorder(nodes, children, visited=None):
+        visited = set() if visited is None else visited
+
+        for node in nodes:
+            if node not in visited:
+                visited.add(node)
+
+                yield node
+                yield from UpdateExecutor.preorder(children.get(node, []), children, visited)
+
 
 class Updatable:
     @staticmethod
@@ -182,22 +553,57 @@ class Updatable:
 
 
 class Resource(Table, Updatable):
-    def __init__(self, dbh, table, schema, modifier=None, pre_dump=None, post_load=None):
+    MODIFIER = "PRIMARY KEY (Date) ON CONFLICT REPLACE"
+
+    def __init__(self, dbh, table, schema, modifier=None, pre_dump=None, post_load=None,
+                 catalog_info=(None, None, None)):
         Table.__init__(self, dbh, table, [("Date", "INTEGER")] + schema,
-                       modifier or "PRIMARY KEY (Date) ON CONFLICT REPLACE",
+                       modifier or Resource.MODIFIER,
                        pre_dump, post_load)
         Updatable.__init__(self)
 
+        self.catalog = ResourceCatalog(dbh, create=False)
+        self.catalog_info = catalog_info
+
+    def catalog_source(self):
+        return '"{table}"'.format(table=self.table)
+
+    def source(self):
+        return '"{table}"'.format(table=self.table)
+
+    def refresh_catalog(self, dbh=None):
+        self.catalog.refresh(self.table, self.catalog_source(), self.catalog_info, dbh)
+
+    def catalog_entry(self):
+        entry = self.catalog.lookup(self.table)
+
+        if entry is None:
+            self.refresh_catalog()
+            self.dbh.commit()
+
+            entry = self.catalog.lookup(self.table)
+
+        return entry
+
+    def write_failed(self):
+        return self.writer is not None and any(table == self.table for table, _ in self.writer.failed)
+
+    def after_write(self, callback):
+        if self.writer is None:
+            callback()
+            self.dbh.commit()
+        else:
+            self.writer.after(callback)
+
+    def register_write(self, df):
+        if not df.empty:
+            self.after_write(self.refresh_catalog)
+
     def range(self):
-        c = self.dbh.cursor()
-        c.execute('''
-        SELECT
-            MIN(Date),
-            MAX(Date)
-        FROM
-            "{table}"'''.format(table=self.table))
+        return range_from_timestamp(self.catalog_entry()[:2])
 
-        return range_from_timestamp(c.fetchone())
+    def row_count(self):
+        return self.catalog_entry()[2]
 
     def empty(self):
         return pd.DataFrame(columns=[name for name, _ in self.schema],
@@ -211,7 +617,7 @@ class Resource(Table, Updatable):
             SELECT 
                 * 
             FROM 
-                "{table}"'''.format(table=self.table)
+                "{table}"'''
 
         cp = list(zip(*[(clause, int(param))
                         for clause, param in (('Date >= ?', begin), ('Date <= ?', end))
@@ -220,33 +626,44 @@ class Resource(Table, Updatable):
         if cp:
             clauses, params = cp
 
-            query += 'WHERE {}'.format(' AND '.join(clauses))
+            query += ' WHERE {}'.format(' AND '.join(clauses))
         else:
             params = None
 
-        return self.read_df(query, params=params)
+        return self.read_df(query + ' ORDER BY Date', params=params)
 
-    def read_df(self, query=None, index_on=True, **kwargs):
-        if index_on:
-            kwargs['index_col'] = 'Date'
+    def read_df(self, query=None, index_on=True, params=None):
+        capacity = None
 
-        df = super().read_df(query, **kwargs)
+        if query is None:
+            query = 'SELECT * FROM "{table}"'
+            capacity = self.row_count()
 
-        if index_on:
-            df.sort_index(inplace=True)
+            if index_on:
+                query += ' ORDER BY Date'
 
-        types = dict(self.schema)
-        for col in df:
-            if any(types.get(col, None) == typ for typ in ('REAL', 'INTEGER')):
-                df[col] = pd.to_numeric(df[col])
+        query = query.replace('"{table}"', self.source()).format(table=self.table)
 
-        return df
+        return self.post_load(read_typed(self.dbh, query, params,
+                                         dict(self.schema), 'Date' if index_on else None,
+                                         capacity))
 
     def write_df(self, df):
+        super().write_df(Resource.with_timestamps(df))
+
+        self.register_write(df)
+
+    def drop(self):
+        super().drop()
+
+        self.catalog.remove(self.table)
+
+    @staticmethod
+    def with_timestamps(df):
         if not df.empty and df.Date.dtype != np.int64:
             df = date_field_to_timestamp(df)
 
-        super().write_df(df)
+        return df
 
     def write_update(self, data):
         self.write_df(data)
@@ -329,6 +746,20 @@ class Actives(Table):
             WHERE
                 PlatformCode = ?''', params=(platform,))
 
+    def get_ids(self, platforms):
+        return self.read_df('''
+            SELECT
+                a.PlatformCode,
+                a.ActiveName,
+                a.id AS active_id,
+                p.id AS platform_id
+            FROM
+                "{{table}}" a
+            JOIN
+                "{platforms}" p
+            ON
+                a.PlatformCode = p.PlatformCode'''.format(platforms=platforms.table))
+
     def get_fields(self, platform_code, active_name, fields):
         return self.dbh.cursor().execute('''
             SELECT 
@@ -352,19 +783,117 @@ class Actives(Table):
         self.dbh.commit()
 
 
+class FlavorStorage(Table):
+    def __init__(self, dbh, flavor, schema, modifier=None):
+        Table.__init__(self, dbh, FlavorStorage.storage_name(flavor),
+                       [("active_id", "INTEGER"), ("Date", "INTEGER")] + schema,
+                       FlavorStorage.key_modifier(modifier or Resource.MODIFIER),
+                       without_rowid=True)
+
+    @staticmethod
+    def storage_name(flavor):
+        return "Flavor_{flavor}".format(flavor=flavor)
+
+    @staticmethod
+    def key_modifier(modifier):
+        return re.sub(r'^\s*(PRIMARY KEY|UNIQUE)\s*\(', 'PRIMARY KEY (active_id, ', modifier)
+
+    def select(self, active_id):
+        return '''(
+            SELECT
+                {columns}
+            FROM
+                "{table}"
+            WHERE
+                active_id = {active_id})'''.format(
+            columns=", ".join('"{}"'.format(name) for name, _ in self.schema[1:]),
+            table=self.table,
+            active_id=int(active_id))
+
+    def drop_active(self, active_id):
+        self.dbh.cursor().execute('''
+            DELETE
+            FROM
+                "{table}"
+            WHERE
+                active_id = ?'''.format(table=self.table), (active_id,))
+
+        self.dbh.commit()
+
+
 class ActiveResource(Resource):
     def __init__(self, schema, model_launcher, platform_code, active_name, flavor,
                  platforms_cls=Platforms, actives_cls=Actives, modifier=None,
-                 pre_dump=None, post_load=None, actives_flavor=None):
+                 pre_dump=None, post_load=None, actives_flavor=None, columnar=False):
         active_id = actives_cls(model_launcher, actives_flavor or flavor).get_fields(platform_code, active_name, ('id',))[0]
         platform_id = platforms_cls(model_launcher, actives_flavor or flavor).get_platform_id(platform_code)
 
+        self.active_id = active_id
+
+        if columnar:
+            self.storage = FlavorStorage(model_launcher.main_dbh, flavor, schema, modifier)
+        else:
+            self.storage = None
+
         Resource.__init__(self, model_launcher.main_dbh,
-                          "Active_platform_{platform_id}_active_{active_id}_{flavor}".format(
-                              platform_id=platform_id,
-                              active_id=active_id,
-                              flavor=flavor),
-                          schema, modifier, pre_dump, post_load)
+                          ActiveResource.table_name(platform_id, active_id, flavor),
+                          schema, modifier, pre_dump, post_load,
+                          (flavor, platform_code, active_name))
+
+    @staticmethod
+    def table_name(platform_id, active_id, flavor):
+        return "Active_platform_{platform_id}_active_{active_id}_{flavor}".format(
+            platform_id=platform_id,
+            active_id=active_id,
+            flavor=flavor)
+
+    def create_table(self, modifier, without_rowid):
+        if self.storage is None:
+            super().create_table(modifier, without_rowid)
+
+    def source(self):
+        if self.storage is None:
+            return super().source()
+        else:
+            return self.storage.select(self.active_id)
+
+    def with_writer(self, writer):
+        if self.storage is not None:
+            self.storage.with_writer(writer)
+
+        return super().with_writer(writer)
+
+    def catalog_source(self):
+        if self.storage is None:
+            return super().catalog_source()
+        else:
+            return '"{table}" WHERE active_id = {active_id}'.format(table=self.storage.table,
+                                                                    active_id=int(self.active_id))
+
+    def write_failed(self):
+        if self.storage is None:
+            return super().write_failed()
+        else:
+            return self.storage.writer is not None and \
+                any(table == self.storage.table for table, _ in self.storage.writer.failed)
+
+    def write_df(self, df):
+        if self.storage is None:
+            super().write_df(df)
+        else:
+            df = self.pre_dump(Resource.with_timestamps(df))
+
+            self.storage.write_df(df.assign(active_id=self.active_id))
+
+            self.register_write(df)
+
+    def drop(self):
+        if self.storage is None:
+            super().drop()
+        else:
+            self.storage.drop_active(self.active_id)
+
+            self.catalog.remove(self.table)
 
 
 def check_empty(f):
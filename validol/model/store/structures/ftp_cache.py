@@ -1,39 +1,56 @@
-from sqlalchemy import Column, String, LargeBinary
 from io import BytesIO
-from ftplib import FTP
+import os
+import time
 
-from validol.model.store.structures.structure import NamedStructure, Base
+from validol.model.mine.ftp_client import ftp_client
+from validol.model.utils.progress import report
 
 
-class FtpCacheEntry(Base):
-    __tablename__ = 'ftp'
-    name = Column(String, primary_key=True)
-    value = Column(LargeBinary)
+class FtpCache:
+    def __init__(self, model_launcher):
+        self.blob_store = model_launcher.blob_store
 
     @staticmethod
-    def load(ftp_server, file):
-        with FTP(ftp_server) as ftp:
-            ftp.login()
+    def retrieve(ftp_server, file, callback):
+        ftp_client(ftp_server).retrieve(file, callback)
+
+    def get(self, ftp_server, file, with_cache=True, date=None):
+        if not with_cache:
             data = BytesIO()
-            ftp.retrbinary('RETR {}'.format(file), data.write)
+            FtpCache.retrieve(ftp_server, file, data.write)
 
-        return FtpCacheEntry(name=file, value=data.getvalue())
+            return data.getvalue()
 
+        blob = self.blob_store.open(file)
 
-class FtpCache(NamedStructure):
-    def __init__(self, model_launcher):
-        NamedStructure.__init__(self, FtpCacheEntry, model_launcher, model_launcher.cache_engine)
+        if blob is not None:
+            report('cached')
+
+            return blob
+
+        self.download(ftp_server, file, date)
+
+        return self.blob_store.open(file)
+
+    def download(self, ftp_server, file, date=None):
+        start = time.perf_counter()
+
+        size = self.blob_store.write(file, lambda callback: FtpCache.retrieve(ftp_server, file, callback), date)
+
+        report('downloaded', size=size, elapsed=time.perf_counter() - start)
+
+    def prefetch(self, ftp_server, files):
+        missing = [(ftp_server, file, date) for file, date in files if not self.blob_store.contains(file)]
+
+        ftp_client(ftp_server).download_all(missing, self.download)
 
-    def get(self, ftp_server, file, with_cache=True):
-        if with_cache:
-            try:
-                return self.read_by_name(file).value
-            except:
-                obj = FtpCacheEntry.load(ftp_server, file)
+        return len(missing)
 
-                self.write(obj)
-        else:
-            obj = FtpCacheEntry.load(ftp_server, file)
+    def dates(self, directory):
+        return {date: os.path.basename(name) for date, name in self.blob_store.dates(directory)}
 
-        return obj.value
+    def one(self):
+        return self.blob_store.any()
 
+    def remove(self, file):
+        self.blob_store.remove(file)
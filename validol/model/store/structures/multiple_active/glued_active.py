@@ -30,6 +30,8 @@ class GluedActive(Base):
 
 
 class GluedActiveView(MultipleActiveView):
+    COMPOSITE = True
+
     def __init__(self):
         MultipleActiveView.__init__(self, "glued_active", GluedActive)
 
@@ -2,6 +2,7 @@ import pandas as pd
 
 from validol.model.store.structures.structure import NamedStructure
 from validol.model.store.view.view_flavor import ViewFlavor
+from validol.model.store.view.active_info import ActiveInfo
 
 
 class MultipleActives(NamedStructure):
@@ -42,5 +43,9 @@ class MultipleActiveView(ViewFlavor):
             MultipleActives(model_launcher, self.active_cls)\
                 .write_active(name, chosen_actives)
 
+            model_launcher.invalidate_active(ActiveInfo(self, platform, name))
+
     def remove_active(self, ai, model_launcher):
-        MultipleActives(model_launcher, self.active_cls).remove_by_name(ai.active)
\ No newline at end of file
+        MultipleActives(model_launcher, self.active_cls).remove_by_name(ai.active)
+
+        model_launcher.invalidate_active(ai)
\ No newline at end of file
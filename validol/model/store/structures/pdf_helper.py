@@ -1,25 +1,83 @@
 from sqlalchemy import Column, String
 from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import reconstructor
+from io import BytesIO
 import pandas as pd
 import os
+import tempfile
+import time
+from PyPDF2 import PdfFileReader
 
 from validol.model.store.structures.structure import NamedStructure, Base, JSONCodec
 from validol.model.store.view.active_info import ActiveInfoActiveOnlySchema
 from validol.model.store.miners.daily_reports.expirations import Expirations
-from validol.model.utils.utils import pdf, TempFile
+from validol.model.utils.utils import pdf, first_run
+from validol.model.store.parsed_cache import content_digest
+from validol.model.store.page_index import page_index
+from validol.model.utils.progress import report
+
+
+class PdfDocument:
+    def __init__(self, content, digest=None):
+        self.content = content
+        self.digest = digest
+        self.texts = None
+        self.filename = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def page_texts(self):
+        if self.texts is None:
+            digest = self.digest = self.digest or content_digest(self.content)
+
+            self.texts = page_index.lookup(digest)
+
+            if self.texts is None:
+                reader = PdfFileReader(BytesIO(self.content))
+                self.texts = [reader.getPage(page).extractText() for page in range(reader.getNumPages())]
+
+                page_index.store(digest, self.texts)
+
+        return self.texts
+
+    def pages(self, phrase):
+        return [page + 1 for page, text in enumerate(self.page_texts()) if phrase in text]
+
+    def pages_run(self, phrase):
+        return list(first_run(self.pages(phrase)) or [])
+
+    def path(self):
+        if self.filename is None:
+            fd, self.filename = tempfile.mkstemp(suffix='.pdf')
+
+            with open(fd, 'wb') as file:
+                file.write(self.content)
+
+        return self.filename
+
+    def close(self):
+        if self.filename is not None:
+            os.remove(self.filename)
+            self.filename = None
 
 
 class PdfParser:
     def __init__(self, pdf_helper):
         self.pdf_helper = pdf_helper
 
-    def config(self, content):
+    def config(self, document):
         raise NotImplementedError
 
     def map_content(self, content):
         return content
 
+    def map_bulletin(self, bulletin):
+        raise NotImplementedError
+
     def process_df(self, df):
         raise NotImplementedError
 
@@ -72,26 +130,38 @@ class PdfHelper(Base):
         with open(filename, 'rb') as file:
             return self.parse_content(file.read(), date)
 
-    def parse_content(self, content, date):
-        content = self.processor.map_content(content)
+    def parse_content(self, content, date, digest=None):
+        mapped = self.processor.map_content(content)
 
-        with TempFile() as file:
-            file.write(content)
+        with PdfDocument(mapped, digest if mapped is content else None) as document:
+            return self.parse_document(document, date)
 
-            for config in self.processor.config(content):
-                if config['pages']:
-                    try:
-                        df = pdf(file.name, config)
-                    except:
-                        continue
+    def parse_bulletin(self, bulletin, date):
+        return self.parse_document(self.processor.map_bulletin(bulletin), date)
 
-                    df = self.processor.process_df(df)
+    def parse_document(self, document, date):
+        start = time.perf_counter()
+        failed = False
 
-                    df['Date'] = date
+        for config in self.processor.config(document):
+            if config['pages']:
+                try:
+                    df = pdf(document.path(), config)
+                except Exception:
+                    failed = True
+                    continue
 
-                    return df
+                df = self.processor.process_df(df)
 
-            return pd.DataFrame()
+                df['Date'] = date
+
+                report('parsed', rows=len(df), elapsed=time.perf_counter() - start)
+
+                return df
+
+        report('parsed', elapsed=time.perf_counter() - start)
+
+        return None if failed else pd.DataFrame()
 
 
 class PdfHelpers(NamedStructure):
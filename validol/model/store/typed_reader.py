@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+
+CATEGORICAL = ('CONTRACT', 'PC')
+NUMERIC = ('INTEGER', 'REAL')
+
+CHUNK_SIZE = 4096
+INITIAL_CAPACITY = 1024
+
+
+class ColumnBuffer:
+    def __init__(self, name, data_type, capacity):
+        self.name = name
+        self.data_type = data_type
+        self.numeric = data_type in NUMERIC
+        self.values = np.empty(capacity, dtype=np.float64 if self.numeric else object)
+
+    def grow(self, capacity):
+        values = np.empty(capacity, dtype=self.values.dtype)
+        values[:len(self.values)] = self.values
+        self.values = values
+
+    def put(self, begin, column):
+        end = begin + len(column)
+
+        if self.numeric:
+            try:
+                self.values[begin:end] = np.array(column, dtype=np.float64)
+                return
+            except (TypeError, ValueError):
+                self.numeric = False
+                self.values = self.values.astype(object)
+
+        self.values[begin:end] = column
+
+    def compact(self, size):
+        values = self.values[:size]
+
+        if not self.numeric:
+            if self.data_type in NUMERIC:
+                return pd.to_numeric(values)
+            elif self.name in CATEGORICAL:
+                return pd.Categorical(values)
+            elif self.data_type is None:
+                return pd.to_numeric(values, errors='ignore')
+            else:
+                return values
+
+        if self.name == 'Date' or self.data_type == 'INTEGER' and not np.isnan(values).any():
+            return values.astype(np.int64)
+
+        return values
+
+
+def read_typed(dbh, query, params=None, types=None, index_col=None, capacity=None):
+    types = types or {}
+
+    cursor = dbh.cursor()
+    cursor.execute(query, params or ())
+
+    names = [column[0] for column in cursor.description]
+    capacity = max(capacity or INITIAL_CAPACITY, 1)
+    buffers = [ColumnBuffer(name, types.get(name, None), capacity) for name in names]
+
+    size = 0
+
+    while True:
+        rows = cursor.fetchmany(CHUNK_SIZE)
+
+        if not rows:
+            break
+
+        if size + len(rows) > capacity:
+            capacity = max(capacity * 2, size + len(rows))
+
+            for buffer in buffers:
+                buffer.grow(capacity)
+
+        for buffer, column in zip(buffers, zip(*rows)):
+            buffer.put(size, column)
+
+        size += len(rows)
+
+    df = pd.DataFrame({buffer.name: buffer.compact(size) for buffer in buffers}, columns=names)
+
+    if index_col is not None:
+        df = df.set_index(index_col)
+
+        if not df.index.is_monotonic_increasing:
+            df.sort_index(inplace=True)
+
+    return df
@@ -6,6 +6,8 @@ from validol.model.store.view.active_info import ActiveInfo
 
 
 class ViewFlavor:
+    COMPOSITE = False
+
     def platforms(self, model_launcher):
         raise NotImplementedError
 
@@ -0,0 +1,59 @@
+import multiprocessing
+import os
+import time
+from collections import deque
+
+from validol.model.utils.progress import tracking
+
+
+WORKERS = os.cpu_count() or 1
+MIN_PARALLEL_ITEMS = 8
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+
+    with tracking(None, None):
+        result = function(*args)
+
+    return result, time.perf_counter() - start
+
+
+def portable(content):
+    if hasattr(content, 'read'):
+        content.seek(0)
+
+        return content.read()
+
+    return content
+
+
+def release(content):
+    if hasattr(content, 'close'):
+        content.close()
+
+
+def workers_for(items_num):
+    return min(WORKERS, items_num) if items_num >= MIN_PARALLEL_ITEMS else 1
+
+
+def stream(function, items, workers, window=None, initializer=None, initargs=()):
+    if workers < 2:
+        for item in items:
+            yield timed(function, *item)
+
+        return
+
+    window = window or 2 * workers
+
+    with multiprocessing.get_context('spawn').Pool(workers, initializer, initargs) as pool:
+        pending = deque()
+
+        for item in items:
+            pending.append(pool.apply_async(timed, (function,) + tuple(item)))
+
+            if len(pending) >= window:
+                yield pending.popleft().get()
+
+        while pending:
+            yield pending.popleft().get()
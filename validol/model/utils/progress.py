@@ -0,0 +1,74 @@
+import threading
+from contextlib import contextmanager
+
+
+class UpdateCancelled(Exception):
+    pass
+
+
+class Progress:
+    def __init__(self, listener=None):
+        self.listener = listener or (lambda source, step, rows, size: None)
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def report(self, source, step, rows=0, size=0):
+        if self.cancelled.is_set():
+            raise UpdateCancelled(source)
+
+        self.listener(source, step, rows, size)
+
+
+class Stats:
+    def __init__(self):
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def add(self, step, rows=0, size=0, elapsed=0):
+        with self.lock:
+            count, total_rows, total_size, total_elapsed = self.counters.get(step, (0, 0, 0, 0))
+
+            self.counters[step] = count + 1, total_rows + rows, total_size + size, total_elapsed + elapsed
+
+    def count(self, *steps):
+        return sum(self.counters.get(step, (0, 0, 0, 0))[0] for step in steps)
+
+    def rows(self, *steps):
+        return sum(self.counters.get(step, (0, 0, 0, 0))[1] for step in steps)
+
+    def size(self, *steps):
+        return sum(self.counters.get(step, (0, 0, 0, 0))[2] for step in steps)
+
+    def elapsed(self, *steps):
+        return sum(self.counters.get(step, (0, 0, 0, 0))[3] for step in steps)
+
+
+local = threading.local()
+
+
+def current():
+    return getattr(local, 'progress', None), getattr(local, 'source', None), getattr(local, 'stats', None)
+
+
+@contextmanager
+def tracking(progress, source, stats=None):
+    previous = current()
+
+    local.progress, local.source, local.stats = progress, source, stats
+
+    try:
+        yield
+    finally:
+        local.progress, local.source, local.stats = previous
+
+
+def report(step, rows=0, size=0, elapsed=0):
+    progress, source, stats = current()
+
+    if stats is not None:
+        stats.add(step, rows, size, elapsed)
+
+    if progress is not None:
+        progress.report(source, step, rows, size)
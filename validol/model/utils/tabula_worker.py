@@ -0,0 +1,138 @@
+import csv
+import glob
+import io
+import json
+import os
+import subprocess
+import threading
+
+import pandas as pd
+import tabula
+
+
+ENCODING = 'cp1251' if os.name == 'nt' else 'utf-8'
+
+
+def tabula_jar():
+    return glob.glob(os.path.join(os.path.dirname(tabula.__file__), 'tabula-*-jar-with-dependencies.jar'))[0]
+
+
+def tabula_arguments(pages, area, kwargs):
+    arguments = ['--format', 'JSON', '--pages', ','.join(map(str, pages)) if isinstance(pages, list) else str(pages)]
+
+    if area is not None:
+        arguments += ['--area', ','.join(map(str, area))]
+
+    if kwargs.get('lattice', False):
+        arguments.append('--lattice')
+
+    if kwargs.get('stream', False):
+        arguments.append('--stream')
+
+    if kwargs.get('guess', True):
+        arguments.append('--guess')
+
+    if kwargs.get('columns') is not None:
+        arguments += ['--columns', ','.join(map(str, kwargs['columns']))]
+
+    return arguments
+
+
+def table_rows(table):
+    return [[cell['text'] for cell in row] for row in table['data']]
+
+
+def read_rows(rows, pandas_options):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+
+    return pd.read_csv(buffer, **(pandas_options or {}))
+
+
+class SubprocessWorker:
+    JAVA_OPTIONS = ['-Dfile.encoding=UTF8']
+
+    def __init__(self):
+        self.jar = tabula_jar()
+
+    def run(self, path, arguments):
+        output = subprocess.run(['java'] + SubprocessWorker.JAVA_OPTIONS + ['-jar', self.jar] + arguments + [path],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True).stdout
+
+        return json.loads(output.decode(ENCODING))
+
+
+class JvmWorker:
+    def __init__(self):
+        import jpype
+
+        if not jpype.isJVMStarted():
+            jpype.startJVM(jpype.getDefaultJVMPath(), '-Djava.class.path={}'.format(tabula_jar()),
+                           '-Dfile.encoding=UTF8', '-Djava.awt.headless=true')
+
+        self.jpype = jpype
+        self.options = jpype.JClass('technology.tabula.CommandLineApp').buildOptions()
+        self.lock = threading.Lock()
+
+    def run(self, path, arguments):
+        jpype = self.jpype
+
+        with self.lock:
+            if not jpype.isThreadAttachedToJVM():
+                jpype.attachThreadToJVM()
+
+            line = jpype.JClass('org.apache.commons.cli.DefaultParser')().parse(
+                self.options, jpype.JArray(jpype.JString)(arguments + [path]))
+
+            output = jpype.JClass('java.lang.StringBuilder')()
+            jpype.JClass('technology.tabula.CommandLineApp')(output, line).extractTables(line)
+
+            return json.loads(str(output.toString()))
+
+
+class TabulaWorker:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def tables(self, path, pages, area, kwargs):
+        return [table_rows(table) for table in self.backend.run(path, tabula_arguments(pages, area, kwargs))]
+
+    def read(self, path, page, area, kwargs):
+        return read_rows([row for rows in self.tables(path, page, area, kwargs) for row in rows],
+                         kwargs.get('pandas_options'))
+
+    def read_pages(self, path, pages, area, kwargs):
+        # tabula 1.0.5 JSON has no page numbers, and guessing may yield any number of tables per page,
+        # so a batched guessing result can't be split back by page: such pages stay one call each.
+        if kwargs.get('guess', True) or kwargs.get('lattice', False) or len(pages) < 2 \
+                or not all(isinstance(page, int) for page in pages):
+            return None
+
+        tables = self.tables(path, pages, area, kwargs)
+
+        if len(tables) != len(pages):
+            return None
+
+        return tables
+
+
+worker = None
+worker_lock = threading.Lock()
+
+
+def tabula_worker():
+    global worker
+
+    with worker_lock:
+        if worker is None:
+            try:
+                worker = TabulaWorker(JvmWorker())
+            except ImportError:
+                worker = TabulaWorker(SubprocessWorker())
+            except Exception as e:
+                print('Persistent JVM is unavailable ({}), running tabula in subprocesses'.format(e))
+
+                worker = TabulaWorker(SubprocessWorker())
+
+        return worker
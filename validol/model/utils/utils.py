@@ -5,7 +5,6 @@ from bisect import bisect_left
 from functools import reduce
 from time import mktime
 import numpy as np
-from tabula import read_pdf
 import pandas as pd
 import os
 from PyPDF2 import PdfFileReader
@@ -15,6 +14,19 @@ import re
 from contextlib import contextmanager
 import locale
 
+from validol.model.utils.tabula_worker import tabula_worker, read_rows
+
+
+def showable_df(df):
+    show_df = df.copy()
+    show_df[show_df.index.name] = show_df.index.map(dt.date.fromtimestamp)
+
+    for col in show_df:
+        if show_df[col].dtype == np.float64:
+            show_df[col] = show_df[col].map("{:.2f}".format)
+
+    return show_df
+
 
 def to_timestamp(date):
     return int(mktime(date.timetuple()))
@@ -140,37 +152,56 @@ def remove_duplications(arr):
 
 
 def pdf(fname, config):
-    df = pd.DataFrame()
+    pages = []
 
     for page, area in config['pages']:
         if isinstance(page, int) or page == 'all':
-            pgs = [page]
+            pages.append((page, area))
         else:
             begin, end = [int({'start': 1, 'end': PdfFileReader(fname).getNumPages()}.get(x, x))
                           for x in page.split('-')]
-            pgs = range(begin, end + 1)
+            pages.extend((i, area) for i in range(begin, end + 1))
 
-        for i in pgs:
-            success = False
+    df = pd.DataFrame()
 
-            for processor in config['processors']:
-                try:
-                    df = df.append(processor.get('postprocessor', lambda x: x)(
-                        read_pdf(fname,
-                                 pages=i,
-                                 area=area,
-                                 encoding='cp1251' if os.name == 'nt' else 'utf-8',
-                                 **processor['kwargs'])))
+    for area, group in groupby(pages, key=itemgetter(1)):
+        for page_df in pdf_pages(fname, [page for page, _ in group], area, config['processors']):
+            df = df.append(page_df)
 
-                    success = True
-                    break
-                except:
-                    pass
+    return df
 
-            if not success:
-                raise ValueError
 
-    return df
+def pdf_pages(fname, pages, area, processors):
+    worker = tabula_worker()
+
+    try:
+        tables = worker.read_pages(fname, pages, area, processors[0]['kwargs'])
+    except Exception:
+        tables = None
+
+    result = []
+
+    for n, page in enumerate(pages):
+        success = False
+
+        for k, processor in enumerate(processors):
+            try:
+                if k == 0 and tables is not None:
+                    page_df = read_rows(tables[n], processor['kwargs'].get('pandas_options'))
+                else:
+                    page_df = worker.read(fname, page, area, processor['kwargs'])
+
+                result.append(processor.get('postprocessor', lambda x: x)(page_df))
+
+                success = True
+                break
+            except:
+                pass
+
+        if not success:
+            raise ValueError
+
+    return result
 
 
 def date_range(first, last):
@@ -200,14 +231,6 @@ def merge_dfs_list(dfs):
     return result
 
 
-def isfile(ftp, file):
-    try:
-        ftp.size(file)
-        return True
-    except:
-        return False
-
-
 def concat(dfs):
     if dfs:
         return pd.concat(dfs)
@@ -215,34 +238,6 @@ def concat(dfs):
         return pd.DataFrame()
 
 
-class TempFile:
-    def __init__(self):
-        self.name = 'tempfile{}'.format(np.random.randint(1e8))
-
-    def __enter__(self):
-        self.file = open(self.name, 'wb')
-
-        return self.file
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.file.close()
-
-        os.remove(self.name)
-
-
-def get_pages_run(fobj, phrase):
-    result = []
-
-    pfr = PdfFileReader(fobj)
-    for page in range(pfr.getNumPages()):
-        if phrase in pfr.getPage(page).extractText():
-            result.append(page + 1)
-        elif result:
-            return result
-
-    return result
-
-
 def first_run(items):
     for k, g in groupby(enumerate(items), lambda ix: ix[0] - ix[1]):
         return map(itemgetter(1), g)
@@ -1,6 +1,6 @@
 SETUP_CONFIG = {
     'name': 'validol',
-    'version': '0.0.57',
+    'version': '0.0.61',
     'license': 'MIT',
     'install_requires': [
         'pyparsing==2.2.0',
@@ -9,7 +9,6 @@ SETUP_CONFIG = {
         'requests==2.18.4',
         'PyQt5==5.9.2',
         'sqlalchemy==1.2.6',
-        'requests-cache==0.4.13',
         'lxml==4.2.1',
         'beautifulsoup4==4.6.0',
         'marshmallow==2.15.0',
@@ -19,9 +18,13 @@ SETUP_CONFIG = {
         'croniter==0.3.20',
         'PySocks==1.6.7'
     ],
+    'extras_require': {
+        'jvm': ['JPype1==0.6.3']
+    },
     'entry_points': {
         'console_scripts': [
-            'validol=validol.main:main'
+            'validol=validol.main:main',
+            'validol-update=validol.update:main'
         ],
     },
     'include_package_data': True
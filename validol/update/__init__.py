@@ -0,0 +1,60 @@
+import argparse
+
+import pandas as pd
+
+from validol.controller.headless import HeadlessLauncher, SchedulerDaemon
+from validol.model.store.resource import UpdateTelemetry
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='validol-update',
+        description='Update validol data without the GUI')
+    parser.add_argument('--root', help='directory containing the data folder')
+    parser.add_argument('--source', action='append', default=[], help='update a single source')
+    parser.add_argument('--list', action='store_true', help='list update sources')
+    parser.add_argument('--daemon', action='store_true', help='run working schedulers until interrupted')
+    parser.add_argument('--poll', type=int, default=SchedulerDaemon.POLL_INTERVAL,
+                        help='seconds between scheduler table checks')
+    parser.add_argument('--verbose', action='store_true', help='print per-source progress')
+    parser.add_argument('--telemetry', type=int, metavar='RUNS',
+                        help='show update telemetry for the last RUNS runs')
+    parser.add_argument('--metric', default='wall_time', choices=UpdateTelemetry.METRICS,
+                        help='telemetry metric to show per run')
+    args = parser.parse_args()
+
+    launcher = HeadlessLauncher(args.root, args.verbose)
+
+    try:
+        if args.list:
+            update_manager = launcher.model_launcher.get_update_manager()
+
+            for source in update_manager.get_sources():
+                print(source['name'])
+
+        if args.telemetry is not None:
+            report = launcher.model_launcher.get_telemetry_report(args.telemetry)
+
+            if report.empty:
+                print('No update telemetry recorded yet')
+            else:
+                with pd.option_context('display.width', None, 'display.max_columns', None):
+                    print(report.to_string(index=False))
+                    print()
+                    print(launcher.model_launcher.get_telemetry_trend(args.telemetry, args.metric).to_string())
+
+        for source in args.source:
+            launcher.update_source(source)
+
+        if args.daemon:
+            SchedulerDaemon(launcher, args.poll).run()
+        elif not args.list and not args.source and args.telemetry is None:
+            SchedulerDaemon(launcher, args.poll).run_pending()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        launcher.close()
+
+
+if __name__ == '__main__':
+    main()
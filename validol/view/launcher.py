@@ -15,8 +15,10 @@ from validol.view.menu.pdf_helper_dialog import PdfHelperDialog
 from validol.view.menu.glued_active_dialog import GluedActiveDialog
 from validol.view.menu.pattern_edit_dialog import PatternEditDialog
 from validol.view.menu.scheduler_dialog import SchedulerDialog
+from validol.view.menu.telemetry_dialog import TelemetryDialog
 from validol.view.tray import MySystemTrayIcon
 from validol.controller.qcron_manager import QCronManager
+from validol.controller.update_worker import UpdateWorker
 from validol.view.utils.utils import display_error
 
 
@@ -41,15 +43,28 @@ class ViewLauncher(ViewElement):
         self.windows = set()
         self.qcron_manager = QCronManager(self.model_launcher, self)
 
+        self.update_worker = UpdateWorker(self.model_launcher)
+        self.update_worker.progress.connect(self.main_window.show_update_progress)
+        self.update_worker.registered.connect(self.qcron_manager.register_update)
+        self.update_worker.update_required.connect(self.show_update_required)
+
         self.qcron_manager.refresh()
 
     def mark_update_required(self):
+        self.update_worker.update_required.emit()
+
+    def show_update_required(self):
         self.app.setWindowIcon(self.app_icons['red'])
         self.system_tray_icon.setIcon(self.app_icons['red'])
         self.main_window.show_update_app_button()
 
     def event_loop(self):
-        sys.exit(self.app.exec())
+        code = self.app.exec()
+
+        self.update_worker.stop()
+        self.model_launcher.close()
+
+        sys.exit(code)
 
     def show_main_window(self):
         self.main_window.showMaximized()
@@ -131,6 +146,9 @@ class ViewLauncher(ViewElement):
     def show_scheduler_dialog(self):
         self.watch_window(SchedulerDialog(self.controller_launcher, self.model_launcher))
 
+    def show_telemetry_dialog(self):
+        self.watch_window(TelemetryDialog(self.controller_launcher, self.model_launcher))
+
     def display_error(self, title, error):
         display_error(title, error)
 
@@ -141,7 +159,13 @@ class ViewLauncher(ViewElement):
         self.qcron_manager.update_missed()
 
     def register_update(self, source):
-        self.qcron_manager.register_update(source)
+        self.update_worker.registered.emit(source)
+
+    def submit_update(self, job):
+        self.update_worker.submit(job)
+
+    def cancel_update(self):
+        self.update_worker.cancel()
 
     def refresh_schedulers(self):
         self.qcron_manager.refresh()
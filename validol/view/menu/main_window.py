@@ -7,6 +7,8 @@ from validol.view.utils.utils import scrollable_area
 from validol.view.view_element import ViewElement
 from validol.view.utils.searchable_list import SearchableList
 from validol.model.store.view.active_info import ActiveInfo
+from validol.model.store.utils import range_from_timestamp
+from validol.controller.update_worker import UpdateJob
 
 
 class MWTippedList(TextTippedList):
@@ -80,7 +82,7 @@ class Window(ViewElement, QtWidgets.QWidget):
         self.update_missed_schedulers_button = QtWidgets.QPushButton('Update missed schedulers')
         self.update_missed_schedulers_button.setStyleSheet("background-color: green")
         self.update_missed_schedulers_button.clicked.connect(
-            self.on_update(self.controller_launcher.update_missed_schedulers, self.update_missed_schedulers_button))
+            self.controller_launcher.update_missed_schedulers)
         self.update_missed_schedulers_button.hide()
 
         self.clear = QtWidgets.QPushButton('Clear all')
@@ -97,9 +99,19 @@ class Window(ViewElement, QtWidgets.QWidget):
         self.update_daily_button.clicked.connect(
             self.on_update(self.model_launcher.update_daily, self.update_daily_button))
 
+        self.update_status = QtWidgets.QLabel()
+        self.update_status.hide()
+
+        self.cancel_update_button = QtWidgets.QPushButton('Cancel update')
+        self.cancel_update_button.clicked.connect(self.controller_launcher.cancel_update)
+        self.cancel_update_button.hide()
+
         self.create_scheduler_button = QtWidgets.QPushButton('Create scheduler')
         self.create_scheduler_button.clicked.connect(self.controller_launcher.show_scheduler_dialog)
 
+        self.telemetry_button = QtWidgets.QPushButton('Update telemetry')
+        self.telemetry_button.clicked.connect(self.controller_launcher.show_telemetry_dialog)
+
         self.removeTable = QtWidgets.QPushButton('Remove table')
         self.removeTable.clicked.connect(self.remove_table)
 
@@ -110,6 +122,9 @@ class Window(ViewElement, QtWidgets.QWidget):
         self.leftLayout.addWidget(self.updateButton)
         self.leftLayout.addWidget(self.update_daily_button)
         self.leftLayout.addWidget(self.create_scheduler_button)
+        self.leftLayout.addWidget(self.telemetry_button)
+        self.leftLayout.addWidget(self.update_status)
+        self.leftLayout.addWidget(self.cancel_update_button)
 
         self.cached_prices = QtWidgets.QListWidget()
         self.set_cached_prices()
@@ -322,8 +337,18 @@ class Window(ViewElement, QtWidgets.QWidget):
 
         actives = self.current_flavor().actives(platform, self.model_launcher)
 
+        catalog = self.model_launcher.get_catalog(self.current_flavor().name())
+        catalog = {(entry.PlatformCode, entry.ActiveName): entry
+                   for _, entry in catalog.iterrows()}
+
         for _, active in actives.iterrows():
             wi = QtWidgets.QListWidgetItem(active.ActiveName)
+
+            entry = catalog.get((platform, active.ActiveName))
+            if entry is not None and entry.row_count:
+                first, last = range_from_timestamp((entry.first_date, entry.last_date))
+                wi.setToolTip('{} - {}, {} rows'.format(first, last, entry.row_count))
+
             self.actives.addItem(wi)
 
     def clear_active(self, vbox):
@@ -359,18 +384,43 @@ class Window(ViewElement, QtWidgets.QWidget):
         def shot():
             text = button.text()
             button.setText("Wait a sec. Updating the data...")
-            self.app.processEvents()
+            button.setEnabled(False)
+            self.cancel_update_button.show()
+
+            def restore():
+                button.setText(text)
+                button.setEnabled(True)
+                self.cancel_update_button.hide()
+                self.update_status.hide()
 
-            results = action()
+            def finished(results):
+                restore()
 
-            self.controller_launcher.notify_update(results)
+                self.controller_launcher.notify_update(results)
 
-            button.setText(text)
+                self.active_chosen()
 
-            self.active_chosen()
+            def failed(error):
+                restore()
+
+                self.controller_launcher.notify('{} failed: {}'.format(text, error))
+
+            self.controller_launcher.submit_update(UpdateJob(text, action, finished, failed))
 
         return shot
 
+    def show_update_progress(self, source, step, rows, size):
+        status = '{}: {}'.format(source, step)
+
+        if rows:
+            status += ', {} rows'.format(rows)
+
+        if size:
+            status += ', {:.1f} MB'.format(size / 2 ** 20)
+
+        self.update_status.setText(status)
+        self.update_status.show()
+
     def closeEvent(self, qce):
         self.controller_launcher.on_main_window_close()
 
@@ -0,0 +1,52 @@
+from PyQt5 import QtWidgets
+
+from validol.view.view_element import ViewElement
+from validol.model.store.resource import UpdateTelemetry
+
+import validol.pyqtgraph as pg
+
+
+class TelemetryDialog(ViewElement, QtWidgets.QWidget):
+    RUNS = 20
+
+    def __init__(self, controller_launcher, model_launcher):
+        QtWidgets.QWidget.__init__(self)
+        ViewElement.__init__(self, controller_launcher, model_launcher)
+
+        self.setWindowTitle('Update telemetry')
+
+        self.main_layout = QtWidgets.QVBoxLayout(self)
+        self.controls_layout = QtWidgets.QHBoxLayout()
+
+        self.runs = QtWidgets.QSpinBox()
+        self.runs.setRange(1, 1000)
+        self.runs.setValue(TelemetryDialog.RUNS)
+        self.runs.setPrefix('Last runs: ')
+        self.runs.valueChanged.connect(self.refresh)
+
+        self.metric = QtWidgets.QComboBox()
+        self.metric.addItems(UpdateTelemetry.METRICS)
+        self.metric.currentIndexChanged.connect(self.refresh)
+
+        self.report = pg.TableWidget()
+        self.trend = pg.TableWidget()
+
+        self.controls_layout.addWidget(self.runs)
+        self.controls_layout.addWidget(self.metric)
+
+        self.main_layout.addLayout(self.controls_layout)
+        self.main_layout.addWidget(self.report)
+        self.main_layout.addWidget(self.trend)
+
+        self.refresh()
+
+        self.showMaximized()
+
+    def refresh(self):
+        runs = self.runs.value()
+
+        report = self.model_launcher.get_telemetry_report(runs)
+        self.report.setData(report.round(3).to_records(index=False))
+
+        trend = self.model_launcher.get_telemetry_trend(runs, self.metric.currentText())
+        self.trend.setData(trend.round(3).reset_index().to_records(index=False))
@@ -1,7 +1,7 @@
 from PyQt5 import QtWidgets
 import json
-import datetime as dt
-import numpy as np
+
+from validol.model.utils.utils import showable_df
 
 
 def scrollable_area(layout):
@@ -45,14 +45,3 @@ def mark(text, widget):
     return layout
 
 
-def showable_df(df):
-    show_df = df.copy()
-    show_df[show_df.index.name] = show_df.index.map(dt.date.fromtimestamp)
-
-    for col in show_df:
-        if show_df[col].dtype == np.float64:
-            show_df[col] = show_df[col].map("{:.2f}".format)
-
-    return show_df
-
-